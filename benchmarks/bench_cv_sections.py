@@ -0,0 +1,100 @@
+"""CV segmentation throughput on synthetic CVs: the old keyword loops vs src.cv_sections.segment_cv.
+
+Each synthetic CV has a name, a contact line, and four to seven sections in random order
+under heading variants ("Work Experience", "SKILLS:", ...). The section bodies are lines of
+words from the bundled job descriptions with dates mixed in. The old code only found
+experience lines, the name and the contact line. The segmenter finds every section and
+contact detail in one pass, and is checked against the generated truth.
+Run from the repository root:
+    python -m benchmarks.bench_cv_sections --cvs 20000
+"""
+import argparse
+import random
+
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES, best_time
+from src.cv_sections import CV_SECTIONS, SECTION_HEADINGS, segment_cv
+
+OTHER_SECTIONS = ["summary", "certifications", "awards", "languages"]
+
+
+def old_extract_experience(text):
+    """extract_experience_from_text as it was: every line against every keyword."""
+    experience_section = ""
+    experience_keywords = ['experience', 'work', 'role', 'responsibilities']
+    for line in text.split('\n'):
+        for keyword in experience_keywords:
+            if keyword in line.lower():
+                experience_section += line.strip() + "\n"
+                break
+    return experience_section
+
+
+def old_name_and_contact(text):
+    lines = text.split("\n")
+    return (lines[0] if len(lines) > 0 else "Your Full Name",
+            lines[1] if len(lines) > 1 else "Your Contact Information")
+
+
+def synthetic_cvs(count, rng):
+    """Returns [(text, {"sections": [...], "email": ..., "phone": ...})]."""
+    words = sorted({word for path in CSV_FILES
+                    for text in pd.read_csv(path)["description"].dropna() for word in text.split()
+                    if "@" not in word and not any(char.isdigit() for char in word)
+                    # "Summary:" starting a line is a heading with inline content
+                    and word.rstrip(":").lower() not in SECTION_HEADINGS})
+    headings = {}
+    for heading, section in SECTION_HEADINGS.items():
+        headings.setdefault(section, []).append(heading)
+    cvs = []
+    for index in range(count):
+        email = f"applicant{index}@example.com"
+        phone = f"+44 7{rng.randrange(100, 999)} {rng.randrange(100000, 999999)}"
+        lines = [f"Applicant {index}", f"{email} | {phone} | https://www.linkedin.com/in/applicant{index}"]
+        sections = rng.sample([name for name in CV_SECTIONS if name != "contact"], rng.randint(3, 4))
+        sections += rng.sample(OTHER_SECTIONS, rng.randint(1, 3))
+        rng.shuffle(sections)
+        for section in sections:
+            heading = rng.choice(headings[section])
+            lines.append(rng.choice([heading.title(), heading.upper(), heading.capitalize() + ":"]))
+            for _ in range(rng.randint(3, 10)):
+                lines.append(" ".join(rng.choices(words, k=rng.randint(6, 16)))
+                             + rng.choice(["", f" ({rng.randrange(2000, 2020)} - {rng.randrange(2020, 2025)})"]))
+        cvs.append(("\n".join(lines), {"sections": sections, "email": email, "phone": phone}))
+    return cvs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cvs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cvs = synthetic_cvs(args.cvs, random.Random(0))
+    texts = [text for text, _ in cvs]
+    megabytes = sum(map(len, texts)) / 1e6
+
+    old, _ = best_time(lambda: [(old_extract_experience(text), old_name_and_contact(text)) for text in texts],
+                       args.repeat)
+    new, segmented = best_time(lambda: [segment_cv(text) for text in texts], args.repeat)
+    sections, _ = best_time(lambda: [{name: segments.section_text(name) for name in CV_SECTIONS}
+                                     for segments in segmented], args.repeat)
+
+    sections_right = sum([section.kind for section in segments.sections] == truth["sections"]
+                         for segments, (_, truth) in zip(segmented, cvs))
+    contacts_right = sum(segments.found("email") == [truth["email"]] and segments.found("phone") == [truth["phone"]]
+                         and len(segments.found("url")) == 1 for segments, (_, truth) in zip(segmented, cvs))
+    names_right = sum(segments.name == text.split("\n")[0] for segments, (text, _) in zip(segmented, cvs))
+
+    print(f"{len(cvs)} CVs, {megabytes:.1f} MB")
+    print(f"{'old keyword loops (experience, name, contact)':<48} {old * 1000:8.0f} ms {megabytes / old:6.1f} MB/s")
+    print(f"{'segment_cv (all sections, contact spans)':<48} {new * 1000:8.0f} ms {megabytes / new:6.1f} MB/s  "
+          f"({old / new:.1f}x)")
+    print(f"{'  + section texts':<48} {sections * 1000:8.0f} ms")
+    print(f"sections in the right order {sections_right / len(cvs):.1%}, email/phone/URL exact "
+          f"{contacts_right / len(cvs):.1%}, name {names_right / len(cvs):.1%}")
+
+
+if __name__ == "__main__":
+    main()
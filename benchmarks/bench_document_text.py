@@ -0,0 +1,84 @@
+"""PDF text extraction with src.document_text: whole documents, early stops and a process pool.
+
+For each bundled PDF it times reading every page, the first page of the stream and a read
+that stops once the --required sections are complete. A long document made of --copies
+copies of temp_cv.pdf is then read in-process and with a pool of --processes processes;
+the pool only helps with more than one CPU.
+Run from the repository root:
+    python -m benchmarks.bench_document_text --copies 16
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.document_text import SectionWatcher, extract_document_text, iter_document_text
+from src.lazy_imports import get_pdf_reader, lazy_import
+
+ROOT = Path(__file__).resolve().parent.parent
+PDF_FILES = [ROOT / "temp_cv.pdf", ROOT / "static" / "Data" / "Book1.pdf"]
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def first_page(path):
+    stream = iter_document_text(path)
+    text = next(stream)
+    stream.close()
+    return text
+
+
+def pages_until(path, required):
+    watcher = SectionWatcher(required)
+    for count, chunk in enumerate(iter_document_text(path), 1):
+        if watcher(chunk):
+            return count
+    return None
+
+
+def write_long_pdf(source, copies, path):
+    writer = lazy_import("PyPDF2").PdfWriter()
+    pages = get_pdf_reader()(str(source)).pages
+    for _ in range(copies):
+        for page in pages:
+            writer.add_page(page)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--required", default="education,experience", help="Comma-separated sections")
+    args = parser.parse_args()
+    required = set(args.required.split(","))
+    get_pdf_reader()  # Import PyPDF2 outside the timings
+
+    for path in PDF_FILES:
+        pages = len(get_pdf_reader()(str(path)).pages)
+        full, text = timed(lambda: extract_document_text(str(path)))
+        first, _ = timed(lambda: first_page(str(path)))
+        stopped, read = timed(lambda: pages_until(str(path), required))
+        print(f"{path.name:<12} {pages:3} pages, {len(text):6} chars   all pages {full * 1000:6.0f} ms   "
+              f"first page {first * 1000:5.0f} ms   until {'+'.join(sorted(required))} "
+              f"{stopped * 1000:5.0f} ms ({read or pages} pages{'' if read else ', not all found'})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        long_pdf = os.path.join(tmp, "long.pdf")
+        write_long_pdf(PDF_FILES[0], args.copies, long_pdf)
+        pages = len(get_pdf_reader()(long_pdf).pages)
+        sequential, text = timed(lambda: extract_document_text(long_pdf))
+        pooled, pooled_text = timed(lambda: extract_document_text(long_pdf, processes=args.processes))
+        assert text == pooled_text
+    print(f"{'long.pdf':<12} {pages:3} pages   in-process {sequential * 1000:6.0f} ms   "
+          f"{args.processes} processes {pooled * 1000:6.0f} ms ({sequential / pooled:.1f}x, {os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Import time of the app's entry points, checked against a startup budget.
+
+Each module is imported in a fresh interpreter under `python -X importtime`, best of
+--repeat runs. The check fails (exit code 1) when an import fails, exceeds --budget-ms or
+pulls in one of the heavy libraries that must only load on first use
+(src.lazy_imports.HEAVY_MODULES).
+Run from the repository root:
+    python -m benchmarks.bench_import_time --budget-ms 1500
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from src.lazy_imports import HEAVY_MODULES
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "src.job_scraper", "src.scheduler", "src.job_export", "src.cover_letter_generator",
+    "src.email_sender", "src.google_sheets_integration", "dashboard",
+]
+
+
+def import_profile(module):
+    """Imports module in a fresh interpreter.
+
+    Returns ({imported module: cumulative microseconds}, heavy modules loaded), or raises
+    RuntimeError with the interpreter's error when the import fails.
+    """
+    check = f"import sys, json, {module}; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", check],
+                            cwd=ROOT_DIR, capture_output=True, text=True)
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = max(cumulative.get(name.strip(), 0), int(total_us))
+    return cumulative, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies to list per module")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        try:
+            runs = [import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as error:
+            print(f"{module:<34} FAIL: {error}")
+            failures.append(f"{module} failed to import: {error}")
+            continue
+        cumulative, heavy = min(runs, key=lambda run: run[0].get(module, 0))
+        elapsed = cumulative.get(module, 0) / 1000
+        status = "ok" if elapsed <= args.budget_ms and not heavy else "FAIL"
+        print(f"{module:<34} {elapsed:8.1f} ms  {status}")
+        slowest = sorted(
+            ((name, us) for name, us in cumulative.items() if name != module and "." not in name),
+            key=lambda item: item[1], reverse=True
+        )[:args.top]
+        print("    " + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in slowest))
+        if elapsed > args.budget_ms:
+            failures.append(f"{module} took {elapsed:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at import time")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Insert-time cost of near-duplicate clustering with src.job_dedup as the jobs table grows.
+
+Postings mix words of the bundled CSV descriptions with words from a large synthetic
+vocabulary, under one of a few hundred titles, and every tenth one is a reworded repost
+of an earlier posting.
+They are clustered in batches as JobWriter does on insert; a flat time per batch shows
+the LSH lookups don't depend on the number of postings already stored.
+Run from the repository root:
+    python -m benchmarks.bench_job_dedup --rows 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES
+from src.job_dedup import NearDuplicateIndex, list_clusters
+from src.job_schema import create_schema
+from src.job_writer import configure_connection
+
+
+def synthetic_postings(count, rng):
+    """Descriptions of 30 bundled words and 40 words from a 50,000-word vocabulary each."""
+    vocabulary = sorted({word for path in CSV_FILES
+                         for text in pd.read_csv(path)["description"].dropna() for word in text.split()})
+    return [" ".join(rng.choices(vocabulary, k=30) + [f"w{rng.randrange(50000)}" for _ in range(40)])
+            for _ in range(count)]
+
+
+def reword(text, rng, share=0.3):
+    """Replaces a share of the words of a text and rotates the rest, like an agency rewriting an advert.
+
+    Replacing 30% leaves a Jaccard similarity of about 0.55 with the original.
+    """
+    words = [word if rng.random() > share else f"r{rng.randrange(50000)}" for word in text.split()]
+    start = rng.randrange(max(1, len(words)))
+    return " ".join(words[start:] + words[:start])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    descriptions = synthetic_postings(args.rows, rng)
+    titles = [f"Engineer {rng.randrange(300)}" for _ in range(args.rows)]
+    reposts = set()
+    for row in range(10, args.rows, 10):
+        original = rng.randrange(row)
+        descriptions[row], titles[row] = reword(descriptions[original], rng), titles[original]
+        reposts.add(row + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = configure_connection(sqlite3.connect(os.path.join(tmp, "jobs.db")))
+        create_schema(conn)
+        conn.execute("INSERT INTO companies (id, name) VALUES (1, 'Acme')")
+        conn.execute("INSERT INTO locations (id, display_name) VALUES (1, 'London')")
+        conn.executemany(
+            "INSERT INTO jobs (id, title, company_id, location_id, description, content_hash) VALUES (?, ?, 1, 1, ?, ?)",
+            [(job_id, title, text, str(job_id)) for job_id, (title, text) in enumerate(zip(titles, descriptions), 1)]
+        )
+        conn.commit()
+
+        index = NearDuplicateIndex()
+        timings = []
+        for start in range(0, args.rows, args.batch_size):
+            rows = [(job_id, str(job_id), titles[job_id - 1], "Acme", descriptions[job_id - 1])
+                    for job_id in range(start + 1, min(start + args.batch_size, args.rows) + 1)]
+            began = time.perf_counter()
+            with conn:
+                index.add(conn, rows)
+            timings.append((time.perf_counter() - began) / len(rows))
+
+        clusters = list_clusters(conn)
+        found = {job_id for _, _, job_ids in clusters for job_id in job_ids[1:]}
+        size = os.path.getsize(os.path.join(tmp, "jobs.db"))
+
+    tenth = max(1, len(timings) // 10)
+    print(f"{args.rows} postings, {len(reposts)} reposts, {len(clusters)} clusters")
+    print(f"first {tenth * args.batch_size:>7} inserts  {sum(timings[:tenth]) / tenth * 1e6:8.0f} µs/posting")
+    print(f"last  {tenth * args.batch_size:>7} inserts  {sum(timings[-tenth:]) / tenth * 1e6:8.0f} µs/posting")
+    print(f"reposts found {len(found & reposts) / len(reposts):.1%}, "
+          f"other postings clustered {len(found - reposts)}")
+    print(f"database size {size / 1e6:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
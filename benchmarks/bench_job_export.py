@@ -0,0 +1,78 @@
+"""Time and peak Python memory of exporting the jobs table: the old pandas path vs src.job_export.
+
+Run from the repository root:
+    python -m benchmarks.bench_job_export --rows 100000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.bench_job_writer import synthetic_jobs
+from src.job_export import export_arrow, export_csv, read_export
+from src.job_query import query_jobs
+from src.job_schema import create_schema
+from src.job_writer import JobWriter
+
+
+def measure(run):
+    """Returns (seconds, peak MiB allocated by Python) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "jobs.db"))
+        create_schema(conn)
+        # Spread the postings over 30 scrape dates so the columnar exports are partitioned
+        JobWriter(conn).write(synthetic_jobs(args.rows))
+        conn.execute("UPDATE jobs SET scraped_at = printf('2025-03-%02dT09:00:00Z', 1 + id % 30)")
+        conn.commit()
+
+        out = lambda name: os.path.join(tmp, name)
+        cases = [
+            ("pandas to_csv (old path)", out("pandas.csv"),
+             lambda: query_jobs(conn, limit=None).to_csv(out("pandas.csv"), index=False)),
+            ("export_csv, 10k-row chunks", out("stream.csv"), lambda: export_csv(conn, out("stream.csv"))),
+            ("export_arrow, Parquet zstd", out("parquet"), lambda: export_arrow(conn, out("parquet"))),
+            ("export_arrow, Arrow IPC", out("arrow"), lambda: export_arrow(conn, out("arrow"), "arrow")),
+        ]
+        print(f"{args.rows} synthetic postings")
+        print(f"{'':<30} {'time':>8} {'peak MiB':>9} {'size MiB':>9}")
+        for label, path, run in cases:
+            elapsed, peak = measure(run)
+            size = directory_size(path) if os.path.isdir(path) else os.path.getsize(path)
+            print(f"{label:<30} {elapsed:7.2f}s {peak:9.1f} {size / 2 ** 20:9.1f}")
+
+        # Reading two columns back: the CSV has to be parsed in full, the columnar files don't
+        reads = [
+            ("read CSV, two columns", lambda: pd.read_csv(out("stream.csv"), usecols=["title", "salary_max"])),
+            ("read Parquet, two columns", lambda: read_export(out("parquet"), ["title", "salary_max"])),
+            ("read Arrow IPC (mmap)", lambda: read_export(out("arrow"), ["title", "salary_max"], "arrow")),
+        ]
+        for label, run in reads:
+            elapsed, peak = measure(run)
+            print(f"{label:<30} {elapsed:7.2f}s {peak:9.1f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
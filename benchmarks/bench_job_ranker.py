@@ -0,0 +1,74 @@
+"""CV-to-posting ranking latency of src.job_ranker over a large synthetic jobs table.
+
+Postings are the bundled CSV descriptions with random extra words mixed in, so the
+vocabulary and posting lists are realistically large. The query is the text of the
+bundled temp_cv.pdf, or three descriptions joined together when PyPDF2 can't read it.
+Run from the repository root:
+    python -m benchmarks.bench_job_ranker --rows 100000
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES
+from src.job_ranker import JobRanker
+
+CV_PATH = "temp_cv.pdf"
+
+
+def synthetic_descriptions(count, seed=0):
+    """Bundled descriptions with 20 words from a 50,000-word synthetic vocabulary appended to each."""
+    rng = random.Random(seed)
+    texts = [text for path in CSV_FILES for text in pd.read_csv(path)["description"].dropna().astype(str)]
+    return [texts[i % len(texts)] + " " + " ".join(f"w{rng.randrange(50000)}" for _ in range(20))
+            for i in range(count)]
+
+
+def cv_text():
+    try:
+        from src.lazy_imports import get_pdf_reader
+
+        return "\n".join(page.extract_text() or "" for page in get_pdf_reader()(CV_PATH).pages)
+    except Exception:
+        texts = pd.read_csv(CSV_FILES[0])["description"].dropna().astype(str)
+        return " ".join(texts[:3])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    descriptions = synthetic_descriptions(args.rows)
+    ranker = JobRanker()
+    start = time.perf_counter()
+    ranker.add((job_id, None, text) for job_id, text in enumerate(descriptions, 1))
+    build = time.perf_counter() - start
+    postings = len(ranker.main) + len(ranker.delta)
+
+    extra = synthetic_descriptions(1000, seed=1)
+    start = time.perf_counter()
+    ranker.add((args.rows + job_id, None, text) for job_id, text in enumerate(extra, 1))
+    increment = time.perf_counter() - start
+
+    query = cv_text()
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        hits = ranker.top_k(query, args.k)
+        timings.append(time.perf_counter() - start)
+
+    print(f"{len(ranker)} postings, {len(ranker.vocabulary)} terms, {postings} non-zeros")
+    print(f"build from scratch        {build:8.2f} s")
+    print(f"add 1,000 postings        {increment * 1000:8.1f} ms")
+    print(f"top-{args.k} for a {len(query.split())}-word CV  {min(timings) * 1000:8.1f} ms best, "
+          f"{sorted(timings)[len(timings) // 2] * 1000:.1f} ms median")
+    print(f"best matches: {hits[:3]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Salary normalization and market percentiles with src.job_salaries vs a per-row Python loop.
+
+Postings are the bundled CSV descriptions and salary fields repeated up to --rows, under
+a few hundred titles, companies and locations and spread over a year of weeks. The loop
+baseline searches every description with the same precompiled pattern and aggregates
+with dictionaries and statistics.quantiles, as a straightforward implementation would.
+Run from the repository root:
+    python -m benchmarks.bench_job_salaries --rows 200000
+"""
+import argparse
+import statistics
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES, best_time
+from src.job_salaries import (
+    ANNUAL_MULTIPLIERS, ANNUAL_RANGE, CURRENCY_CODES, SALARY_PATTERN, normalize_salaries, salary_report
+)
+
+DIMENSIONS = ("title", "company", "location", "week")
+
+
+def synthetic_jobs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    bundled = pd.concat([pd.read_csv(path) for path in CSV_FILES], ignore_index=True)
+    jobs = bundled.iloc[np.arange(count) % len(bundled)][["description", "salary_min", "salary_max"]]
+    jobs = jobs.reset_index(drop=True)
+    jobs["title"] = [f"Title {i}" for i in rng.integers(0, 300, count)]
+    jobs["company"] = [f"Company {i}" for i in rng.integers(0, 500, count)]
+    jobs["location"] = [f"Location {i}" for i in rng.integers(0, 50, count)]
+    jobs["week"] = pd.Timestamp("2024-03-04") + pd.to_timedelta(rng.integers(0, 52, count) * 7, unit="D")
+    return jobs
+
+
+def loop_salary(description, salary_min, salary_max):
+    """Per-row equivalent of normalize_salaries for one posting: (annual min, annual max) or None."""
+    match = SALARY_PATTERN.search(description or "")
+    if match and CURRENCY_CODES.get(match["currency"] or match["code"]) == "GBP":
+        low = float(match["low"].replace(",", "")) * (1000 if match["low_k"] else 1)
+        high = float(match["high"].replace(",", "")) * (1000 if match["high_k"] else 1) if match["high"] else low
+        if match["high_k"] and low < 1000:
+            low *= 1000
+        up_to = bool(match["up_to"])
+        period = next((name for name in ANNUAL_MULTIPLIERS if match[name]), None)
+    elif salary_max == salary_max and salary_max is not None:
+        low, high, up_to, period = salary_min, salary_max, False, None
+    else:
+        return None
+    if period is None:
+        period = "hour" if high < 100 else "day" if high < 2000 else "annum" if high >= 10000 else None
+    if period is None or not ANNUAL_RANGE[0] <= high * ANNUAL_MULTIPLIERS[period] <= ANNUAL_RANGE[1]:
+        return None
+    return (None if up_to else low * ANNUAL_MULTIPLIERS[period]), high * ANNUAL_MULTIPLIERS[period]
+
+
+def loop_report(jobs):
+    groups = {by: defaultdict(list) for by in DIMENSIONS}
+    for job in jobs.itertuples(index=False):
+        salary = loop_salary(job.description, job.salary_min, job.salary_max)
+        if salary is None:
+            continue
+        midpoint = salary[1] if salary[0] is None else (salary[0] + salary[1]) / 2
+        for by in DIMENSIONS:
+            groups[by][getattr(job, by)].append(midpoint)
+    # Ventiles, of which the 2nd, 5th, 10th, 15th and 18th are the report's percentiles
+    return {by: {key: statistics.quantiles(values, n=20, method="inclusive") if len(values) > 1 else values * 19
+                 for key, values in values_by_key.items()} for by, values_by_key in groups.items()}
+
+
+def prepare(jobs, normalized):
+    """The frame load_salaries would return for these jobs."""
+    salaries = pd.concat([jobs[list(DIMENSIONS)], normalized], axis=1)
+    salaries = salaries[salaries["currency"] == "GBP"]
+    salaries["midpoint"] = salaries[["annual_min", "annual_max"]].mean(axis=1)
+    return salaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.rows)
+    loop_time, loop_result = best_time(lambda: loop_report(jobs), args.repeat)
+    parse_time, normalized = best_time(lambda: normalize_salaries(jobs), args.repeat)
+    salaries = prepare(jobs, normalized)
+    report_time, report = best_time(lambda: salary_report(salaries, DIMENSIONS), args.repeat)
+    total_time = parse_time + report_time
+
+    print(f"{args.rows} postings, {normalized['annual_max'].notna().mean():.0%} with a salary "
+          f"({(normalized['source'] == 'description').mean():.0%} read from the description)")
+    print(f"{'per-row loop':<38} {loop_time:8.2f} s")
+    print(f"{'vectorized normalize_salaries':<38} {parse_time:8.2f} s")
+    print(f"{'vectorized percentiles, 4 dimensions':<38} {report_time:8.2f} s")
+    print(f"{'vectorized total':<38} {total_time:8.2f} s   {loop_time / total_time:.1f}x faster")
+    medians = report["title"]["p50"]
+    loop_medians = pd.Series({key: ventiles[9] for key, ventiles in loop_result["title"].items()})
+    print(f"title medians agree with the loop: {np.allclose(medians.sort_index(), loop_medians.sort_index())}")
+
+
+if __name__ == "__main__":
+    main()
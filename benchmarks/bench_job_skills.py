@@ -0,0 +1,59 @@
+"""Batch skill indexing of the jobs table by number of worker processes.
+
+Postings reuse the bundled CSV descriptions. Each run re-indexes the whole table with
+src.job_skills.index_job_skills(rebuild=True); matching is also timed on its own, without
+the database, to separate the parallel part from the single SQLite writer.
+Run from the repository root:
+    python -m benchmarks.bench_job_skills --rows 100000 --processes 1 2 4
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_job_writer import synthetic_jobs
+from benchmarks.bench_skill_extraction import CSV_FILES
+from src.job_schema import create_schema
+from src.job_skills import extract_skills_batch, index_job_skills
+from src.job_writer import JobWriter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    texts = [text for path in CSV_FILES for text in pd.read_csv(path)["description"].dropna().astype(str)]
+    jobs = list(synthetic_jobs(args.rows))
+    for i, job in enumerate(jobs):
+        job["description"] = texts[i % len(texts)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "jobs.db"))
+        create_schema(conn)
+        JobWriter(conn).write(jobs)
+        descriptions = [job["description"] for job in jobs]
+
+        print(f"{args.rows} postings, {os.cpu_count()} CPUs")
+        print(f"{'processes':>9} {'matching only':>14} {'postings/s':>11} {'index_job_skills':>17} {'postings/s':>11}")
+        for n_process in args.processes:
+            start = time.perf_counter()
+            for _ in extract_skills_batch(descriptions, n_process, args.batch_size):
+                pass
+            matching = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stats = index_job_skills(conn, n_process, args.batch_size, rebuild=True)
+            indexing = time.perf_counter() - start
+            print(f"{n_process:>9} {matching:13.2f}s {args.rows / matching:11.0f} {indexing:16.2f}s "
+                  f"{stats['jobs'] / indexing:11.0f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Per-source latency and throughput when crawling several job sources, one of them slow.
+
+Every source is served by a local fixture server (src.source_fixtures), so no API keys or
+network access are needed. Run from the repository root:
+    python -m benchmarks.bench_job_sources --slow-delay 0.5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.job_scraper import JobScraper
+from src.job_sources import AdzunaSource, ReedSource
+from src.rate_limiter import RateLimiter
+from src.source_fixtures import FIXTURES, FixtureServer
+
+JOB_TITLES = ["Data Scientist", "Software Engineer", "DevOps Engineer"]
+
+
+def run(tmp, label, adzuna_url, reed_url, use_async):
+    # Generous buckets in a throwaway state file, so only the servers set the pace
+    limiter_path = os.path.join(tmp, f"{label}_rate_limit.db")
+    sources = [
+        AdzunaSource(adzuna_url, results_per_page=20, app_id="bench", app_key="bench",
+                     rate_limiter=RateLimiter("adzuna", rate=1000, per=1.0, burst=50, path=limiter_path)),
+        ReedSource(reed_url, results_per_page=20, api_key="bench",
+                   rate_limiter=RateLimiter("reed", rate=1000, per=1.0, burst=50, path=limiter_path)),
+    ]
+    scraper = JobScraper(JOB_TITLES, db_name=os.path.join(tmp, f"{label}.db"), cache_ttl=0, sources=sources)
+    start = time.perf_counter()
+    stats = scraper.scrape_jobs(use_async=use_async)
+    elapsed = time.perf_counter() - start
+    scraper.conn.close()
+    return elapsed, stats, scraper.source_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slow-delay", type=float, default=0.5, help="Seconds the Reed stand-in takes per request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            FixtureServer(FIXTURES["adzuna"]) as adzuna, \
+            FixtureServer(FIXTURES["reed"], delay=args.slow_delay) as reed:
+        results = [
+            ("sequential", run(tmp, "sequential", adzuna.url, reed.url, use_async=False)),
+            ("parallel (async)", run(tmp, "parallel", adzuna.url, reed.url, use_async=True)),
+        ]
+    print()
+    for label, (elapsed, stats, source_stats) in results:
+        print(f"{label}: {elapsed:.2f}s total, {stats['inserted']} jobs inserted")
+        for summary in (source.summary() for source in source_stats.values()):
+            print(f"  {summary['source']:<8} {summary['jobs']:>5} jobs {summary['seconds']:6.2f}s "
+                  f"{summary['jobs_per_second']:8.1f} jobs/s  p50 {summary['latency_p50_ms']:6.1f} ms  "
+                  f"p95 {summary['latency_p95_ms']:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
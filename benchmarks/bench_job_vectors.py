@@ -0,0 +1,89 @@
+"""Query latency and recall of semantic search with src.job_vectors over a large index.
+
+Synthetic postings mix topical words of the bundled CSV descriptions and are embedded with the
+real HashingEmbedder; the large index is made of blends of two of those vectors plus noise,
+appended in batches as the scraper would, so it goes through the same IVF training.
+Each query, the first words of a posting, is answered by the IVF lists and by an exhaustive
+scan, whose top 10 is the reference for recall.
+Run from the repository root:
+    python -m benchmarks.bench_job_vectors --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES
+from src.job_vectors import HashingEmbedder, VectorIndex
+
+
+def synthetic_postings(count, rng, topics=300):
+    """Texts of 60 words drawn from the bundled descriptions, 40 of them from one of `topics`
+    300-word subsets of the vocabulary, the way postings cluster by field and seniority."""
+    vocabulary = sorted({word for path in CSV_FILES
+                         for text in pd.read_csv(path)["description"].dropna() for word in text.split()})
+    subsets = [rng.sample(vocabulary, 300) for _ in range(topics)]
+    return [" ".join(rng.choices(rng.choice(subsets), k=40) + rng.choices(vocabulary, k=20)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--embedded", type=int, default=20000, help="Postings embedded for real")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    embedder = HashingEmbedder()
+    texts = synthetic_postings(args.embedded, rng)
+    began = time.perf_counter()
+    base = embedder.embed_many(texts)
+    embed_time = time.perf_counter() - began
+    queries = [" ".join(text.split()[:12]) for text in rng.sample(texts, args.queries)]
+
+    noise = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = VectorIndex(os.path.join(tmp, "jobs.vectors.f16"), embedder)
+        began = time.perf_counter()
+        for start in range(0, args.rows, args.batch_size):
+            count = min(args.batch_size, args.rows - start)
+            vectors = (base[noise.integers(len(base), size=count)] + 0.5 * base[noise.integers(len(base), size=count)]
+                       + noise.normal(0, 0.5 / np.sqrt(embedder.dim), (count, embedder.dim)).astype(np.float32))
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            job_ids = range(start + 1, start + count + 1)
+            index.append(list(job_ids), [f"{job_id:016x}" for job_id in job_ids], vectors)
+        build_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        reader = VectorIndex.open(index.path, embedder)
+        open_time = time.perf_counter() - began
+
+        timings, exact_timings, recalls, ratios = [], [], [], []
+        for query in queries:
+            began = time.perf_counter()
+            hits = reader.search(query, k=10)
+            timings.append(time.perf_counter() - began)
+            began = time.perf_counter()
+            exact = reader.search(query, k=10, exact=True)
+            exact_timings.append(time.perf_counter() - began)
+            recalls.append(len({job_id for job_id, _ in hits} & {job_id for job_id, _ in exact}) / max(1, len(exact)))
+            # Near-ties make exact ids a strict reference; this shows how close the hits still are
+            ratios.append(np.mean([score for _, score in hits]) / np.mean([score for _, score in exact]))
+        size = os.path.getsize(index.path) + os.path.getsize(index.meta_path)
+
+    timings, exact_timings = np.array(timings) * 1000, np.array(exact_timings) * 1000
+    print(f"embedding      {embed_time / args.embedded * 1e6:8.0f} µs/posting")
+    print(f"{args.rows} vectors appended in {build_time:.1f}s, {len(index.centroids)} IVF lists, "
+          f"{size / 1e6:.0f} MB on disk, opened in {open_time * 1000:.0f} ms")
+    print(f"IVF search     median {np.median(timings):6.1f} ms, p95 {np.percentile(timings, 95):6.1f} ms")
+    print(f"exact search   median {np.median(exact_timings):6.1f} ms, p95 {np.percentile(exact_timings, 95):6.1f} ms")
+    print(f"recall@10      {np.mean(recalls):.1%}, mean similarity {np.mean(ratios):.1%} of the exact top 10")
+
+
+if __name__ == "__main__":
+    main()
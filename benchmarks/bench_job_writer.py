@@ -0,0 +1,98 @@
+"""Rows per second for bulk job ingestion: the old pandas to_sql path vs JobWriter.
+
+Run from the repository root:
+    python -m benchmarks.bench_job_writer --rows 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from src.job_schema import JOB_COLUMNS, create_tables
+from src.job_writer import WRITE_PRAGMAS, JobWriter
+
+WORDS = ["python", "sql", "cloud", "team", "data", "model", "pipeline", "london", "remote", "senior"]
+
+
+def synthetic_jobs(count, seed=0):
+    """Generates postings shaped like the scraper's records."""
+    rng = random.Random(seed)
+    for i in range(count):
+        salary = rng.randrange(30000, 120000, 1000)
+        yield {
+            "job_title": "Data Scientist",
+            "title": f"Data Scientist {i}",
+            "company": f"Company {rng.randrange(2000)}",
+            "location": rng.choice(["London", "Manchester", "Leeds", "Bristol"]),
+            "created": f"2025-0{rng.randrange(1, 10)}-1{rng.randrange(10)}T10:00:00Z",
+            "description": " ".join(rng.choice(WORDS) for _ in range(60)),
+            "salary_min": salary,
+            "salary_max": salary + 10000,
+            "contract_type": rng.choice(["permanent", "contract"]),
+            "contract_time": rng.choice(["full_time", "part_time"]),
+            "apply_link": f"https://www.adzuna.co.uk/jobs/land/ad/{4000000000 + i}",
+        }
+
+
+def create_legacy_jobs_table(conn):
+    """The single-table, free-text layout the old path appended to."""
+    columns = ", ".join(f"{name} TEXT" for name in JOB_COLUMNS)
+    conn.execute(f"CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns}, job_key TEXT, content_hash TEXT)")
+    conn.execute("CREATE UNIQUE INDEX idx_jobs_job_key ON jobs (job_key)")
+    conn.commit()
+
+
+def bench_pandas(path, jobs, batch_size):
+    """The original save_to_db: a DataFrame per batch appended with to_sql on default pragmas."""
+    conn = sqlite3.connect(path)
+    create_legacy_jobs_table(conn)
+    start = time.perf_counter()
+    for offset in range(0, len(jobs), batch_size):
+        pd.DataFrame(jobs[offset:offset + batch_size]).to_sql("jobs", conn, if_exists="append", index=False)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bench_writer(path, jobs, batch_size, pragmas):
+    """The upsert path: keys and content hashes computed per job, one transaction per batch.
+
+    Only the tables and the natural-key index are created, so both paths maintain the same
+    indexes; the query and full-text indexes add their own cost on top in production.
+    """
+    conn = sqlite3.connect(path)
+    create_tables(conn)
+    writer = JobWriter(conn, batch_size=batch_size, pragmas=pragmas)
+    start = time.perf_counter()
+    writer.write(jobs)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    # JobScraper commits every 200 jobs by default
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    jobs = list(synthetic_jobs(args.rows))
+    cases = [
+        ("pandas to_sql (old path)", lambda path: bench_pandas(path, jobs, args.batch_size)),
+        ("JobWriter, default pragmas", lambda path: bench_writer(path, jobs, args.batch_size, None)),
+        ("JobWriter, WAL + tuned pragmas", lambda path: bench_writer(path, jobs, args.batch_size, WRITE_PRAGMAS)),
+    ]
+    print(f"{args.rows} synthetic postings, {args.batch_size} per batch")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (label, run) in enumerate(cases):
+            elapsed = run(os.path.join(tmp, f"bench_{i}.db"))
+            print(f"{label:<32} {elapsed:8.2f}s {args.rows / elapsed:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
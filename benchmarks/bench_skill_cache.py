@@ -0,0 +1,55 @@
+"""Per-call cost of skill extraction with and without src.skill_cache on the bundled CSV descriptions.
+
+Over the distinct descriptions, times a plain extraction, a cold cache (every call a miss
+that is then stored) and a freshly opened cache serving every call from SQLite; then warm
+calls over all descriptions, served by the in-process LRU.
+Run from the repository root:
+    python -m benchmarks.bench_skill_cache
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES
+from src.skill_cache import SkillCache
+from src.skill_extractor import get_extractor
+
+
+def per_call(run, descriptions):
+    """Returns the mean microseconds per description of one pass."""
+    start = time.perf_counter()
+    for description in descriptions:
+        run(description)
+    return (time.perf_counter() - start) / len(descriptions) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passes", type=int, default=5, help="Warm passes over the descriptions")
+    args = parser.parse_args()
+
+    descriptions = [text for path in CSV_FILES for text in pd.read_csv(path)["description"].dropna().astype(str)]
+    distinct = list(dict.fromkeys(descriptions))
+    extractor = get_extractor()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skill_cache.db")
+        cache = SkillCache(path, extractor.version, memory_entries=len(descriptions))
+        print(f"{len(descriptions)} descriptions ({len(distinct)} distinct)")
+        print(f"{'no cache':<28} {per_call(extractor.extract, distinct):8.1f} µs/call")
+        print(f"{'cold cache (miss + store)':<28} "
+              f"{per_call(lambda text: cache.get_or_extract(text, extractor), distinct):8.1f} µs/call")
+        reopened = SkillCache(path, extractor.version, memory_entries=len(descriptions))
+        print(f"{'SQLite (reopened cache)':<28} "
+              f"{per_call(lambda text: reopened.get_or_extract(text, extractor), distinct):8.1f} µs/call")
+        warm = min(per_call(lambda text: cache.get_or_extract(text, extractor), descriptions)
+                   for _ in range(args.passes))
+        print(f"{'in-process LRU':<28} {warm:8.1f} µs/call")
+        print(f"  first cache: {cache.stats()}")
+        print(f"  reopened cache: {reopened.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Skill extraction throughput on the bundled CSV descriptions: the old spaCy token loop vs src.skill_extractor.
+
+The old function ran the full en_core_web_sm pipeline on each description. When that
+model is not installed, the baseline runs an untrained pipeline with the same components
+(tok2vec, tagger, parser, ner); inference costs the same whatever the weights. The old loop
+is also timed on a tokenizer-only spacy.blank("en") pipeline, as a lower bound no spaCy
+pipeline can beat.
+Run from the repository root:
+    python -m benchmarks.bench_skill_extraction --repeat 5
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from src.skill_extractor import SkillExtractor, SkillTaxonomy
+
+CSV_FILES = ["static/Data/adzuna_computer_science_jobs.csv", "static/Data/saved_jobs.csv"]
+OLD_SKILLS = ["Python", "Machine Learning", "Data Analysis", "AI", "Deep Learning", "SQL", "Java", "Cloud Computing"]
+
+
+def load_baseline_pipelines():
+    """Returns [(label, spaCy pipeline)] to run the old function on."""
+    import spacy
+
+    try:
+        full = ("en_core_web_sm", spacy.load("en_core_web_sm"))
+    except OSError:
+        from spacy.cli.init_config import init_config
+
+        config = init_config(lang="en", pipeline=["tagger", "parser", "ner"], optimize="efficiency")
+        nlp = spacy.util.load_model_from_config(config, auto_fill=True)
+        for name, labels in [("tagger", ["NN", "VB"]), ("parser", ["nsubj", "ROOT"]), ("ner", ["ORG", "GPE"])]:
+            for label in labels:
+                nlp.get_pipe(name).add_label(label)
+        nlp.initialize()
+        full = ("untrained en_core_web_sm stand-in", nlp)
+    return [full, ('spacy.blank("en"), tokenizer only', spacy.blank("en"))]
+
+
+def old_extract_skills(nlp, job_desc):
+    """The extraction loop that src.nlp_processing used before the taxonomy matcher."""
+    doc = nlp(job_desc)
+    extracted_skills = set()
+    for token in doc:
+        if token.text.lower() in [skill.lower() for skill in OLD_SKILLS]:
+            extracted_skills.add(token.text)
+    return list(extracted_skills)
+
+
+def best_time(run, repeat):
+    """Returns (fastest seconds, result) over repeat calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    descriptions = [text for path in CSV_FILES for text in pd.read_csv(path)["description"].dropna().astype(str)]
+
+    start = time.perf_counter()
+    taxonomy = SkillTaxonomy.load()
+    extractor = SkillExtractor(taxonomy)
+    compile_time = time.perf_counter() - start
+
+    new, found = best_time(lambda: [extractor.extract(text) for text in descriptions], args.repeat)
+    print(f"{len(descriptions)} descriptions, {len(taxonomy.skills)} skills / {len(taxonomy.patterns)} surface forms "
+          f"(compiled in {compile_time * 1000:.0f} ms)")
+    print(f"{'SkillExtractor (Aho-Corasick)':<52} {new * 1000:9.1f} ms {len(descriptions) / new:9.0f} docs/s  "
+          f"{sum(map(len, found))} skills")
+    for label, nlp in load_baseline_pipelines():
+        # The full pipeline takes seconds, so it is timed once
+        old, found = best_time(lambda: [old_extract_skills(nlp, text) for text in descriptions],
+                               args.repeat if "blank" in label else 1)
+        print(f"{'old token loop, ' + label:<52} {old * 1000:9.1f} ms {len(descriptions) / old:9.0f} docs/s  "
+              f"{sum(map(len, found))} skills  ({old / new:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Cold start of the skill extractor: parsing the taxonomy CSV vs mapping its compiled artifact.
+
+The bundled taxonomy is timed as it ships, and a synthetic one with --skills extra skills
+of three synonyms each stands in for a realistic taxonomy of tens of thousands of forms.
+"Cold start" is loading plus the first find(), which is when the mapped artifact is first
+read; extraction over the bundled descriptions is then timed for both.
+Run from the repository root:
+    python -m benchmarks.bench_taxonomy_load --skills 30000
+"""
+import argparse
+import csv
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.bench_skill_extraction import CSV_FILES, best_time
+from src.skill_extractor import (
+    TAXONOMY_PATH, CompiledTaxonomy, SkillExtractor, SkillTaxonomy, artifact_path, compile_artifact
+)
+
+
+def write_synthetic_taxonomy(path, count, rng):
+    """Copies the bundled taxonomy and appends count made-up skills of 1-3 words with three synonyms."""
+    shutil.copy(TAXONOMY_PATH, path)
+    syllables = ["ka", "lo", "mi", "zen", "tra", "vo", "rex", "qu", "dal", "fin", "sto", "py", "net", "ops"]
+    word = lambda: "".join(rng.choices(syllables, k=3))
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for index in range(count):
+            name = " ".join(word() for _ in range(rng.randint(1, 3))) + f" {index}"
+            writer.writerow([name.title(), f"Category {index % 40}", ";".join(f"{name} {suffix}" for suffix in "xyz"), ""])
+
+
+def time_cold_start(path, descriptions):
+    began = time.perf_counter()
+    extractor = SkillExtractor(SkillTaxonomy.load(path))
+    extractor.find(descriptions[0])
+    parsed = time.perf_counter() - began
+
+    compile_artifact(path)
+    began = time.perf_counter()
+    mapped_extractor = SkillExtractor(compiled=CompiledTaxonomy.open(artifact_path(path)))
+    mapped_extractor.find(descriptions[0])
+    mapped = time.perf_counter() - began
+    return parsed, mapped, extractor, mapped_extractor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skills", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    descriptions = [text for path in CSV_FILES for text in pd.read_csv(path)["description"].dropna().astype(str)]
+    with tempfile.TemporaryDirectory() as tmp:
+        bundled, synthetic = Path(tmp) / "bundled.csv", Path(tmp) / "synthetic.csv"
+        shutil.copy(TAXONOMY_PATH, bundled)
+        write_synthetic_taxonomy(synthetic, args.skills, random.Random(0))
+        for label, path in (("bundled", bundled), (f"+{args.skills} skills", synthetic)):
+            forms = len(SkillTaxonomy.load(path).patterns)
+            began = time.perf_counter()
+            compile_artifact(path)
+            build = time.perf_counter() - began
+            parsed, mapped, extractor, mapped_extractor = time_cold_start(path, descriptions)
+            parsed_run, found = best_time(lambda: [extractor.extract(text) for text in descriptions], args.repeat)
+            mapped_run, mapped_found = best_time(lambda: [mapped_extractor.extract(text) for text in descriptions],
+                                                 args.repeat)
+            assert found == mapped_found
+            print(f"{label:<14} {forms:7} forms  artifact {artifact_path(path).stat().st_size / 1e6:5.1f} MB "
+                  f"built in {build * 1000:6.0f} ms")
+            print(f"    cold start: CSV {parsed * 1000:7.1f} ms   artifact {mapped * 1000:7.1f} ms "
+                  f"({parsed / mapped:.0f}x faster)")
+            print(f"    {len(descriptions)} descriptions: CSV-built {parsed_run * 1000:6.1f} ms   "
+                  f"mapped {mapped_run * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,35 @@
 import streamlit as st
 import pandas as pd
 import os
+import sqlite3
 import time
-from datetime import datetime
-from dotenv import load_dotenv
+from datetime import datetime, timedelta
 import logging
+from src.config import load_config
 from src.google_oauth import GoogleOAuth
-import gspread
+from src.lazy_imports import get_gspread
 
 # Import functions from your existing files
 from src.google_sheets_integration import authenticate_gsheet, update_job_status_in_sheet, get_job_status_from_sheet
-from src.cover_letter_generator import generate_cover_letter, extract_experience_from_cv, extract_name_and_contact_from_cv, save_to_files
+from src.cover_letter_generator import generate_cover_letter, save_to_files
+from src.cv_parser import parse_cv
 from src.email_sender import send_job_application_email
-from src.job_scraper import JobScraper
+from src.job_query import count_jobs, get_job, query_jobs
+from src.job_ranker import load_ranker, rank_jobs
+from src.job_salaries import index_salaries, load_salaries, salary_percentiles
+from src.job_schema import create_schema, ensure_fts
+from src.scheduler import create_scheduler_tables, list_searches, request_refresh, save_search
+from src.job_search import search_jobs
+from src.job_vectors import VectorIndex, semantic_search, vector_path
 from src.nlp_processing import extract_skills_from_description
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Load environment variables
-load_dotenv()
+JOBS_DB = "jobs.db"
+# Columns shown on the search page; descriptions are loaded only for the job being applied to
+JOB_CARD_COLUMNS = ["id", "job_title", "company", "location", "created", "salary_min", "salary_max", "apply_link"]
+JOBS_PER_PAGE = 50
 
 # --- Custom CSS for Styling ---
 def load_css():
@@ -109,6 +119,7 @@ def main():
         layout="wide",
         page_icon="💼"
     )
+    load_config()
     load_css()
     
     # Sidebar navigation
@@ -159,13 +170,34 @@ def render_dashboard():
     Get started by selecting a page from the sidebar.
     """)
     
+    try:
+        with sqlite3.connect(JOBS_DB) as conn:
+            # Only postings added or changed since the last visit are parsed
+            index_salaries(conn)
+            total_jobs = count_jobs(conn, hide_duplicates=True)
+            week_ago = (datetime.utcnow() - timedelta(days=7)).strftime("%Y-%m-%d")
+            new_jobs = count_jobs(conn, hide_duplicates=True, scraped_after=week_ago)
+            salaries = load_salaries(conn)
+    except Exception as e:
+        st.error(f"Error loading market data: {str(e)}")
+        total_jobs, new_jobs, salaries = 0, 0, None
+    
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Jobs Found", "25", "+5 from last week")
-    with col2:
-        st.metric("Applications Sent", "8", "3 pending")
-    with col3:
-        st.metric("Interview Rate", "25%", "2 of 8")
+        st.metric("Jobs Found", total_jobs, f"+{new_jobs} this week")
+    if salaries is not None and not salaries.empty:
+        low, median, high = salaries["midpoint"].quantile([0.25, 0.5, 0.75])
+        with col2:
+            st.metric("Median Salary", f"£{median:,.0f}", f"£{low:,.0f} – £{high:,.0f} middle half", delta_color="off")
+        with col3:
+            st.metric("Salaries Known", f"{len(salaries) / max(total_jobs, 1):.0%}",
+                      f"{(salaries['source'] == 'description').sum()} read from descriptions", delta_color="off")
+        
+        st.markdown("---")
+        st.subheader("💷 Salary Market")
+        by = st.radio("Annual salary percentiles by", ["title", "company", "location", "week"], horizontal=True)
+        percentiles = salary_percentiles(salaries, by).head(25)
+        st.dataframe(percentiles.style.format("£{:,.0f}", subset=list(percentiles.columns[1:])))
     
     st.markdown("---")
     st.subheader("Recent Activity")
@@ -186,40 +218,153 @@ def render_job_search():
         with col2:
             location = st.text_input("Location", "London")
     
+    # Scraping happens in the scheduler process (python -m src.scheduler); this page only
+    # saves the search and reads what has already been fetched.
     if st.button("Search Jobs", key="search_jobs"):
-        with st.spinner("🔍 Searching for jobs..."):
-            job_list = [title.strip() for title in job_titles.split(",")]
+        job_list = [title.strip() for title in job_titles.split(",")]
+        search_name = f"{', '.join(job_list)} in {location}"
+        try:
+            with sqlite3.connect(JOBS_DB) as conn:
+                create_scheduler_tables(conn)
+                is_new = search_name not in set(list_searches(conn)["name"])
+                save_search(conn, search_name, job_list, location)
+                if not is_new:
+                    request_refresh(conn, search_name)
+            st.session_state.saved_search = search_name
+            st.info("🕒 Search saved. The scheduler will fetch fresh results in the background.")
+        except Exception as e:
+            st.error(f"Error saving the search: {str(e)}")
+    
+    try:
+        with sqlite3.connect(JOBS_DB) as conn:
+            create_schema(conn)
+            create_scheduler_tables(conn)
+            # Reposts of the same job are clustered on insert (src.job_dedup); show each job once
+            jobs = query_jobs(conn, columns=JOB_CARD_COLUMNS, limit=JOBS_PER_PAGE, hide_duplicates=True)
+            total_jobs = count_jobs(conn, hide_duplicates=True)
+            reposts = count_jobs(conn) - total_jobs
+            searches = list_searches(conn)
+    except Exception as e:
+        st.error(f"Error loading jobs: {str(e)}")
+        jobs, searches = None, None
+    
+    if searches is not None and not searches.empty:
+        for _, search in searches.iterrows():
+            search = search.astype(object).where(pd.notna(search), None)
+            status = "running now" if search["running_since"] else (search["last_status"] or "not run yet")
+            st.caption(f"🔁 {search['name']} ({search['schedule']}): last run {search['last_run_at'] or '–'}, "
+                       f"{status}; next run {search['next_run_at']}")
+    
+    if jobs is not None:
+        if not jobs.empty:
+            st.session_state.job_results = jobs
+            st.success(f"🎉 {total_jobs} jobs fetched so far! Showing the {len(jobs)} most recent.")
+            if reposts:
+                st.caption(f"🔁 {reposts} reposts of these jobs are hidden.")
             
-            try:
-                scraper = JobScraper(job_titles=job_list, location=location)
-                scraper.scrape_jobs()
-                jobs = scraper.get_saved_jobs()
-                
-                if not jobs.empty:
-                    st.session_state.job_results = jobs
-                    st.success(f"🎉 Found {len(jobs)} jobs!")
-                    
-                    # Display jobs in cards
-                    for idx, job in jobs.iterrows():
-                        with st.container():
-                            st.markdown(f"""
-                            <div class="job-card">
-                                <h3>{job['job_title']}</h3>
-                                <p><strong>Company:</strong> {job['company']}</p>
-                                <p><strong>Location:</strong> {job['location']}</p>
-                                <p><strong>Salary:</strong> £{job['salary_min']} - £{job['salary_max']}</p>
-                                <a href="{job['apply_link']}" target="_blank">View Job</a>
-                            </div>
-                            """, unsafe_allow_html=True)
-                else:
-                    st.warning("No jobs found. Try different search terms.")
-            except Exception as e:
-                st.error(f"Error searching for jobs: {str(e)}")
+            # Display jobs in cards
+            for idx, job in jobs.iterrows():
+                with st.container():
+                    st.markdown(f"""
+                    <div class="job-card">
+                        <h3>{job['job_title']}</h3>
+                        <p><strong>Company:</strong> {job['company']}</p>
+                        <p><strong>Location:</strong> {job['location']}</p>
+                        <p><strong>Salary:</strong> £{job['salary_min']} - £{job['salary_max']}</p>
+                        <a href="{job['apply_link']}" target="_blank">View Job</a>
+                    </div>
+                    """, unsafe_allow_html=True)
+        else:
+            st.warning("No jobs fetched yet. Save a search and make sure the scheduler is running.")
+    
+    st.markdown("---")
+    st.subheader("🔎 Search Saved Jobs")
+    keywords = st.text_input(
+        "Keywords",
+        help="Instantly search the titles, companies and descriptions of every job fetched so far"
+    )
+    by_meaning = st.checkbox(
+        "Search by meaning",
+        help="Also find jobs that describe the same work in other words, e.g. 'ML' for 'machine learning'"
+    )
+    if keywords and by_meaning:
+        if "vector_index" not in st.session_state:
+            st.session_state.vector_index = VectorIndex.open(vector_path(JOBS_DB))
+        # The scheduler appends new postings; pick up whatever it saved since the last search
+        st.session_state.vector_index.refresh()
+        with sqlite3.connect(JOBS_DB) as conn:
+            matches = semantic_search(conn, st.session_state.vector_index, keywords,
+                                      k=JOBS_PER_PAGE, columns=JOB_CARD_COLUMNS)
+        
+        if not len(st.session_state.vector_index):
+            st.info("No jobs embedded yet. Run `python -m src.job_vectors jobs.db` or let the scheduler fetch some.")
+        elif matches.empty:
+            st.info("No saved jobs are close to that in meaning.")
+        else:
+            st.session_state.job_results = matches
+            st.caption(f"Top {len(matches)} of {len(st.session_state.vector_index)} saved jobs by meaning")
+            for idx, job in matches.iterrows():
+                st.markdown(f"""
+                <div class="job-card">
+                    <h3>{job['job_title']}</h3>
+                    <p><strong>Company:</strong> {job['company']} · <strong>Location:</strong> {job['location']}</p>
+                    <p><strong>Similarity:</strong> {job['similarity']:.0%}</p>
+                    <a href="{job['apply_link']}" target="_blank">View Job</a>
+                </div>
+                """, unsafe_allow_html=True)
+    elif keywords:
+        with sqlite3.connect(JOBS_DB) as conn:
+            ensure_fts(conn)
+            matches = search_jobs(conn, keywords, columns=JOB_CARD_COLUMNS, limit=JOBS_PER_PAGE,
+                                  hide_duplicates=True)
+        
+        if matches.empty:
+            st.info("No saved jobs match those keywords.")
+        else:
+            st.session_state.job_results = matches
+            st.caption(f"Top {len(matches)} matches, best first")
+            for idx, job in matches.iterrows():
+                st.markdown(f"""
+                <div class="job-card">
+                    <h3>{job['job_title']}</h3>
+                    <p><strong>Company:</strong> {job['company']} · <strong>Location:</strong> {job['location']}</p>
+                    <p>{job['snippet']}</p>
+                    <a href="{job['apply_link']}" target="_blank">View Job</a>
+                </div>
+                """, unsafe_allow_html=True)
 
 def render_cover_letter_generator():
     st.title("Cover Letter Generator")
     st.markdown("Create a personalized cover letter for your job application.")
     
+    with st.expander("🎯 Rank Saved Jobs Against Your CV", expanded='job_results' not in st.session_state):
+        ranking_cv = st.file_uploader(
+            "Upload your CV to list the saved jobs that fit it best",
+            type=['pdf', 'docx'],
+            key="ranking_cv"
+        )
+        if ranking_cv:
+            ranking_cv_path = f"temp_cv.{ranking_cv.name.split('.')[-1]}"
+            with open(ranking_cv_path, "wb") as f:
+                f.write(ranking_cv.getbuffer())
+            try:
+                # The index lives next to jobs.db and only new or changed postings are indexed
+                st.session_state.ranker = load_ranker(JOBS_DB, st.session_state.get("ranker"))
+                with sqlite3.connect(JOBS_DB) as conn:
+                    ranked = rank_jobs(conn, st.session_state.ranker, parse_cv(ranking_cv_path).text,
+                                       k=JOBS_PER_PAGE, columns=JOB_CARD_COLUMNS)
+            except Exception as e:
+                st.error(f"Error ranking jobs: {str(e)}")
+                ranked = None
+            
+            if ranked is not None and ranked.empty:
+                st.info("None of the saved jobs share any terms with your CV.")
+            elif ranked is not None:
+                st.session_state.job_results = ranked
+                st.caption(f"Top {len(ranked)} of {len(st.session_state.ranker)} saved jobs by fit; "
+                           "they are listed in this order below.")
+                st.dataframe(ranked[["job_title", "company", "location", "score"]], hide_index=True)
+    
     if 'job_results' in st.session_state and not st.session_state.job_results.empty:
         job_list = st.session_state.job_results[['job_title', 'company']].to_dict('records')
         job_options = {f"{job['job_title']} at {job['company']}": idx for idx, job in enumerate(job_list)}
@@ -229,7 +374,10 @@ def render_cover_letter_generator():
             help="Select a job from your previous search results"
         )
         selected_job_idx = job_options[selected_job_key]
-        selected_job = st.session_state.job_results.iloc[selected_job_idx]
+        selected_job = st.session_state.job_results.iloc[selected_job_idx].copy()
+        with sqlite3.connect(JOBS_DB) as conn:
+            job = get_job(conn, int(selected_job['id']), columns=["description"])
+        selected_job['description'] = job['description'] if job else ""
         st.session_state.selected_job = selected_job
         
         with st.expander("📄 Job Details", expanded=True):
@@ -277,8 +425,8 @@ def render_cover_letter_generator():
                         )
                         st.session_state.cover_letter = cover_letter
                         
-                        # Extract name from CV for saving files
-                        name, _ = extract_name_and_contact_from_cv(temp_cv_path)
+                        # Name from CV for saving files, from the parse the letter already used
+                        name = parse_cv(temp_cv_path).name
                         st.session_state.applicant_name = name
                         
                         st.subheader("Your Custom Cover Letter")
@@ -494,7 +642,7 @@ def render_settings():
         st.success("✅ Google Sheets connected")
         
         # Show sheet selection UI
-        client = gspread.authorize(st.session_state.gsheet_creds)
+        client = get_gspread().authorize(st.session_state.gsheet_creds)
         sheets = client.list_spreadsheet_files()
         
         if sheets:
@@ -0,0 +1,33 @@
+import os
+import threading
+from pathlib import Path
+
+# Repository root, so the env files are found wherever a script is started from
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# Settings files, loaded in this order; a setting already in the environment always wins.
+# ENV_DIR points at a different directory of app.env, email.env and google_sheets.env.
+ENV_FILES = ["app.env", "email.env", "google_sheets.env"]
+
+_loaded = False
+_lock = threading.Lock()
+
+def load_config():
+    """Loads the .env and env/*.env settings files into the environment, once per process."""
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import load_dotenv
+
+        env_dir = Path(os.getenv("ENV_DIR", ROOT_DIR / "env"))
+        for name in ENV_FILES:
+            path = env_dir / name
+            if path.exists():
+                load_dotenv(dotenv_path=path)
+        load_dotenv(dotenv_path=ROOT_DIR / ".env")
+        _loaded = True
+
+def get_setting(name, default=None):
+    """Returns a setting from the environment, loading the settings files on first use."""
+    load_config()
+    return os.getenv(name, default)
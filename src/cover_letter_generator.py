@@ -1,6 +1,8 @@
 import os
-import PyPDF2
-from docx import Document
+from src.config import get_setting
+from src.cv_parser import (
+    extract_experience_from_text, extract_name_and_contact_from_text, extract_text_from_cv, parse_cv
+)
 from src.nlp_processing import extract_skills_from_description
 from datetime import datetime
 import smtplib
@@ -8,20 +10,15 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-from dotenv import load_dotenv
-
-# Load the .env file
-load_dotenv(dotenv_path=r"C:\Users\dell\OneDrive\Desktop\new_AI_job\AI-Agent-Job-Assistant\env\email.env")
 
 def generate_cover_letter(job_title, company, job_desc, cv_file_path):
     # Extract skills from job description
     skills = extract_skills_from_description(job_desc)
     
-    # Extract relevant experience from CV
-    experience = extract_experience_from_cv(cv_file_path)
-
-    # Extract name and contact info from the CV
-    name, contact_info = extract_name_and_contact_from_cv(cv_file_path)
+    # Experience, name and contact info all come from one parse of the CV
+    cv = parse_cv(cv_file_path)
+    experience = cv.experience
+    name, contact_info = cv.name, cv.contact
 
     # Create the cover letter template
     cover_letter = f"""
@@ -43,62 +40,13 @@ def generate_cover_letter(job_title, company, job_desc, cv_file_path):
     
     return cover_letter
 
-# Helper functions for extracting information from CV
+# Helper functions for extracting information from CV; all of them share one cached parse
 def extract_experience_from_cv(cv_file_path):
-    experience = ""
-
-    if cv_file_path.lower().endswith('.pdf'):
-        with open(cv_file_path, 'rb') as cv_file:
-            reader = PyPDF2.PdfReader(cv_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-        experience = extract_experience_from_text(text)
-
-    elif cv_file_path.lower().endswith('.docx'):
-        doc = Document(cv_file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        experience = extract_experience_from_text(text)
-
-    return experience
-
-def extract_experience_from_text(text):
-    experience_section = ""
-    experience_keywords = ['experience', 'work', 'role', 'responsibilities']
-
-    for line in text.split('\n'):
-        for keyword in experience_keywords:
-            if keyword in line.lower():
-                experience_section += line.strip() + "\n"
-                break
-
-    return experience_section
+    return parse_cv(cv_file_path).experience
 
 def extract_name_and_contact_from_cv(cv_file_path):
-    name = ""
-    contact_info = ""
-
-    if cv_file_path.lower().endswith('.pdf'):
-        with open(cv_file_path, 'rb') as cv_file:
-            reader = PyPDF2.PdfReader(cv_file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-        name, contact_info = extract_name_and_contact_from_text(text)
-
-    elif cv_file_path.lower().endswith('.docx'):
-        doc = Document(cv_file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        name, contact_info = extract_name_and_contact_from_text(text)
-
-    return name, contact_info
-
-def extract_name_and_contact_from_text(text):
-    lines = text.split("\n")
-    name = lines[0] if len(lines) > 0 else "Your Full Name"
-    contact_info = lines[1] if len(lines) > 1 else "Your Contact Information"
-    
-    return name, contact_info
+    cv = parse_cv(cv_file_path)
+    return cv.name, cv.contact
 
 # Save the CV and Cover Letter to Files
 def save_to_files(cv_file, cover_letter, name):
@@ -120,7 +68,7 @@ def save_to_files(cv_file, cover_letter, name):
 # Function to send email with CV and Cover Letter as attachments
 def send_email(subject, body, recipient, cv_path, cover_letter_path):
     msg = MIMEMultipart()
-    msg['From'] = os.getenv('EMAIL_USER')
+    msg['From'] = get_setting('EMAIL_USER')
     msg['To'] = recipient
     msg['Subject'] = subject
 
@@ -149,7 +97,7 @@ def send_email(subject, body, recipient, cv_path, cover_letter_path):
     try:
         server = smtplib.SMTP('smtp.gmail.com', 587)
         server.starttls()
-        server.login(os.getenv('EMAIL_USER'), os.getenv('EMAIL_PASSWORD'))
+        server.login(get_setting('EMAIL_USER'), get_setting('EMAIL_PASSWORD'))
         server.sendmail(msg['From'], recipient, msg.as_string())
         server.quit()
         print("Email sent successfully!")
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+from src.config import get_setting
+from src.cv_sections import CV_SECTIONS, segment_cv
+from src.document_text import extract_document_text
+from src.job_writer import configure_connection
+from src.skill_extractor import get_extractor
+
+# Part of every cache key: bump it whenever parse_cv would return something different for
+# the same file, so entries written by older code are never served
+PARSER_VERSION = 4
+CV_SUFFIXES = (".pdf", ".docx")
+EXPERIENCE_LINE_PATTERN = re.compile(r"^.*(?:experience|work|role|responsibilities).*$", re.IGNORECASE | re.MULTILINE)
+
+
+class ParsedCV(NamedTuple):
+    sha256: str  # Of the file bytes
+    text: str
+    sections: dict  # Section name (CV_SECTIONS) -> text, "" for sections the CV doesn't have
+    name: str
+    contact: str
+    skills: list  # Canonical taxonomy skills, in order of first mention
+
+    @property
+    def experience(self):
+        return self.sections.get("experience", "")
+
+
+def extract_text_from_cv(cv_file_path, processes=None, required_sections=None):
+    """Returns the plain text of a PDF or DOCX CV, or "" for other file types.
+
+    Pages and paragraphs are streamed by src.document_text; processes and required_sections
+    are passed on to extract_document_text.
+    """
+    return extract_document_text(cv_file_path, processes, required_sections)
+
+def extract_experience_from_text(text):
+    """Returns every line that mentions experience, work, a role or responsibilities, stripped;
+    the stand-in for CVs without an experience heading."""
+    return "".join(match.group().strip() + "\n" for match in EXPERIENCE_LINE_PATTERN.finditer(text))
+
+def extract_name_and_contact_from_text(text, segments=None):
+    """Returns the applicant's name and contact details (email | phone | URL) found by segment_cv.
+
+    Without contact details the second line of the text stands in; without a name, a
+    placeholder does, since any other line of the header is a label or contact details.
+    """
+    segments = segments or segment_cv(text)
+    lines = text.split("\n")
+    name = segments.name or "Your Full Name"
+    contact_info = segments.contact or (lines[1] if len(lines) > 1 else "Your Contact Information")
+    return name, contact_info
+
+def parse_cv_text(text, sha256="", extractor=None):
+    """Builds the ParsedCV of text already extracted from a CV."""
+    segments = segment_cv(text)
+    sections = {name: segments.section_text(name) for name in CV_SECTIONS}
+    sections["experience"] = sections["experience"] or extract_experience_from_text(text)
+    name, contact = extract_name_and_contact_from_text(text, segments)
+    skills = (extractor or get_extractor()).extract(text)
+    return ParsedCV(sha256, text, sections, name, contact, skills)
+
+
+class CVCache:
+    """Cache of parsed CVs keyed by a SHA-256 of the file bytes.
+
+    Generating letters for many jobs from one CV reads and hashes the file each time but
+    parses it once: an in-process LRU answers repeat calls and a SQLite table (WAL mode,
+    like SkillCache) keeps the parse across restarts of the dashboard. Keys also cover
+    PARSER_VERSION and the taxonomy version, since both change what a parse returns.
+    """
+
+    def __init__(self, path="cv_cache.db", memory_entries=32):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.parses = 0  # CVs actually parsed, i.e. cache misses
+        self.lock = threading.Lock()
+        self.conn = configure_connection(sqlite3.connect(path, timeout=30, check_same_thread=False))
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS parsed_cvs (
+            key TEXT PRIMARY KEY,
+            parsed TEXT,
+            last_used REAL
+        )
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(sha256, taxonomy_version):
+        return f"{PARSER_VERSION}:{taxonomy_version}:{sha256}"
+
+    def get(self, key):
+        """Returns the cached ParsedCV for a key, or None."""
+        with self.lock:
+            parsed = self.memory.get(key)
+            if parsed is not None:
+                self.memory.move_to_end(key)
+                return parsed
+            row = self.conn.execute("SELECT parsed FROM parsed_cvs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE parsed_cvs SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            parsed = ParsedCV(**json.loads(row[0]))
+            self.remember(key, parsed)
+            return parsed
+
+    def set(self, key, parsed):
+        with self.lock:
+            self.remember(key, parsed)
+            self.conn.execute("INSERT OR REPLACE INTO parsed_cvs (key, parsed, last_used) VALUES (?, ?, ?)",
+                              (key, json.dumps(parsed._asdict()), time.time()))
+            self.conn.commit()
+
+    def remember(self, key, parsed):
+        self.memory[key] = parsed
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def parse(self, cv_file_path, extractor=None):
+        """Returns the ParsedCV of a file, parsing it only if no parse of the same bytes is cached."""
+        extractor = extractor or get_extractor()
+        sha256 = hashlib.sha256(Path(cv_file_path).read_bytes()).hexdigest()
+        key = self.make_key(sha256, extractor.version)
+        parsed = self.get(key)
+        if parsed is None:
+            parsed = parse_cv_text(extract_text_from_cv(cv_file_path), sha256, extractor)
+            with self.lock:
+                self.parses += 1
+            self.set(key, parsed)
+        return parsed
+
+
+@lru_cache(maxsize=None)
+def get_cv_cache():
+    """Returns the shared CV cache, stored at CV_CACHE_PATH (cv_cache.db)."""
+    return CVCache(get_setting("CV_CACHE_PATH", "cv_cache.db"))
+
+def parse_cv(cv_file_path):
+    """Returns the ParsedCV of a CV file (text, sections, name, contact and skills), parsed at most
+    once per distinct file content. Files other than PDF and DOCX give an empty ParsedCV."""
+    if not cv_file_path.lower().endswith(CV_SUFFIXES):
+        return ParsedCV("", "", dict.fromkeys(CV_SECTIONS, ""), "", "", [])
+    return get_cv_cache().parse(cv_file_path)
@@ -0,0 +1,179 @@
+import re
+from typing import NamedTuple
+
+# The sections a CV is split into for cover letters
+CV_SECTIONS = ("experience", "education", "skills", "projects", "contact")
+# Heading lines that start a CV section, mapped to the section's canonical name. Sections
+# other than CV_SECTIONS are there so they end the section before them.
+SECTION_HEADINGS = {
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "research experience": "experience", "teaching experience": "experience",
+    "employment": "experience", "employment history": "experience", "work history": "experience",
+    "education": "education", "academic background": "education", "qualifications": "education",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills", "skills summary": "skills",
+    "projects": "projects", "selected projects": "projects",
+    "contact": "contact", "contact details": "contact", "contact information": "contact",
+    "summary": "summary", "professional summary": "summary", "profile": "summary",
+    "certifications": "certifications", "awards": "awards", "honors/awards": "awards",
+    "training": "training", "professional training": "training", "publications": "publications",
+    "references": "references", "languages": "languages", "interests": "interests",
+}
+
+
+def heading_alternatives(headings):
+    """A regex alternation of headings, longest first, with any run of spaces or tabs between words."""
+    return "|".join(re.escape(heading).replace(r"\ ", r"[ \t]+") for heading in sorted(headings, key=len, reverse=True))
+
+# A heading is a line of its own in any case, a capitalized one followed by a colon and the
+# section's first line ("Skills: Python, SQL"), or an upper-case heading that PDF extraction
+# glued to the end of the previous line ("...March, 2023PROFESSIONAL SUMMARY"). A match ends
+# where the section's body starts. Used on streamed chunks of text, where only headings matter.
+HEADING_PATTERN = re.compile(
+    rf"(?:^[ \t]*(?i:{heading_alternatives(SECTION_HEADINGS)})[ \t]*:?[ \t]*$"
+    rf"|^[ \t]*(?=[A-Z])(?i:{heading_alternatives(SECTION_HEADINGS)})[ \t]*:"
+    rf"|(?<=[^\sA-Z])(?:{heading_alternatives(heading.upper() for heading in SECTION_HEADINGS)})[ \t]*:?[ \t]*$)",
+    re.MULTILINE
+)
+
+# CV_PATTERN finds everything the segmenter looks for in a single pass. It starts with a
+# class of the characters a match can start at, so the regex engine skips between them with
+# its fast character set search instead of trying every alternative at every position; each
+# alternative below then checks what is around that character.
+GLUED_HEADINGS = sorted({heading.upper() for heading in SECTION_HEADINGS}, key=len, reverse=True)
+# After "\n" (segment_cv scans the text with a newline in front): a heading line in any
+# case, alone or followed by a colon and the first line of the section. Only a capitalized
+# heading can have content after it, so a wrapped line that starts "skills: ..." is no heading.
+LINE_HEADING = (
+    rf"(?<=\n)[ \t]*(?=[A-Z]|(?i:{heading_alternatives(SECTION_HEADINGS)})[ \t]*:?[ \t]*$)"
+    rf"(?i:(?P<line_heading>{heading_alternatives(SECTION_HEADINGS)}))(?:[ \t]*:?[ \t]*$|[ \t]*:)"
+)
+# At an upper-case initial after a lower-case letter, digit or symbol: the rest of an
+# upper-case heading glued to the end of the previous line
+GLUED_HEADING = (
+    r"(?<=[^\sA-Z][A-Z])(?P<glued_heading>"
+    + "|".join(rf"(?<={heading[0]}){heading_alternatives([heading[1:]])}" for heading in GLUED_HEADINGS)
+    + r")[ \t]*:?[ \t]*$"
+)
+# After "@": the domain of an email; segment_cv finds the start of the local part
+EMAIL = r"(?<=[\w.+-]@)(?P<email>[\w-]+(?:\.[\w-]+)+)"
+# After ":" or ".": the rest of a URL that starts with "http(s):", "www." or "linkedin." etc.
+URL = (
+    r"(?<=[:.])(?:(?<=https:)|(?<=http:)|(?<=www\.)|(?<=linkedin\.)|(?<=github\.)|(?<=gitlab\.))"
+    r"(?P<url>[^\s|,;<>()]+)"
+)
+# At "+", "(" or a digit that doesn't continue a word or a number: a whole run of 9 to 15
+# digits separated by at most three of " .()-", so that dates and amounts don't match
+PHONE_START = r"(?<![\w.+-].)(?<!\d[ .()-].)(?<!\d[ .()-]{2}.)(?<!\d[ .()-]{3}.)"
+# ...unless the run is only years ("2019 2020 2021"); the first year's leading digit is the
+# character the match started at
+YEAR_RUN = r"(?!(?:(?<=1)9|(?<=2)0)\d\d(?:[ .()-]{1,3}(?:19|20)\d\d)+(?![ .()-]{0,3}\d))"
+PHONE = (
+    rf"{PHONE_START}(?P<phone>(?:(?<=[+(])[ .()-]{{0,3}}+\d|(?<=\d){YEAR_RUN})"
+    r"(?:[ .()-]{0,3}+\d){8,14}+(?![ .()-]{0,3}\d))"
+)
+CV_PATTERN = re.compile(
+    rf"[\n{''.join(sorted({heading[0] for heading in GLUED_HEADINGS}))}@:.+(\d]"
+    rf"(?:{'|'.join([LINE_HEADING, GLUED_HEADING, EMAIL, URL, PHONE])})",
+    re.MULTILINE,
+)
+# Label lines in the header, such as "Location: London"
+LABEL_PATTERN = re.compile(r"^\s*\w[\w ]{0,20}:")
+# Two to four capitalized words that PDF extraction glued to the end of a label line
+# ("Location: Addis Ababa, EthiopiaTihetna Mesfin"), i.e. the name
+GLUED_NAME_PATTERN = re.compile(r"(?<=[a-z.,)])[A-Z][a-z'-]+(?: [A-Z][a-z'-]+){1,3}$")
+
+
+class Span(NamedTuple):
+    kind: str  # "email", "phone" or "url", or a section's canonical name
+    text: str  # The matched text, or the heading of a section
+    start: int  # Character offsets in the CV text: the match, or the body of a section
+    end: int
+
+
+class CVSegments(NamedTuple):
+    text: str
+    header: Span  # Everything before the first heading, usually the name and contact details
+    sections: list  # [Span] of every headed section in order, including ones outside CV_SECTIONS
+    contacts: list  # [Span] of every email, phone number and URL in order
+
+    def section_text(self, name):
+        """Returns the bodies of every section with a canonical name, joined, or "" if there is none.
+
+        Without a contact heading, the header stands in for the contact section.
+        """
+        bodies = [self.text[section.start:section.end].strip() for section in self.sections if section.kind == name]
+        if not bodies and name == "contact":
+            bodies = [self.text[self.header.start:self.header.end].strip()]
+        return "\n".join(body for body in bodies if body)
+
+    def found(self, kind):
+        """Returns the texts of the contact spans of one kind ("email", "phone" or "url")."""
+        return [span.text for span in self.contacts if span.kind == kind]
+
+    @property
+    def name(self):
+        """The first short header line that isn't contact details or a label, or "" if there is none.
+
+        A name glued to the end of a label line counts; the rest of a label line never does.
+        """
+        for line in self.text[self.header.start:self.header.end].splitlines():
+            line = line.strip()
+            if LABEL_PATTERN.match(line):
+                glued = GLUED_NAME_PATTERN.search(line)
+                line = glued.group() if glued else ""
+            if (line and len(line.split()) <= 6 and not CV_PATTERN.search(line)
+                    and any(char.isalpha() for char in line)):
+                return line
+        return ""
+
+    @property
+    def contact(self):
+        """The first email, phone number and URL, joined with " | "."""
+        return " | ".join(found[0] for found in (self.found("email"), self.found("phone"), self.found("url")) if found)
+
+
+def heading_section(match):
+    """The canonical section of a heading matched by HEADING_PATTERN or CV_PATTERN."""
+    return SECTION_HEADINGS[" ".join(match.group().strip(" \t\n:").lower().split())]
+
+def run_start(text, end, symbols=""):
+    """The start of the run of letters, digits and symbols that ends at end."""
+    start = end
+    while start and (text[start - 1].isalnum() or text[start - 1] in symbols):
+        start -= 1
+    return start
+
+def segment_cv(text):
+    """Splits CV text into headed sections and finds its contact details in one pass of CV_PATTERN.
+
+    A small state machine walks the matches in order: each heading closes the open section
+    (or the header) and opens the next, and emails, phone numbers and URLs are collected as
+    spans wherever they appear. Returns a CVSegments.
+    """
+    text = text or ""
+    # The newline in front lets a heading on the first line match; offsets in scanned are one ahead
+    scanned = "\n" + text
+    sections, contacts = [], []
+    header = None
+    open_kind, open_heading, open_start = None, "", 0
+    for match in CV_PATTERN.finditer(scanned):
+        kind = match.lastgroup
+        start, end = match.start() - 1, match.end() - 1
+        if kind in ("line_heading", "glued_heading"):
+            if open_kind is None:
+                header = Span("header", "", 0, max(start, 0))
+            else:
+                sections.append(Span(open_kind, open_heading, open_start, max(start, open_start)))
+            open_kind, open_heading, open_start = heading_section(match), match.group().strip(" \t\n:"), end
+            continue
+        if kind == "email":
+            start = run_start(text, start, "_.+-")
+        elif kind == "url":
+            start = run_start(text, start)
+        value = text[start:end].rstrip(".")
+        contacts.append(Span(kind, value, start, start + len(value)))
+    if open_kind is None:
+        header = Span("header", "", 0, len(text))
+    else:
+        sections.append(Span(open_kind, open_heading, open_start, len(text)))
+    return CVSegments(text, header, sections, contacts)
@@ -0,0 +1,96 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from src.cv_sections import HEADING_PATTERN, heading_section
+from src.lazy_imports import get_docx_document, get_pdf_reader
+
+# A process pool only pays for its start up on long documents; shorter ones are read in-process
+PARALLEL_MIN_PAGES = 16
+# Pages extracted per pool task, so each worker opens the file once for several pages
+PAGES_PER_TASK = 4
+
+
+def iter_pdf_pages(path, first=0, last=None):
+    """Yields the text of each page of a PDF in order, from page first up to (not including) last."""
+    with open(path, "rb") as f:
+        reader = get_pdf_reader()(f)
+        for page in reader.pages[first:last]:
+            yield page.extract_text() or ""
+
+def extract_pdf_pages(path, first, last):
+    """Returns the texts of pages [first, last) of a PDF; the unit of work of a pool worker."""
+    return list(iter_pdf_pages(path, first, last))
+
+def iter_pdf_pages_parallel(path, processes=None):
+    """Like iter_pdf_pages, with the pages extracted by a pool of processes.
+
+    Runs of PAGES_PER_TASK pages are extracted concurrently and yielded in page order as
+    soon as the run they belong to is done. Documents under PARALLEL_MIN_PAGES pages are
+    read in-process. Stopping the generator early cancels the runs not yet started.
+    """
+    with open(path, "rb") as f:
+        pages = len(get_pdf_reader()(f).pages)
+    if pages < PARALLEL_MIN_PAGES:
+        yield from iter_pdf_pages(path)
+        return
+    executor = ProcessPoolExecutor(processes)
+    try:
+        runs = [executor.submit(extract_pdf_pages, path, first, first + PAGES_PER_TASK)
+                for first in range(0, pages, PAGES_PER_TASK)]
+        for run in runs:
+            yield from run.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def iter_docx_paragraphs(path):
+    """Yields the text of each paragraph of a DOCX document in order."""
+    for paragraph in get_docx_document()(path).paragraphs:
+        yield paragraph.text
+
+def iter_document_text(path, processes=None):
+    """Yields the text of a PDF page by page or of a DOCX document paragraph by paragraph.
+
+    processes=None reads PDFs in-process; any other value reads long ones with a pool of that
+    many processes (0 for one per CPU). Other file types yield nothing.
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".pdf":
+        yield from (iter_pdf_pages(path) if processes is None else iter_pdf_pages_parallel(path, processes or None))
+    elif suffix == ".docx":
+        yield from iter_docx_paragraphs(path)
+
+
+class SectionWatcher:
+    """Tells when streamed text has covered every required CV section.
+
+    Called with each chunk of text in order, it notes the section headings in it and
+    returns True once every required section has started and been followed by another
+    heading, so the last of them is complete too.
+    """
+
+    def __init__(self, required):
+        self.required = set(required)
+        self.seen = set()
+        self.done = False
+
+    def __call__(self, chunk):
+        for heading in HEADING_PATTERN.finditer(chunk):
+            if self.required <= self.seen:
+                self.done = True
+            self.seen.add(heading_section(heading))
+        return self.done
+
+def extract_document_text(path, processes=None, required_sections=None):
+    """Returns the plain text of a PDF (pages separated by newlines) or DOCX document.
+
+    With required_sections (e.g. {"experience", "education"}) reading stops at the first
+    page or paragraph after all of them are complete, and the rest is never extracted.
+    """
+    watcher = SectionWatcher(required_sections) if required_sections else None
+    chunks = []
+    stream = iter_document_text(path, processes)
+    for chunk in stream:
+        chunks.append(chunk)
+        if watcher and watcher(chunk):
+            stream.close()
+            break
+    return "\n".join(chunks)
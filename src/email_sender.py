@@ -6,17 +6,9 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
-from dotenv import load_dotenv
+from src.config import get_setting
 from src.cover_letter_generator import generate_cover_letter  # Import the cover letter generator
 
-# Load environment variables from .env file
-# load_dotenv('email.env')
-
-
-# Load the .env file
-load_dotenv(dotenv_path=r"C:\Users\dell\OneDrive\Desktop\new_AI_job\AI-Agent-Job-Assistant\env\email.env")
-
-
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -32,10 +24,10 @@ def send_job_application_email(to_email, job_title, company, applicant_name, cv_
             cover_letter_path = generate_cover_letter(job_title, company, applicant_name, cv_file)
 
         # Get email credentials from environment variables
-        email_user = os.getenv('EMAIL_USER')
-        email_password = os.getenv('EMAIL_PASSWORD')
-        email_host = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
-        email_port = int(os.getenv('EMAIL_PORT', 587))
+        email_user = get_setting('EMAIL_USER')
+        email_password = get_setting('EMAIL_PASSWORD')
+        email_host = get_setting('EMAIL_HOST', 'smtp.gmail.com')
+        email_port = int(get_setting('EMAIL_PORT', 587))
 
         if not email_user or not email_password:
             logging.error("Email credentials are not set properly in environment variables.")
@@ -115,12 +107,13 @@ def send_job_application_email(to_email, job_title, company, applicant_name, cv_
 
 
 # Example usage for sending an application email
-logging.info("Sending email...")
-send_job_application_email(
-    to_email=os.getenv('EMAIL_USER'),
-    job_title="Data Scientist",
-    company="TechCorp",
-    applicant_name="John Doe",  # Name of the applicant
-    cv_path="path_to_uploaded_cv.pdf"  # Path to uploaded CV
-)
-logging.info("Email function executed.")
+if __name__ == "__main__":
+    logging.info("Sending email...")
+    send_job_application_email(
+        to_email=get_setting('EMAIL_USER'),
+        job_title="Data Scientist",
+        company="TechCorp",
+        applicant_name="John Doe",  # Name of the applicant
+        cv_path="path_to_uploaded_cv.pdf"  # Path to uploaded CV
+    )
+    logging.info("Email function executed.")
@@ -2,10 +2,8 @@
 import os
 import pickle
 from pathlib import Path
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
 import streamlit as st
+from src.lazy_imports import get_google_auth
 
 class GoogleOAuth:
     def __init__(self):
@@ -19,6 +17,7 @@ class GoogleOAuth:
 
     def authenticate(self):
         """Handles the entire OAuth flow"""
+        Flow, Request, Credentials = get_google_auth()
         # Check for existing token
         if self.token_file.exists():
             self.creds = Credentials.from_authorized_user_file(
@@ -1,20 +1,9 @@
 import os
 import time
-import gspread
-from google.auth.transport.requests import Request
-from google.oauth2.service_account import Credentials
 from src.google_oauth import GoogleOAuth  # Add this import
+from src.lazy_imports import get_gspread
 import logging
 import traceback
-from dotenv import load_dotenv
-
-# Load environment variables from google_sheets.env
-# load_dotenv("google_sheets.env")
-
-
-# Load the .env file
-load_dotenv(dotenv_path=r"C:\Users\dell\OneDrive\Desktop\new_AI_job\AI-Agent-Job-Assistant\env\google_sheets.env")
-
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -37,7 +26,7 @@ def authenticate_gsheet():
     try:
         oauth = GoogleOAuth()
         creds = oauth.authenticate()
-        return gspread.authorize(creds)
+        return get_gspread().authorize(creds)
     except Exception as e:
         logging.error(f"Authentication failed: {e}")
         return None
@@ -69,7 +58,7 @@ def update_job_status_in_sheet(json_credentials_file, spreadsheet_id, sheet_name
                 sheet.append_row(job_row)
                 logging.info(f"Job data for {job_data['job_title']} added to Google Sheets.")
                 return True
-            except gspread.exceptions.APIError as api_err:
+            except get_gspread().exceptions.APIError as api_err:
                 logging.error(f"API Error (attempt {attempt+1}/{retries}): {api_err}")
                 time.sleep(2 ** attempt)  # Exponential backoff
             except Exception as e:
@@ -142,7 +131,7 @@ if __name__ == "__main__":
         exit(1)
         
     # Initialize gspread client
-    client = gspread.authorize(creds)
+    client = get_gspread().authorize(creds)
     
     # List available spreadsheets (optional)
     print("Available spreadsheets:")
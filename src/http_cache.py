@@ -0,0 +1,102 @@
+import json
+import sqlite3
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# Query parameters that identify the caller rather than the search
+CREDENTIAL_PARAMS = {"app_id", "app_key"}
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size=20):
+    """Returns the process-wide requests session so connections are kept alive and reused."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+class ResponseCache:
+    """Persistent cache of API responses with a TTL and least-recently-used eviction.
+
+    Entries live in a small SQLite database so repeated searches are served locally across
+    runs and Streamlit sessions. Every write deletes the entries older than the TTL, and once
+    more than max_entries are stored the least recently used ones are evicted.
+    """
+
+    def __init__(self, path="http_cache.db", ttl=3600, max_entries=2000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            body TEXT,
+            fetched_at REAL,
+            last_used REAL
+        )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_fetched_at ON responses (fetched_at)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(url, params):
+        """Builds a cache key from the URL and the search parameters (what, where, filters)."""
+        query = {name: value for name, value in params.items() if name not in CREDENTIAL_PARAMS}
+        return url + "?" + json.dumps(query, sort_keys=True, default=str)
+
+    def get(self, key):
+        """Returns the cached JSON body for key, or None if it is missing or expired."""
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, data):
+        """Stores a JSON-serializable response, deletes expired entries and evicts the least
+        recently used overflow."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, fetched_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(data), now, now)
+            )
+            self.conn.execute("DELETE FROM responses WHERE fetched_at < ?", (now - self.ttl,))
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def clear(self):
+        """Removes every cached response."""
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def stats(self):
+        """Returns the hit and miss counters along with the current number of entries."""
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
@@ -0,0 +1,180 @@
+import sqlite3
+import zlib
+import numpy as np
+from src.text_tokens import tokenize
+from src.job_schema import create_schema, normalize_text
+from src.job_writer import configure_connection
+
+# MinHash values per signature. Similarities are estimated to within about ±0.03 (one
+# standard deviation); each value is kept as its low 16 bits, 512 bytes per posting.
+NUM_PERM = 256
+# The first 42 x 3 values are banded for LSH: postings whose word sets have a Jaccard
+# similarity of 0.35 share a bucket with 84% probability, unrelated ones (0.1) with 4%
+BANDS = 42
+ROWS_PER_BAND = 3
+# Estimated Jaccard similarity from which two postings with the same title are one job
+THRESHOLD = 0.35
+# Fixed, so signatures stored by one process can be compared by any other
+SEED = 20250301
+
+
+def shingles(text):
+    """The distinct words of a posting as 32-bit hashes.
+
+    Descriptions are short snippets and reposts rewrite them phrase by phrase, so word
+    n-grams barely overlap between two versions of the same job; the word set does.
+    """
+    return np.fromiter({zlib.crc32(token.encode("utf-8")) for token in tokenize(text)}, np.uint64)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index that clusters near-duplicate postings, kept in job_clusters and job_lsh.
+
+    Every posting gets a NUM_PERM-value MinHash signature of its word set, computed in one
+    vectorized pass of multiply-shift hashes. The signature is cut into BANDS bands and
+    each band is hashed into an indexed LSH bucket, so finding the postings that may be
+    duplicates of a new one is BANDS index lookups, whatever the size of the table. The
+    candidates' stored signatures then estimate the actual similarity: a posting joins the
+    cluster of the most similar one with the same title at THRESHOLD or above, or starts
+    its own. Clusters are never merged, so a cluster id stays stable once handed out.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        rng = np.random.default_rng(SEED)
+        self.multipliers = rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+        self.band_multipliers = rng.integers(1, 2 ** 63, (ROWS_PER_BAND + 1, 1), dtype=np.uint64) | np.uint64(1)
+
+    def signature(self, text):
+        """MinHash signature of a text as a NUM_PERM uint16 array."""
+        hashes = shingles(text)
+        if not len(hashes):
+            return np.full(NUM_PERM, 0xFFFF, np.uint16)
+        # uint64 products wrap around, which is exactly multiply-shift hashing
+        values = (hashes[:, None] * self.multipliers + self.offsets) >> np.uint64(32)
+        return values.min(axis=0).astype(np.uint16)
+
+    def buckets(self, signature):
+        """The LSH bucket of each band of a signature, as signed 64-bit keys.
+
+        Buckets depend on the stored signature alone, so a posting's buckets can always be
+        found again to remove them.
+        """
+        bands = signature[:BANDS * ROWS_PER_BAND].reshape(BANDS, ROWS_PER_BAND).astype(np.uint64).T
+        keys = (bands * self.band_multipliers[:-1]).sum(axis=0)
+        keys += np.arange(BANDS, dtype=np.uint64) * self.band_multipliers[-1]
+        return keys.view(np.int64).tolist()
+
+    def assign(self, conn, job_id, content_hash, title, company, description):
+        """Stores a posting's signature and buckets and returns the id of its cluster."""
+        signature = self.signature(f"{title or ''} {company or ''} {description or ''}")
+        buckets = self.buckets(signature)
+        self.detach(conn, job_id)
+        candidates = conn.execute(f'''
+        SELECT job_clusters.job_id, job_clusters.cluster_id, job_clusters.signature, jobs.title
+        FROM job_clusters JOIN jobs ON jobs.id = job_clusters.job_id
+        WHERE job_clusters.job_id IN (SELECT job_id FROM job_lsh WHERE bucket IN ({', '.join('?' * len(buckets))}))
+        ''', buckets).fetchall()
+        cluster_id, best = job_id, self.threshold
+        title = normalize_text(title)
+        for _, candidate_cluster, candidate_signature, candidate_title in candidates:
+            if normalize_text(candidate_title) != title:
+                continue
+            similarity = float(np.mean(np.frombuffer(candidate_signature, np.uint16) == signature))
+            if similarity >= best:
+                cluster_id, best = candidate_cluster, similarity
+        conn.execute(
+            "INSERT INTO job_clusters (job_id, cluster_id, content_hash, signature) VALUES (?, ?, ?, ?)",
+            (job_id, cluster_id, content_hash, signature.tobytes())
+        )
+        conn.executemany("INSERT OR IGNORE INTO job_lsh (bucket, job_id) VALUES (?, ?)",
+                         [(bucket, job_id) for bucket in buckets])
+        return cluster_id
+
+    def detach(self, conn, job_id):
+        """Removes a posting from the index, handing its cluster id on if other postings use it."""
+        row = conn.execute("SELECT signature FROM job_clusters WHERE job_id = ?", (job_id,)).fetchone()
+        if row:
+            conn.executemany("DELETE FROM job_lsh WHERE bucket = ? AND job_id = ?",
+                             [(bucket, job_id) for bucket in self.buckets(np.frombuffer(row[0], np.uint16))])
+            conn.execute("DELETE FROM job_clusters WHERE job_id = ?", (job_id,))
+            conn.execute(
+                "UPDATE job_clusters SET cluster_id = "
+                "(SELECT MIN(job_id) FROM job_clusters WHERE cluster_id = ?) WHERE cluster_id = ?",
+                (job_id, job_id)
+            )
+
+    def add(self, conn, jobs):
+        """Clusters (job id, content hash, title, company, description) rows in order, so
+        duplicates within the same batch find each other. Returns the number of postings clustered."""
+        count = 0
+        for job_id, content_hash, title, company, description in jobs:
+            self.assign(conn, job_id, content_hash, title, company, description)
+            count += 1
+        return count
+
+    def add_keys(self, conn, job_keys):
+        """Clusters the stored postings with the given job_keys, e.g. the ones just upserted."""
+        job_keys = list(job_keys)
+        count = 0
+        for start in range(0, len(job_keys), 500):
+            chunk = job_keys[start:start + 500]
+            count += self.add(conn, conn.execute(
+                f"SELECT id, content_hash, title, company, description FROM jobs_view "
+                f"WHERE job_key IN ({', '.join('?' * len(chunk))}) ORDER BY id", chunk
+            ).fetchall())
+        return count
+
+
+def cluster_pending(conn, index=None, batch_size=1000):
+    """Clusters every posting that is missing from job_clusters or changed since it was clustered.
+
+    Pages through jobs by id and commits after each page. Returns the number of postings clustered.
+    """
+    conn = conn if isinstance(conn, sqlite3.Connection) else configure_connection(sqlite3.connect(conn, timeout=30))
+    create_schema(conn)
+    index = index or NearDuplicateIndex()
+    last_id = count = 0
+    while True:
+        rows = conn.execute('''
+        SELECT jobs.id, jobs.content_hash, jobs.title, companies.name, jobs.description
+        FROM jobs JOIN companies ON companies.id = jobs.company_id
+        LEFT JOIN job_clusters ON job_clusters.job_id = jobs.id
+        WHERE jobs.id > ? AND (job_clusters.job_id IS NULL OR job_clusters.content_hash IS NOT jobs.content_hash)
+        ORDER BY jobs.id LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+        with conn:
+            count += index.add(conn, rows)
+        last_id = rows[-1][0]
+    # The buckets of deleted postings are skipped by lookups and only removed here
+    with conn:
+        conn.execute("DELETE FROM job_lsh WHERE job_id NOT IN (SELECT job_id FROM job_clusters)")
+    return count
+
+def list_clusters(conn, min_size=2):
+    """Returns [(cluster id, number of postings, [job ids])] of the clusters with at least min_size postings."""
+    rows = conn.execute('''
+    SELECT cluster_id, COUNT(*) AS size, GROUP_CONCAT(job_id) FROM job_clusters
+    GROUP BY cluster_id HAVING size >= ? ORDER BY size DESC, cluster_id
+    ''', (min_size,)).fetchall()
+    return [(cluster_id, size, sorted(int(job_id) for job_id in job_ids.split(","))) for cluster_id, size, job_ids in rows]
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Cluster the near-duplicate postings stored in a jobs database.")
+    parser.add_argument("db", nargs="?", default="jobs.db")
+    parser.add_argument("--show", type=int, default=10, help="Print the largest clusters")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    clustered = cluster_pending(args.db)
+    print(f"✅ Clustered {clustered} postings in {time.perf_counter() - start:.1f}s.")
+    with sqlite3.connect(args.db) as conn:
+        for cluster_id, size, job_ids in list_clusters(conn)[:args.show]:
+            title, company = conn.execute("SELECT title, company FROM jobs_view WHERE id = ?", (cluster_id,)).fetchone()
+            print(f"🔁 {size} postings of {title!r} at {company}: {', '.join(map(str, job_ids))}")
@@ -0,0 +1,177 @@
+import csv
+import os
+from src.job_query import QUERYABLE_COLUMNS, build_where, check_columns
+
+# Exported by default: every job column except the internal dedup bookkeeping
+EXPORT_COLUMNS = [name for name in QUERYABLE_COLUMNS if name not in ("job_key", "content_hash")]
+ARROW_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+# Parquet is compressed by default. Arrow IPC is left uncompressed by default, which is
+# what lets readers memory-map it without copying; pass compression="zstd" or "lz4" to trade.
+DEFAULT_COMPRESSION = {"parquet": "zstd", "arrow": None}
+
+def iter_job_chunks(conn, columns=None, chunk_size=10000, **filters):
+    """Yields lists of row tuples from jobs_view, chunk_size rows at a time, oldest first.
+
+    Filters are the keyword arguments of src.job_query.build_where.
+    """
+    columns = columns or EXPORT_COLUMNS
+    check_columns(columns)
+    where, params = build_where(**filters)
+    selected = f" WHERE id IN (SELECT id FROM jobs{where})" if where else ""
+    cursor = conn.execute(f"SELECT {', '.join(columns)} FROM jobs_view{selected} ORDER BY id", params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+def export_csv(conn, path, columns=None, chunk_size=10000, **filters):
+    """Streams the saved jobs to a CSV file and returns the number of rows written.
+
+    The file is written next to its destination and moved into place once complete, so
+    readers never see a half-written export.
+    """
+    columns = columns or EXPORT_COLUMNS
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = path + ".partial"
+    count = 0
+    with open(partial, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for rows in iter_job_chunks(conn, columns, chunk_size, **filters):
+            writer.writerows(rows)
+            count += len(rows)
+    os.replace(partial, path)
+    return count
+
+def scrape_dates(conn, **filters):
+    """Returns the distinct YYYY-MM-DD dates on which the matching jobs were scraped."""
+    where, params = build_where(**filters)
+    rows = conn.execute(
+        f"SELECT DISTINCT substr(scraped_at, 1, 10) FROM jobs{where} ORDER BY 1", params
+    ).fetchall()
+    return [date for (date,) in rows if date]
+
+def day_filters(date, **filters):
+    """Narrows filters to the jobs scraped on date (YYYY-MM-DD), keeping the caller's scraped_at
+    bounds where they are tighter than the day."""
+    day_end = date + "T23:59:59Z"
+    after, before = filters.get("scraped_after"), filters.get("scraped_before")
+    if before and "T" not in before:
+        before += "T23:59:59Z"
+    # ISO timestamps order as strings, and a bare date sorts before any time on that day
+    return {**filters, "scraped_after": max(after or date, date), "scraped_before": min(before or day_end, day_end)}
+
+def arrow_schema(columns):
+    """pyarrow schema for the exported columns; timestamps are typed so they can be filtered."""
+    import pyarrow as pa
+
+    types = {
+        "id": pa.int64(),
+        "cluster_id": pa.int64(),
+        "salary_min": pa.float64(),
+        "salary_max": pa.float64(),
+        "created": pa.timestamp("s", tz="UTC"),
+        "scraped_at": pa.timestamp("s", tz="UTC"),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in columns])
+
+def rows_to_batch(rows, schema):
+    """Converts row tuples into a pyarrow RecordBatch, column by column."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_timestamp(field.type):
+            # Placeholders such as "Unknown" become nulls instead of failing the cast
+            text = pa.array(values, pa.string())
+            parsed = pc.strptime(text, format="%Y-%m-%dT%H:%M:%SZ", unit="s", error_is_null=True)
+            arrays.append(pc.cast(parsed, field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def export_arrow(conn, directory, format="parquet", columns=None, chunk_size=50000, compression="default",
+                 **filters):
+    """Streams the saved jobs into one Parquet or Arrow IPC file per scrape date.
+
+    Files use the Hive layout (directory/scrape_date=2025-03-01/part-0.parquet) that pyarrow,
+    pandas and DuckDB read as a partitioned dataset. Each partition is written batch by batch
+    with a single open writer, so at most chunk_size rows are held in memory. Partitions
+    present in this export are replaced; other dates already in the directory are left
+    untouched. Returns a {scrape_date: rows} dict.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if format not in ARROW_FORMATS:
+        raise ValueError(f"Unknown export format {format!r}, expected one of {', '.join(ARROW_FORMATS)}")
+    if compression == "default":
+        compression = DEFAULT_COMPRESSION[format]
+    columns = columns or EXPORT_COLUMNS
+    schema = arrow_schema(columns)
+
+    written = {}
+    for date in scrape_dates(conn, **filters):
+        partition = os.path.join(directory, f"scrape_date={date}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, "part-0" + ARROW_FORMATS[format])
+        partial = path + ".partial"
+        # The filter is an inclusive ISO range, so it can be answered from idx_jobs_scraped_at
+        day = day_filters(date, **filters)
+        if format == "parquet":
+            writer = pq.ParquetWriter(partial, schema, compression=compression or "none")
+        else:
+            writer = pa.ipc.new_file(partial, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+        count = 0
+        try:
+            for rows in iter_job_chunks(conn, columns, chunk_size, **day):
+                writer.write_batch(rows_to_batch(rows, schema))
+                count += len(rows)
+        finally:
+            writer.close()
+        os.replace(partial, path)
+        written[date] = count
+    return written
+
+def read_export(directory, columns=None, format="parquet", filter=None):
+    """Loads an export directory as a pyarrow Table, reading only the requested columns.
+
+    Arrow IPC files are memory-mapped and Parquet row groups outside `filter` (a
+    pyarrow.compute expression, e.g. on scrape_date) are skipped. Call .to_pandas() for a
+    DataFrame.
+    """
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    if format == "arrow":
+        dataset = ds.dataset(directory, format="ipc", partitioning="hive",
+                             filesystem=fs.LocalFileSystem(use_mmap=True))
+    else:
+        dataset = ds.dataset(directory, format=format, partitioning="hive")
+    return dataset.to_table(columns=columns, filter=filter)
+
+if __name__ == "__main__":
+    import argparse
+    import sqlite3
+
+    parser = argparse.ArgumentParser(description="Export saved jobs to CSV, Parquet or Arrow IPC.")
+    parser.add_argument("--db", default="jobs.db")
+    parser.add_argument("--format", choices=["csv"] + list(ARROW_FORMATS), default="parquet")
+    parser.add_argument("--output", help="CSV file or partition directory (default ./Data/...)")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    if args.format == "csv":
+        output = args.output or "./Data/saved_jobs.csv"
+        print(f"✅ Exported {export_csv(conn, output)} jobs to {output}")
+    else:
+        output = args.output or "./Data/jobs"
+        partitions = export_arrow(conn, output, args.format)
+        print(f"✅ Exported {sum(partitions.values())} jobs in {len(partitions)} partitions to {output}")
+    conn.close()
@@ -0,0 +1,135 @@
+import pandas as pd
+from src.job_schema import JOB_COLUMNS, LOCATION_LEVELS
+
+QUERYABLE_COLUMNS = ["id"] + JOB_COLUMNS + LOCATION_LEVELS + ["scraped_at", "cluster_id"]
+# Sorting happens on the jobs table itself, so only its own columns can be sort keys
+SORTABLE_COLUMNS = ["id", "job_title", "title", "created", "salary_min", "salary_max", "scraped_at"]
+# Postings that are reposts of an earlier one, i.e. not the first posting of their cluster
+DUPLICATE_IDS = "SELECT job_id FROM job_clusters WHERE cluster_id != job_id"
+
+def prefix_upper_bound(prefix):
+    """Returns the smallest string above every string starting with prefix under NOCASE, or
+    None if there is none: the prefix with its last character incremented."""
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    following = ord(prefix[-1]) + 1
+    if following == ord("A"):
+        following = ord("[")  # NOCASE folds A-Z to a-z, so "[" is what follows "@"
+    elif following == 0xD800:
+        following = 0xE000  # Surrogates can't be stored as UTF-8
+    return prefix[:-1] + chr(following)
+
+def build_where(title=None, company=None, location=None, salary_min=None, salary_max=None,
+                contract_type=None, contract_time=None, created_after=None, created_before=None,
+                region=None, scraped_after=None, scraped_before=None, hide_duplicates=False):
+    """Translates the filters into a WHERE clause on the jobs table and its parameters.
+
+    title matches case-insensitively by prefix, company, location and region
+    case-insensitively in full. The salary range keeps jobs whose advertised range overlaps
+    [salary_min, salary_max], and the created and scraped windows are inclusive of both ISO dates.
+    hide_duplicates keeps only the first posting of each cluster of near duplicates (src.job_dedup).
+    Lookup-table filters become id lookups, so every clause can use an index on jobs.
+    """
+    clauses, params = [], []
+    if title:
+        # Range form of a prefix match, which SQLite can answer from idx_jobs_title
+        upper = prefix_upper_bound(title)
+        clauses.append("title >= ? COLLATE NOCASE" + (" AND title < ? COLLATE NOCASE" if upper else ""))
+        params += [title, upper] if upper else [title]
+    if company:
+        clauses.append("company_id IN (SELECT id FROM companies WHERE name = ? COLLATE NOCASE)")
+        params.append(company)
+    if location:
+        clauses.append("location_id IN (SELECT id FROM locations WHERE display_name = ? COLLATE NOCASE)")
+        params.append(location)
+    if region:
+        clauses.append("location_id IN (SELECT id FROM locations WHERE region = ? COLLATE NOCASE)")
+        params.append(region)
+    if salary_min is not None:
+        clauses.append("salary_max >= ?")
+        params.append(salary_min)
+    if salary_max is not None:
+        clauses.append("salary_min <= ?")
+        params.append(salary_max)
+    if contract_type:
+        clauses.append("contract_type = (SELECT id FROM contract_types WHERE name = ?)")
+        params.append(contract_type)
+    if contract_time:
+        clauses.append("contract_time = (SELECT id FROM contract_times WHERE name = ?)")
+        params.append(contract_time)
+    if created_after:
+        clauses.append("created >= ?")
+        params.append(created_after)
+    if created_before:
+        # Dates without a time still include postings from that whole day
+        clauses.append("created <= ?")
+        params.append(created_before if "T" in created_before else created_before + "T23:59:59Z")
+    if scraped_after:
+        clauses.append("scraped_at >= ?")
+        params.append(scraped_after)
+    if scraped_before:
+        clauses.append("scraped_at <= ?")
+        params.append(scraped_before if "T" in scraped_before else scraped_before + "T23:59:59Z")
+    if hide_duplicates:
+        clauses.append(f"id NOT IN ({DUPLICATE_IDS})")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+def duplicate_ids(conn):
+    """Returns the ids of every posting hidden by hide_duplicates."""
+    return {job_id for (job_id,) in conn.execute(DUPLICATE_IDS)}
+
+def check_columns(columns):
+    unknown = [name for name in columns if name not in QUERYABLE_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown job columns: {', '.join(unknown)}")
+
+def query_jobs(conn, columns=None, order_by="created", descending=True, limit=50, offset=0, **filters):
+    """Returns one page of jobs as a DataFrame, filtered, sorted and paginated inside SQLite.
+
+    columns limits the fetched columns (all job columns by default). Filters are the keyword
+    arguments of build_where. limit=None returns every matching row. The page is picked on
+    the jobs table and only its rows are decoded through jobs_view.
+    """
+    columns = columns or QUERYABLE_COLUMNS
+    check_columns(columns)
+    if order_by not in SORTABLE_COLUMNS:
+        raise ValueError(f"Jobs can only be sorted by {', '.join(SORTABLE_COLUMNS)}")
+
+    where, params = build_where(**filters)
+    direction = "DESC" if descending else "ASC"
+    # Indexes end in the rowid, so ordering ties by id the same way keeps the sort index-only
+    order = f"ORDER BY {order_by} {direction}, id {direction}"
+    page = f"SELECT id FROM jobs{where} {order}"
+    if limit is not None:
+        page += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    query = f"SELECT {', '.join(columns)} FROM jobs_view WHERE id IN ({page}) {order}"
+    return pd.read_sql_query(query, conn, params=params)
+
+def count_jobs(conn, **filters):
+    """Counts the jobs matching the filters, e.g. to work out the number of pages."""
+    where, params = build_where(**filters)
+    return conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+
+def get_job(conn, job_id, columns=None):
+    """Returns a single job as a dict, or None if it doesn't exist."""
+    columns = columns or QUERYABLE_COLUMNS
+    check_columns(columns)
+    row = conn.execute(f"SELECT {', '.join(columns)} FROM jobs_view WHERE id = ?", (job_id,)).fetchone()
+    return dict(zip(columns, row)) if row else None
+
+def jobs_by_id(conn, job_ids, columns=None):
+    """Returns the given jobs as a DataFrame indexed by id, in the order of job_ids.
+
+    Ids that no longer exist are skipped, e.g. jobs deleted since a search index saw them.
+    """
+    columns = columns or QUERYABLE_COLUMNS
+    check_columns(columns)
+    job_ids = list(job_ids)
+    selected = list(dict.fromkeys(["id"] + list(columns)))
+    jobs = pd.read_sql_query(
+        f"SELECT {', '.join(selected)} FROM jobs_view WHERE id IN ({', '.join('?' * len(job_ids))})",
+        conn, params=job_ids
+    ).set_index("id", drop=False)
+    return jobs.loc[[job_id for job_id in job_ids if job_id in jobs.index], list(columns)]
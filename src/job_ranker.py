@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import tempfile
+from collections import Counter
+import numpy as np
+from src.job_query import duplicate_ids, jobs_by_id
+from src.text_tokens import tokenize
+
+# Share of replaced or removed rows at which they are dropped from the index
+DEAD_ROW_SHARE = 0.25
+
+
+class Postings:
+    """One segment of the term-major (CSC) posting matrix: parallel arrays sorted by term id."""
+
+    def __init__(self, terms=None, rows=None, tfs=None):
+        self.terms = np.zeros(0, np.int32) if terms is None else terms
+        self.rows = np.zeros(0, np.int32) if rows is None else rows
+        self.tfs = np.zeros(0, np.float32) if tfs is None else tfs
+
+    def __len__(self):
+        return len(self.terms)
+
+    @classmethod
+    def merge(cls, *segments, keep=None):
+        """Combines segments into one, dropping the postings of rows where keep is False."""
+        terms = np.concatenate([segment.terms for segment in segments])
+        rows = np.concatenate([segment.rows for segment in segments])
+        tfs = np.concatenate([segment.tfs for segment in segments])
+        if keep is not None:
+            mask = keep[rows]
+            terms, rows, tfs = terms[mask], rows[mask], tfs[mask]
+        order = np.argsort(terms, kind="stable")
+        return cls(terms[order], rows[order], tfs[order])
+
+    def gather(self, term_ids):
+        """Returns (query term positions, rows, tfs) of every posting of the given term ids."""
+        starts = np.searchsorted(self.terms, term_ids, side="left")
+        counts = np.searchsorted(self.terms, term_ids, side="right") - starts
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, np.int64), np.zeros(0, np.int32), np.zeros(0, np.float32)
+        # Posting indexes of all the ranges at once: each range's start, plus 0..count-1
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        return np.repeat(np.arange(len(term_ids)), counts), self.rows[offsets], self.tfs[offsets]
+
+
+class JobRanker:
+    """BM25 ranking of stored job descriptions against free text such as a CV.
+
+    Term frequencies are kept as a sparse term-major matrix of postings, so a query only
+    touches the postings of its own terms: scoring every posting is one vectorized pass
+    (np.bincount over those postings, i.e. a sparse matrix-vector product) followed by a
+    top-k partition. New postings go into a small delta segment that is merged into the
+    main one once it reaches a tenth of its size, so updates never rebuild the whole
+    matrix. BM25 statistics (document frequencies, average length) are computed at query
+    time, which keeps them exact however the index was built up.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary = {}  # Term -> term id
+        self.job_ids = np.zeros(0, np.int64)  # Row -> jobs.id
+        self.lengths = np.zeros(0, np.float32)  # Row -> number of terms
+        self.alive = np.zeros(0, bool)  # Row -> still the current version of its job
+        self.rows = {}  # jobs.id -> row
+        self.hashes = {}  # jobs.id -> content hash the row was built from
+        self.main = Postings()
+        self.delta = Postings()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, jobs):
+        """Indexes (job id, content hash, description) triples, replacing older versions of the same jobs."""
+        terms, rows, tfs, job_ids, lengths = [], [], [], [], []
+        first_row = len(self.job_ids)
+        for job_id, content_hash, description in jobs:
+            if self.rows.get(job_id, first_row) < first_row:
+                self.alive[self.rows[job_id]] = False
+            row = first_row + len(job_ids)
+            counts = Counter(tokenize(description))
+            for term, count in counts.items():
+                terms.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                rows.append(row)
+                tfs.append(count)
+            job_ids.append(job_id)
+            lengths.append(sum(counts.values()))
+            self.rows[job_id] = row
+            self.hashes[job_id] = content_hash
+        if not job_ids:
+            return 0
+        self.job_ids = np.concatenate([self.job_ids, np.array(job_ids, np.int64)])
+        self.lengths = np.concatenate([self.lengths, np.array(lengths, np.float32)])
+        self.alive = np.concatenate([self.alive, np.ones(len(job_ids), bool)])
+        batch = Postings(np.array(terms, np.int32), np.array(rows, np.int32), np.array(tfs, np.float32))
+        self.delta = Postings.merge(self.delta, batch)
+        if len(self.delta) * 10 >= len(self.main) or self.mostly_dead():
+            self.compact()
+        return len(job_ids)
+
+    def remove(self, job_ids):
+        """Drops jobs from the results; their rows go at the next compaction."""
+        for job_id in job_ids:
+            row = self.rows.pop(job_id, None)
+            self.hashes.pop(job_id, None)
+            if row is not None:
+                self.alive[row] = False
+        if self.mostly_dead():
+            self.compact()
+
+    def mostly_dead(self):
+        return len(self.job_ids) - len(self.rows) > DEAD_ROW_SHARE * len(self.job_ids)
+
+    def compact(self):
+        """Merges the delta segment into the main one and drops replaced and removed rows,
+        renumbering the rest."""
+        keep = self.alive
+        main = Postings.merge(self.main, self.delta, keep=keep)
+        if not keep.all():
+            main.rows = (np.cumsum(keep, dtype=np.int32) - 1)[main.rows]
+            self.job_ids, self.lengths = self.job_ids[keep], self.lengths[keep]
+            self.alive = np.ones(len(self.job_ids), bool)
+            self.rows = {job_id: row for row, job_id in enumerate(self.job_ids.tolist())}
+        self.main = main
+        self.delta = Postings()
+
+    def update(self, conn, chunk_size=5000):
+        """Brings the index in line with the jobs table: new and changed postings are indexed,
+        deleted ones removed. Returns {"added": count, "removed": count}."""
+        current = dict(conn.execute("SELECT id, content_hash FROM jobs"))
+        removed = list(self.hashes.keys() - current.keys())
+        self.remove(removed)
+        # (id, hash) pairs the index doesn't have: new jobs and changed ones
+        changed = sorted(job_id for job_id, _ in current.items() - self.hashes.items())
+        added = 0
+        for start in range(0, len(changed), chunk_size):
+            chunk = changed[start:start + chunk_size]
+            added += self.add(conn.execute(
+                f"SELECT id, content_hash, description FROM jobs WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return {"added": added, "removed": len(removed)}
+
+    def score(self, text):
+        """Returns the BM25 score of every row for a query text (0 for dead or unmatched rows)."""
+        scores = np.zeros(len(self.job_ids), np.float32)
+        query = Counter(self.vocabulary[term] for term in tokenize(text) if term in self.vocabulary)
+        if not query or not self.alive.any():
+            return scores
+        term_ids = np.array(sorted(query), np.int32)
+        query_weights = np.array([query[term_id] for term_id in term_ids], np.float32)
+        # Long queries such as CVs repeat words; saturate their counts like document ones
+        query_weights = query_weights * (self.k1 + 1) / (query_weights + self.k1)
+
+        segments = [segment.gather(term_ids) for segment in (self.main, self.delta) if len(segment)]
+        positions = np.concatenate([segment[0] for segment in segments])
+        rows = np.concatenate([segment[1] for segment in segments])
+        tfs = np.concatenate([segment[2] for segment in segments])
+        live = self.alive[rows]
+        positions, rows, tfs = positions[live], rows[live], tfs[live]
+
+        documents = int(self.alive.sum())
+        average_length = float(self.lengths[self.alive].mean()) or 1.0
+        frequencies = np.bincount(positions, minlength=len(term_ids))
+        idf = np.log1p((documents - frequencies + 0.5) / (frequencies + 0.5)).astype(np.float32)
+        norms = self.k1 * (1 - self.b + self.b * self.lengths[rows] / average_length)
+        weights = (idf * query_weights)[positions] * tfs * (self.k1 + 1) / (tfs + norms)
+        scores += np.bincount(rows, weights=weights, minlength=len(scores)).astype(np.float32)
+        return scores
+
+    def top_k(self, text, k=10, exclude=None):
+        """Returns [(job id, score)] of the k best-matching jobs, best first.
+
+        exclude is an optional set of job ids to leave out of the results.
+        """
+        scores = self.score(text)
+        if exclude:
+            scores[np.isin(self.job_ids, np.fromiter(exclude, np.int64))] = 0
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        best = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(self.job_ids[row]), float(scores[row])) for row in best]
+
+    def save(self, path):
+        """Writes the compacted index to an .npz file, replacing it atomically."""
+        self.compact()
+        terms = np.array(sorted(self.vocabulary, key=self.vocabulary.get), dtype=str)
+        live_ids = np.array(list(self.hashes), np.int64)
+        hashes = np.array([self.hashes[job_id] or "" for job_id in live_ids], dtype=str)
+        # A unique temp file per writer, so processes saving at once don't overwrite each other's
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path),
+                                         suffix=".partial.npz", delete=False) as temp_file:
+            np.savez(temp_file, k1=self.k1, b=self.b, vocabulary=terms, job_ids=self.job_ids,
+                     lengths=self.lengths, alive=self.alive, live_ids=live_ids, hashes=hashes,
+                     terms=self.main.terms, rows=self.main.rows, tfs=self.main.tfs)
+        try:
+            os.replace(temp_file.name, path)
+        except OSError:
+            os.unlink(temp_file.name)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            ranker = cls(float(data["k1"]), float(data["b"]))
+            ranker.vocabulary = {term: term_id for term_id, term in enumerate(data["vocabulary"].tolist())}
+            ranker.job_ids, ranker.lengths, ranker.alive = data["job_ids"], data["lengths"], data["alive"]
+            live_ids = data["live_ids"].tolist()
+            ranker.hashes = dict(zip(live_ids, (value or None for value in data["hashes"].tolist())))
+            row_of = {int(job_id): row for row, job_id in enumerate(ranker.job_ids.tolist()) if ranker.alive[row]}
+            ranker.rows = {job_id: row_of[job_id] for job_id in live_ids}
+            ranker.main = Postings(data["terms"], data["rows"], data["tfs"])
+        return ranker
+
+
+def index_path(db_path):
+    """The ranking index file kept next to a jobs database, e.g. jobs.db -> jobs.rank.npz."""
+    return os.path.splitext(db_path)[0] + ".rank.npz"
+
+def load_ranker(db_path, ranker=None):
+    """Returns a ranker in sync with the jobs table at db_path.
+
+    Starts from `ranker` or the index file saved next to the database, indexes whatever
+    changed since, and saves the file again when anything did.
+    """
+    path = index_path(db_path)
+    if ranker is None:
+        ranker = JobRanker.load(path) if os.path.exists(path) else JobRanker()
+    with sqlite3.connect(db_path) as conn:
+        changes = ranker.update(conn)
+    if changes["added"] or changes["removed"] or not os.path.exists(path):
+        ranker.save(path)
+    return ranker
+
+def rank_jobs(conn, ranker, text, k=10, columns=None, hide_duplicates=True):
+    """Returns the k stored jobs that best match text (e.g. a CV) as a DataFrame, best first,
+    with their BM25 `score`. Reposts of a job already in the results are left out unless
+    hide_duplicates is False."""
+    hits = ranker.top_k(text, k, exclude=duplicate_ids(conn) if hide_duplicates else None)
+    ranked = jobs_by_id(conn, [job_id for job_id, _ in hits], columns)
+    ranked["score"] = ranked.index.map(dict(hits)).astype(float)
+    return ranked.reset_index(drop=True)
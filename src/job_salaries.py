@@ -0,0 +1,237 @@
+import re
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.job_query import DUPLICATE_IDS
+from src.job_schema import create_schema
+from src.job_writer import configure_connection
+
+# 45,000 or 45,000.50, 45.000 or 45.000,50 (European thousands), or 45 or 10.50. Never a
+# prefix of a longer figure, so "£20m" can't be read as "£2"
+NUMBER = r"(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?|\d+(?:\.\d+)?)(?![\d.,]?\d)"
+EUROPEAN_NUMBER = r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?"
+CURRENCY = r"[£$€]|\b(?:GBP|USD|EUR)\b"
+# A salary-like figure of a description: an amount or range with a currency in
+# front or a currency code behind (so years and counts never match), an optional "k" and
+# an optional pay period. Amounts followed by million/bn are sums of money, not pay.
+# Matching is case-sensitive apart from the words, which keeps the scan fast.
+SALARY_PATTERN = re.compile(rf"""
+    (?:(?<=(?P<up_to>[Uu]p\ to\ )))?
+    (?=[£$€GUE\d])
+    (?=(?:{CURRENCY})|{NUMBER}[kK]?(?:\s*(?:-|–|—|to)\s*{NUMBER}[kK]?)?\s*(?:GBP|USD|EUR)\b)
+    (?P<currency>{CURRENCY})?\s?
+    (?P<low>{NUMBER})(?P<low_k>[kK]\b)?
+    (?:\s*(?:-|–|—|to)\s*(?:{CURRENCY})?\s?(?P<high>{NUMBER})(?P<high_k>[kK]\b)?)?
+    (?:\s*(?P<code>GBP|USD|EUR)\b)?
+    (?!\s*(?i:m|mn|bn|million|billion|trillion)\b)
+    [\s,]*(?i:
+        (?P<annum>per\s+annum|per\s+year|a\s+year|p\.?a\b\.?|/\s*(?:year|yr|annum)|annual(?:ly)?)
+        |(?P<month>per\s+month|a\s+month|/\s*(?:month|mth)|pcm|monthly)
+        |(?P<week>per\s+week|a\s+week|/\s*(?:week|wk)|weekly)
+        |(?P<day>per\s+day|a\s+day|/\s*day|p/?d\b|daily|day\s+rate)
+        |(?P<hour>per\s+hour|an\s+hour|/\s*(?:hour|hr)|p/?h\b|hourly)
+    )?
+""", re.VERBOSE)
+# Descriptions without any of these can't contain a salary; testing for them is a plain
+# literal scan, several times faster than SALARY_PATTERN, so most rows skip the full match
+CURRENCY_HINT = re.compile(r"[£$€]|GBP|USD|EUR")
+CURRENCY_CODES = {"£": "GBP", "$": "USD", "€": "EUR", "GBP": "GBP", "USD": "USD", "EUR": "EUR"}
+# Contract rates are paid for about 220 working days of 7.5 hours a year
+ANNUAL_MULTIPLIERS = {"annum": 1, "month": 12, "week": 52, "day": 220, "hour": 220 * 7.5}
+PERIODS = list(ANNUAL_MULTIPLIERS)
+# Annualized figures outside this range are parse errors or not salaries at all
+ANNUAL_RANGE = (5000, 1000000)
+# Currency of salary_min/salary_max as the job sources report them
+DEFAULT_CURRENCY = "GBP"
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# One row per posting with its salary as an annual range; source says whether it was read
+# from the description or from the salary_min/salary_max fields. Rows are kept in step
+# with jobs through content_hash, like job_skills_state.
+JOB_SALARIES_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS job_salaries (
+    job_id INTEGER PRIMARY KEY,
+    content_hash TEXT,
+    currency TEXT,
+    period TEXT,
+    annual_min REAL,
+    annual_max REAL,
+    source TEXT
+);
+CREATE TRIGGER IF NOT EXISTS job_salaries_delete AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_salaries WHERE job_id = old.id;
+END;
+'''
+
+def create_job_salaries_table(conn):
+    """Creates the job_salaries table and the trigger that clears it when a job is deleted."""
+    conn.executescript(JOB_SALARIES_SCHEMA)
+    conn.commit()
+
+def annualize(low, high, period):
+    """Annual (min, max) Series for pay amounts and their periods.
+
+    A missing period is inferred from the size of the amount: under 100 is hourly, under
+    2,000 a day rate and from 10,000 a yearly salary; anything in between is ambiguous and
+    dropped, as are annual figures outside ANNUAL_RANGE.
+    """
+    amount = high.fillna(low)
+    inferred = np.select([amount < 100, amount < 2000, amount >= 10000], ["hour", "day", "annum"], default="")
+    period = period.where(period.fillna("") != "", pd.Series(inferred, index=period.index)).replace("", None)
+    multiplier = period.map(ANNUAL_MULTIPLIERS).astype(float)
+    annual_min, annual_max = low * multiplier, amount * multiplier
+    valid = annual_max.between(*ANNUAL_RANGE)
+    return annual_min.where(valid), annual_max.where(valid), period.where(valid)
+
+def parse_numbers(numbers):
+    """Floats of NUMBER matches, reading dots as thousands separators in "60.000" and "1.250,50"."""
+    european = numbers.str.fullmatch(EUROPEAN_NUMBER, na=False)
+    numbers = numbers.str.replace(",", "", regex=False).where(
+        ~european, numbers.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return pd.to_numeric(numbers, errors="coerce")
+
+def read_salaries(found):
+    """Annual ranges of the SALARY_PATTERN matches in found, one row per match (NaN where a
+    match isn't a salary)."""
+    low = parse_numbers(found["low"])
+    high = parse_numbers(found["high"])
+    high_k = found["high_k"].notna()
+    # "45-60k" puts the k on the upper bound only
+    low = low.where(~(found["low_k"].notna() | (high_k & (low < 1000))), low * 1000)
+    high = high.where(~high_k, high * 1000)
+    explicit = np.select([found[period].notna() for period in PERIODS], PERIODS, default="")
+    annual_min, annual_max, period = annualize(low, high, pd.Series(explicit, index=found.index))
+    currency = found["currency"].map(CURRENCY_CODES).fillna(found["code"])
+    return pd.DataFrame({
+        "currency": currency.where(annual_max.notna()),
+        "period": period,
+        "annual_min": annual_min.where(found["up_to"].isna()),
+        "annual_max": annual_max,
+    }, index=found.index)
+
+def parse_salaries(descriptions):
+    """Parses the first salary mentioned in each description, e.g. "Circa £45,000 - £60,000".
+
+    Returns a DataFrame on the same index with currency, period and the annual_min and
+    annual_max of the range (NaN where no salary was found). "Up to £X" only sets annual_max.
+    """
+    descriptions = pd.Series(descriptions, dtype=object).fillna("").astype(str)
+    candidates = descriptions.str.contains(CURRENCY_HINT)
+    found = descriptions[candidates].str.extract(SALARY_PATTERN)
+    parsed = read_salaries(found)
+    # A first figure that isn't pay, such as a funding round, falls back to the later ones;
+    # only these few descriptions are scanned for every match
+    rejected = parsed.index[found["low"].notna() & parsed["annual_max"].isna()]
+    if len(rejected):
+        later = read_salaries(descriptions[rejected].str.extractall(SALARY_PATTERN)).dropna(subset=["annual_max"])
+        later = later[~later.index.droplevel("match").duplicated()].droplevel("match")
+        parsed.loc[later.index] = later
+    return parsed.reindex(descriptions.index)
+
+def normalize_salaries(jobs, currency=DEFAULT_CURRENCY):
+    """Annual salary ranges for a DataFrame of jobs with description, salary_min and salary_max.
+
+    The figures in the description win, since the salary fields are often missing or an
+    estimate with min and max equal; otherwise the fields are used, read in `currency`.
+    Adds a source column ("description", "fields" or None).
+    """
+    parsed = parse_salaries(jobs["description"])
+    field_min = pd.to_numeric(jobs["salary_min"], errors="coerce")
+    field_max = pd.to_numeric(jobs["salary_max"], errors="coerce").fillna(field_min)
+    no_period = pd.Series(None, index=jobs.index, dtype=object)
+    fields_min, fields_max, fields_period = annualize(field_min, field_max, no_period)
+    use_fields = parsed["annual_max"].isna() & fields_max.notna()
+    salaries = parsed.copy()
+    salaries.loc[use_fields, "currency"] = currency
+    salaries.loc[use_fields, "period"] = fields_period[use_fields]
+    salaries.loc[use_fields, "annual_min"] = fields_min[use_fields]
+    salaries.loc[use_fields, "annual_max"] = fields_max[use_fields]
+    salaries["source"] = np.select([parsed["annual_max"].notna(), use_fields], ["description", "fields"], default=None)
+    return salaries
+
+def index_salaries(conn, rebuild=False, chunk_size=50000, currency=DEFAULT_CURRENCY):
+    """Normalizes the salary of every new or changed posting into job_salaries.
+
+    Postings are read and parsed chunk_size at a time, with no per-row Python code.
+    Returns the number of postings written.
+    """
+    conn = conn if isinstance(conn, sqlite3.Connection) else configure_connection(sqlite3.connect(conn, timeout=30))
+    create_schema(conn)
+    create_job_salaries_table(conn)
+    condition = "" if rebuild else " AND (state.job_id IS NULL OR state.content_hash IS NOT jobs.content_hash)"
+    last_id = written = 0
+    while True:
+        jobs = pd.read_sql_query(f'''
+        SELECT jobs.id, jobs.content_hash, jobs.description, jobs.salary_min, jobs.salary_max
+        FROM jobs LEFT JOIN job_salaries AS state ON state.job_id = jobs.id
+        WHERE jobs.id > ?{condition}
+        ORDER BY jobs.id LIMIT ?
+        ''', conn, params=[last_id, chunk_size])
+        if jobs.empty:
+            return written
+        salaries = normalize_salaries(jobs, currency)
+        rows = pd.concat([jobs[["id", "content_hash"]], salaries], axis=1)
+        rows = rows.astype(object).where(rows.notna(), None)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO job_salaries (job_id, content_hash, currency, period, annual_min, annual_max, "
+                "source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows[["id", "content_hash", "currency", "period", "annual_min", "annual_max", "source"]].itertuples(
+                    index=False, name=None)
+            )
+        written += len(jobs)
+        last_id = int(jobs["id"].iloc[-1])
+
+def load_salaries(conn, currency=DEFAULT_CURRENCY, hide_duplicates=True):
+    """Returns every posting with a salary in `currency` as a DataFrame for the analytics below.
+
+    Besides title, company, location and the annual range, each row has the range's
+    `midpoint` (or its one known end) and the Monday of the `week` it was posted in.
+    Reposts are left out unless hide_duplicates is False.
+    """
+    duplicates = f" AND jobs_view.id NOT IN ({DUPLICATE_IDS})" if hide_duplicates else ""
+    salaries = pd.read_sql_query(f'''
+    SELECT jobs_view.id, jobs_view.title, jobs_view.company, jobs_view.location, jobs_view.created,
+           jobs_view.scraped_at, job_salaries.annual_min, job_salaries.annual_max, job_salaries.period,
+           job_salaries.source
+    FROM job_salaries JOIN jobs_view ON jobs_view.id = job_salaries.job_id
+    WHERE job_salaries.currency = ?{duplicates}
+    ''', conn, params=[currency])
+    salaries["midpoint"] = salaries[["annual_min", "annual_max"]].mean(axis=1)
+    posted = pd.to_datetime(salaries["created"], format="%Y-%m-%dT%H:%M:%SZ", errors="coerce")
+    posted = posted.fillna(pd.to_datetime(salaries["scraped_at"], format="%Y-%m-%dT%H:%M:%SZ", errors="coerce"))
+    salaries["week"] = (posted - pd.to_timedelta(posted.dt.weekday, unit="D")).dt.normalize()
+    return salaries
+
+def salary_percentiles(salaries, by, percentiles=PERCENTILES, min_postings=1):
+    """Percentiles of the annual salary midpoint for each title, company, location or week.
+
+    `salaries` comes from load_salaries. Returns a DataFrame indexed by `by` with a
+    postings count and one p10, p25... column per percentile, highest median first.
+    """
+    grouped = salaries.groupby(by)["midpoint"]
+    table = grouped.quantile(list(percentiles)).unstack()
+    table.columns = [f"p{round(percentile * 100)}" for percentile in percentiles]
+    table.insert(0, "postings", grouped.size())
+    table = table[table["postings"] >= min_postings]
+    return table.sort_index() if by == "week" else table.sort_values("p50", ascending=False)
+
+def salary_report(salaries, dimensions=("title", "company", "location", "week"), **kwargs):
+    """salary_percentiles for several dimensions at once, as {dimension: DataFrame}."""
+    return {by: salary_percentiles(salaries, by, **kwargs) for by in dimensions}
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Normalize the salaries of every stored posting into job_salaries.")
+    parser.add_argument("db", nargs="?", default="jobs.db")
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse postings that are already up to date")
+    parser.add_argument("--by", default="title", choices=["title", "company", "location", "week"])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = index_salaries(args.db, args.rebuild)
+    print(f"✅ Normalized {written} salaries in {time.perf_counter() - start:.1f}s.")
+    with sqlite3.connect(args.db) as conn:
+        print(salary_percentiles(load_salaries(conn), args.by).head(20).to_string(float_format="{:,.0f}".format))
@@ -0,0 +1,335 @@
+import ast
+import hashlib
+import re
+from datetime import datetime, timezone
+
+# Adzuna ids also appear in stored apply links (".../jobs/land/ad/<id>" or ".../jobs/details/<id>")
+ADZUNA_ID_PATTERN = re.compile(r"/jobs/(?:land/ad|details)/(\d+)")
+# Logical job columns, as scraped and as read back through jobs_view
+JOB_COLUMNS = [
+    "job_title", "title", "company", "location", "created", "description",
+    "salary_min", "salary_max", "contract_type", "contract_time", "apply_link"
+]
+# Physical jobs columns, position for position with JOB_COLUMNS
+STORAGE_COLUMNS = [
+    "job_title", "title", "company_id", "location_id", "created", "description",
+    "salary_min", "salary_max", "contract_type", "contract_time", "apply_link"
+]
+# Levels of Adzuna's location `area` hierarchy, e.g. ['UK', 'London', 'Central London', 'Broadgate']
+LOCATION_LEVELS = ["country", "region", "district", "area"]
+# Small-integer codes for the low-cardinality contract fields; 0 means unknown
+CONTRACT_TYPES = {"Unknown": 0, "permanent": 1, "contract": 2}
+CONTRACT_TIMES = {"Unknown": 0, "full_time": 1, "part_time": 2}
+
+# Every filter in src.job_query is served by one of these indexes, and each index ends in
+# `created` so the default newest-first order needs no separate sort step.
+JOB_INDEXES = {
+    "idx_jobs_created": "jobs (created)",
+    "idx_jobs_title": "jobs (title COLLATE NOCASE, created)",
+    "idx_jobs_company": "jobs (company_id, created)",
+    "idx_jobs_location": "jobs (location_id, created)",
+    "idx_jobs_contract": "jobs (contract_type, contract_time, created)",
+    "idx_jobs_salary": "jobs (salary_max, salary_min)",
+    "idx_jobs_scraped_at": "jobs (scraped_at)",
+    "idx_companies_name": "companies (name COLLATE NOCASE)",
+    "idx_locations_display_name": "locations (display_name COLLATE NOCASE)",
+    "idx_locations_region": "locations (region, district)",
+}
+
+# job_clusters and job_lsh hold the near-duplicate index of src.job_dedup: each posting's
+# MinHash signature and cluster, whose id is that of its first posting, and the LSH buckets
+# the signature falls in (pruned of deleted postings by src.job_dedup.cluster_pending).
+# Deleting a cluster's first posting hands the id to the next one.
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY,
+    display_name TEXT NOT NULL UNIQUE,
+    country TEXT,
+    region TEXT,
+    district TEXT,
+    area TEXT
+);
+CREATE TABLE IF NOT EXISTS contract_types (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS contract_times (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT,
+    title TEXT,
+    company_id INTEGER NOT NULL REFERENCES companies (id),
+    location_id INTEGER NOT NULL REFERENCES locations (id),
+    created TEXT,
+    description TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    contract_type INTEGER NOT NULL DEFAULT 0 REFERENCES contract_types (id),
+    contract_time INTEGER NOT NULL DEFAULT 0 REFERENCES contract_times (id),
+    apply_link TEXT,
+    job_key TEXT,
+    content_hash TEXT,
+    scraped_at TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_job_key ON jobs (job_key);
+CREATE TABLE IF NOT EXISTS job_clusters (
+    job_id INTEGER PRIMARY KEY,
+    cluster_id INTEGER NOT NULL,
+    content_hash TEXT,
+    signature BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_job_clusters_cluster ON job_clusters (cluster_id);
+CREATE TABLE IF NOT EXISTS job_lsh (
+    bucket INTEGER NOT NULL,
+    job_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, job_id)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS job_clusters_delete AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_clusters WHERE job_id = old.id;
+    UPDATE job_clusters SET cluster_id = (SELECT MIN(job_id) FROM job_clusters WHERE cluster_id = old.id)
+    WHERE cluster_id = old.id;
+END;
+'''
+
+JOBS_VIEW = '''
+CREATE VIEW IF NOT EXISTS jobs_view AS
+SELECT jobs.id, jobs.job_title, jobs.title, companies.name AS company,
+       locations.display_name AS location, jobs.created, jobs.description,
+       jobs.salary_min, jobs.salary_max, contract_types.name AS contract_type,
+       contract_times.name AS contract_time, jobs.apply_link,
+       locations.country, locations.region, locations.district, locations.area,
+       jobs.job_key, jobs.content_hash, jobs.scraped_at,
+       COALESCE(job_clusters.cluster_id, jobs.id) AS cluster_id
+FROM jobs
+JOIN companies ON companies.id = jobs.company_id
+JOIN locations ON locations.id = jobs.location_id
+JOIN contract_types ON contract_types.id = jobs.contract_type
+JOIN contract_times ON contract_times.id = jobs.contract_time
+LEFT JOIN job_clusters ON job_clusters.job_id = jobs.id;
+'''
+
+def normalize_text(value):
+    """Lowercases and collapses whitespace so cosmetic differences don't change a hash."""
+    return " ".join(str(value).lower().split()) if value is not None else ""
+
+def make_job_key(job, source_id=None, source="adzuna"):
+    """Returns the natural key of a job: its id at the source, or a hash of its identifying fields."""
+    if not source_id and source == "adzuna":
+        match = ADZUNA_ID_PATTERN.search(job.get("apply_link") or "")
+        source_id = match.group(1) if match else None
+    if source_id:
+        return f"{source}:{source_id}"
+    fields = [normalize_text(job.get(name)) for name in ("apply_link", "title", "company", "description")]
+    return "sha1:" + hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+def make_content_hash(job):
+    """Hashes every stored column so changed postings can be told apart from unchanged ones."""
+    return hash_row([job.get(name) for name in JOB_COLUMNS])
+
+def hash_row(values):
+    """Content hash of a row's values in JOB_COLUMNS order."""
+    return hashlib.sha1("\x00".join(map(str, values)).encode("utf-8")).hexdigest()
+
+def utc_timestamp():
+    """The current time in the ISO 8601 form Adzuna uses for `created`, e.g. 2025-03-01T09:30:00Z."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def parse_location(value, area=None):
+    """Splits a location into its display name and LOCATION_LEVELS values.
+
+    Accepts the display name with Adzuna's `area` list alongside, or the stringified
+    location dict found in exported CSVs ("{'area': [...], 'display_name': ...}").
+    """
+    if isinstance(value, str) and value.startswith("{"):
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+    if isinstance(value, dict):
+        area = area or value.get("area")
+        value = value.get("display_name")
+    levels = list(area or [])[:len(LOCATION_LEVELS)]
+    levels += [None] * (len(LOCATION_LEVELS) - len(levels))
+    return (value or "Unknown"), levels
+
+def create_schema(conn):
+    """Creates the normalized jobs schema, converting an older single-table layout first."""
+    migrate_legacy_jobs(conn)
+    create_tables(conn)
+    ensure_indexes(conn)
+    ensure_fts(conn)
+    conn.commit()
+
+def create_tables(conn):
+    """Creates the tables and jobs_view, and seeds the contract enum tables."""
+    conn.executescript(SCHEMA)
+    migrate_scraped_at(conn)
+    view_columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs_view)")}
+    if view_columns and "cluster_id" not in view_columns:
+        # Views created before near-duplicate clustering lack cluster_id
+        conn.execute("DROP VIEW jobs_view")
+    conn.executescript(JOBS_VIEW)
+    conn.executemany("INSERT OR IGNORE INTO contract_types (id, name) VALUES (?, ?)",
+                     [(code, name) for name, code in CONTRACT_TYPES.items()])
+    conn.executemany("INSERT OR IGNORE INTO contract_times (id, name) VALUES (?, ?)",
+                     [(code, name) for name, code in CONTRACT_TIMES.items()])
+    conn.commit()
+
+def ensure_indexes(conn):
+    """Creates the secondary indexes used by src.job_query."""
+    for name, definition in JOB_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+    conn.commit()
+
+def ensure_fts(conn):
+    """Creates the jobs_fts full-text index and the triggers that keep it in sync with jobs.
+
+    jobs_fts is an external-content FTS5 table over jobs_view, so the text is stored once
+    and the index only holds the tokens. A newly created index is filled from existing rows.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_fts'").fetchone()
+    conn.executescript('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, company, description,
+        content='jobs_view', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts (rowid, title, company, description)
+        VALUES (new.id, new.title, (SELECT name FROM companies WHERE id = new.company_id), new.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, (SELECT name FROM companies WHERE id = old.company_id), old.description);
+    END;
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, company_id, description ON jobs BEGIN
+        INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, (SELECT name FROM companies WHERE id = old.company_id), old.description);
+        INSERT INTO jobs_fts (rowid, title, company, description)
+        VALUES (new.id, new.title, (SELECT name FROM companies WHERE id = new.company_id), new.description);
+    END;
+    ''')
+    if not exists:
+        conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+    conn.commit()
+
+def migrate_scraped_at(conn):
+    """Adds the scraped_at column to a jobs table created before it was recorded.
+
+    Existing rows are backfilled with their `created` timestamp, the closest known
+    approximation, and jobs_view is dropped so it is recreated with the new column.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "scraped_at" in columns:
+        return
+    conn.execute("ALTER TABLE jobs ADD COLUMN scraped_at TEXT")
+    conn.execute(
+        "UPDATE jobs SET scraped_at = CASE WHEN created GLOB '[0-9][0-9][0-9][0-9]-*' THEN created ELSE ? END",
+        (utc_timestamp(),)
+    )
+    conn.execute("DROP VIEW IF EXISTS jobs_view")
+    conn.commit()
+
+def migrate_legacy_keys(conn):
+    """Adds natural keys to a single-table jobs layout created before ingestion was deduplicated.
+
+    Existing rows are keyed and duplicates are removed, keeping the most recently stored copy.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "job_key" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN job_key TEXT")
+    if "content_hash" not in columns:
+        conn.execute("ALTER TABLE jobs ADD COLUMN content_hash TEXT")
+
+    rows = conn.execute(
+        f"SELECT id, {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_key IS NULL ORDER BY id"
+    ).fetchall()
+    if not rows:
+        return
+
+    latest = {}
+    for row in rows:
+        job = dict(zip(JOB_COLUMNS, row[1:]))
+        latest[make_job_key(job)] = (row[0], make_content_hash(job))
+    keep = {row_id for row_id, _ in latest.values()}
+    duplicates = [(row[0],) for row in rows if row[0] not in keep]
+
+    conn.executemany("DELETE FROM jobs WHERE id = ?", duplicates)
+    conn.executemany(
+        "UPDATE jobs SET job_key = ?, content_hash = ? WHERE id = ?",
+        [(key, content_hash, row_id) for key, (row_id, content_hash) in latest.items()]
+    )
+    print(f"🧹 Keyed {len(latest)} existing jobs and removed {len(duplicates)} duplicates.")
+
+def migrate_legacy_jobs(conn):
+    """Converts a jobs table with free-text company/location/contract columns to the normalized layout.
+
+    Returns True if a conversion took place. The database is vacuumed afterwards so the
+    space freed by the repeated strings is returned to the file system.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+    if "company" not in columns:
+        return False
+
+    migrate_legacy_keys(conn)
+    # The old full-text index, triggers and indexes belong to the table being replaced
+    for kind, name in conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE tbl_name IN ('jobs', 'jobs_fts') "
+        "AND type IN ('index', 'trigger') AND name NOT LIKE 'sqlite_autoindex%'"
+    ).fetchall():
+        conn.execute(f"DROP {kind.upper()} IF EXISTS {name}")
+    conn.execute("DROP TABLE IF EXISTS jobs_fts")
+    conn.execute("DROP VIEW IF EXISTS jobs_view")
+    conn.execute("ALTER TABLE jobs RENAME TO jobs_legacy")
+    create_tables(conn)
+
+    conn.execute("INSERT OR IGNORE INTO companies (name) SELECT DISTINCT COALESCE(company, 'Unknown') FROM jobs_legacy")
+    # Locations may be stringified dicts, which only Python can unpack
+    conn.execute("CREATE TEMP TABLE location_map (raw TEXT PRIMARY KEY, display_name TEXT)")
+    for (raw,) in conn.execute("SELECT DISTINCT COALESCE(location, 'Unknown') FROM jobs_legacy").fetchall():
+        display_name, levels = parse_location(raw)
+        conn.execute(
+            f"INSERT OR IGNORE INTO locations (display_name, {', '.join(LOCATION_LEVELS)}) VALUES (?, ?, ?, ?, ?)",
+            [display_name] + levels
+        )
+        conn.execute("INSERT INTO location_map (raw, display_name) VALUES (?, ?)", (raw, display_name))
+
+    conn.execute(f'''
+    INSERT INTO jobs (id, {', '.join(STORAGE_COLUMNS)}, job_key, content_hash, scraped_at)
+    SELECT legacy.id, legacy.job_title, legacy.title, companies.id, locations.id, legacy.created,
+           legacy.description, legacy.salary_min, legacy.salary_max,
+           COALESCE(contract_types.id, 0), COALESCE(contract_times.id, 0), legacy.apply_link,
+           legacy.job_key, legacy.content_hash,
+           CASE WHEN legacy.created GLOB '[0-9][0-9][0-9][0-9]-*' THEN legacy.created ELSE ? END
+    FROM jobs_legacy AS legacy
+    JOIN companies ON companies.name = COALESCE(legacy.company, 'Unknown')
+    JOIN location_map ON location_map.raw = COALESCE(legacy.location, 'Unknown')
+    JOIN locations ON locations.display_name = location_map.display_name
+    LEFT JOIN contract_types ON contract_types.name = legacy.contract_type
+    LEFT JOIN contract_times ON contract_times.name = legacy.contract_time
+    ''', (utc_timestamp(),))
+    migrated = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    conn.execute("DROP TABLE jobs_legacy")
+    conn.execute("DROP TABLE location_map")
+    conn.commit()
+    conn.execute("VACUUM")
+    print(f"🗜️ Converted {migrated} jobs to the normalized schema.")
+    return True
+
+if __name__ == "__main__":
+    import sqlite3
+    import sys
+
+    # Convert existing databases in place, e.g. python -m src.job_schema jobs.db database/jobs.db
+    for path in sys.argv[1:] or ["jobs.db"]:
+        conn = sqlite3.connect(path)
+        create_schema(conn)
+        conn.close()
+        print(f"✅ {path} uses the normalized schema.")
@@ -1,132 +1,406 @@
-import pandas as pd
 import sqlite3
 import time
+import asyncio
 import requests
-from datetime import datetime
-import os
-from dotenv import load_dotenv
+from collections import Counter
+from datetime import datetime, timezone
+from src.config import load_config
+from src.http_cache import ResponseCache, get_session
+from src.rate_limiter import retry_delay
+from src.job_schema import create_schema
+from src.job_dedup import NearDuplicateIndex
+from src.job_sources import ADZUNA_SEARCH_URL, SourceStats, configured_sources
+from src.job_vectors import get_vector_index
+from src.job_writer import JobWriter
+from src.job_query import count_jobs, query_jobs
+from src.job_search import search_jobs
+from src.job_export import export_arrow, export_csv
 
-# Load the .env file
-load_dotenv(dotenv_path=r"C:\Users\dell\OneDrive\Desktop\new_AI_job\AI-Agent-Job-Assistant\env\app.env")
+def is_timestamp(created):
+    """Tells real ISO timestamps apart from placeholders such as "Unknown"."""
+    return isinstance(created, str) and created[:4].isdigit()
+
+def latest_created(jobs, newest=None):
+    """Returns the newest real `created` timestamp among the jobs and `newest`."""
+    timestamps = [job["created"] for job in jobs if is_timestamp(job["created"])]
+    if newest:
+        timestamps.append(newest)
+    return max(timestamps, default=None)
 
-# Debugging: Check if the environment variables are loaded correctly
-print(f"APP_ID: {os.getenv('APP_ID')}")
-print(f"API_KEY: {os.getenv('API_KEY')}")
 class JobScraper:
-    def __init__(self, job_titles, location="London", db_name="jobs.db"):
-        # Fetch sensitive data securely from environment variables
-        self.app_id = os.getenv('APP_ID')  # Fetch app_id from the .env file
-        self.api_key = os.getenv('API_KEY')  # Fetch api_key from the .env file
-
-        # Ensure app_id and api_key are not None
-        if not self.app_id or not self.api_key:
-            raise ValueError("API credentials (app_id and api_key) must be set in the .env file.")
-        
+    def __init__(self, job_titles, location="London", db_name="jobs.db", base_url=ADZUNA_SEARCH_URL,
+                 results_per_page=None, max_pages=20, batch_size=200,
+                 cache_path="http_cache.db", cache_ttl=3600, incremental=False, rate_limiter=None,
+                 sources=None, deduplicate=True, embed=True):
+        # Job boards to crawl (see src.job_sources). By default Adzuna, configured by base_url,
+        # results_per_page and rate_limiter, plus every other source with credentials in the environment.
+        self.sources = sources or configured_sources(
+            base_url=base_url, results_per_page=results_per_page, rate_limiter=rate_limiter
+        )
         self.job_titles = job_titles
         self.location = location
-        self.url = "https://api.adzuna.com/v1/api/jobs/gb/search/1"
+        self.max_pages = max_pages  # Hard cap on pages walked per job title and source
+        self.batch_size = batch_size  # Records committed to SQLite per transaction
+        self.incremental = incremental  # Only fetch postings newer than the last run's newest
         self.db_name = db_name
-        self.conn = sqlite3.connect(self.db_name)
+        # Scheduler workers write concurrently, so wait for locks instead of failing at once
+        self.conn = sqlite3.connect(self.db_name, timeout=30)
+        # New postings are clustered with their near duplicates (reposts) as they are stored,
+        # and embedded into the semantic search index shared by every scraper of this database
+        self.writer = JobWriter(self.conn, batch_size=batch_size,
+                                dedup_index=NearDuplicateIndex() if deduplicate else None,
+                                vector_index=get_vector_index(db_name) if embed else None)
         self.create_table()
+        # Repeated searches within cache_ttl seconds are answered locally; a ttl of 0 disables caching
+        self.session = get_session()
+        self.cache = ResponseCache(cache_path, ttl=cache_ttl) if cache_ttl else None
+        # Latency and throughput of each source during the latest run
+        self.source_stats = {}
+        # (job_title, newest created, source name) of the crawls that saw every new posting,
+        # waiting for their jobs to be saved before the high-water mark moves
+        self.pending_marks = []
     
     def create_table(self):
-        """Creates the jobs table in SQLite if it doesn't exist."""
-        query = '''
-        CREATE TABLE IF NOT EXISTS jobs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+        """Creates the jobs tables in SQLite if they don't exist (see src.job_schema)."""
+        create_schema(self.conn)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(scrape_state)")}
+        if columns and "source" not in columns:
+            self.conn.execute("ALTER TABLE scrape_state RENAME TO scrape_state_legacy")
+        # Newest `created` timestamp ingested for each (source, job_title, location) query
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_state (
+            source TEXT,
             job_title TEXT,
-            title TEXT,
-            company TEXT,
             location TEXT,
-            created TEXT,
-            description TEXT,
-            salary_min REAL,
-            salary_max REAL,
-            contract_type TEXT,
-            contract_time TEXT,
-            apply_link TEXT
+            last_created TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (source, job_title, location)
         )
-        '''
-        self.conn.execute(query)
+        ''')
+        if columns and "source" not in columns:
+            # High-water marks recorded before sources were pluggable all came from Adzuna
+            self.conn.execute(
+                "INSERT INTO scrape_state SELECT 'adzuna', job_title, location, last_created, updated_at "
+                "FROM scrape_state_legacy"
+            )
+            self.conn.execute("DROP TABLE scrape_state_legacy")
         self.conn.commit()
-    
-    def scrape_jobs(self):
-        """Fetches job listings from Adzuna API and stores them in the database."""
-        all_jobs = []
+
+    def get_high_water_mark(self, job_title, source="adzuna"):
+        """Returns the newest `created` timestamp stored for this query, or None."""
+        row = self.conn.execute(
+            "SELECT last_created FROM scrape_state WHERE source = ? AND job_title = ? AND location = ?",
+            (source, job_title, self.location)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_high_water_mark(self, job_title, created, source="adzuna"):
+        """Records the newest `created` timestamp ingested for this query, never moving it back."""
+        with self.conn:
+            self.conn.execute('''
+            INSERT INTO scrape_state (source, job_title, location, last_created, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (source, job_title, location) DO UPDATE SET
+                last_created = MAX(last_created, excluded.last_created),
+                updated_at = excluded.updated_at
+            ''', (source, job_title, self.location, created, datetime.now(timezone.utc).isoformat()))
+
+    def start_crawl(self, source, job_title):
+        """Returns the timestamp this crawl only wants postings newer than (None for a full crawl)."""
+        self.source_stats.setdefault(source.name, SourceStats(source.name))
+        return self.get_high_water_mark(job_title, source.name) if self.incremental else None
+
+    def filter_new_jobs(self, source, jobs, since):
+        """Drops postings at or before `since`.
+
+        Returns the remaining jobs and whether already-seen postings were reached; results are
+        sorted by date in incremental mode, so later pages hold nothing new after that point.
+        Sources that can't sort by date are left to the upsert, which skips unchanged jobs.
+        """
+        if not since or not source.sorts_by_date:
+            return jobs, False
+        new_jobs = [job for job in jobs if not is_timestamp(job["created"]) or job["created"] > since]
+        return new_jobs, len(new_jobs) < len(jobs)
+
+    def finish_crawl(self, source, job_title, newest, fetched, complete):
+        """Reports the outcome of a job title's crawl and queues its high-water mark for commit_marks.
+
+        Only complete crawls move the mark: one that lost a page to a failed request or stopped
+        at max_pages leaves it where it was, so the next run fetches the postings it missed.
+        """
+        if newest and complete:
+            self.pending_marks.append((job_title, newest, source.name))
+        elif not complete:
+            print(f"⚠️ The crawl of '{job_title}' on {source.name} stopped early; it will be fetched again next run.")
+        self.source_stats[source.name].record_jobs(fetched)
+        if fetched:
+            print(f"✅ Data for '{job_title}' added from {source.name} ({fetched} jobs).")
+        elif self.incremental:
+            print(f"💤 No new jobs for '{job_title}' on {source.name} since the last run.")
+        else:
+            print(f"❌ No job data returned for '{job_title}' by {source.name}.")
+
+    def scrape_jobs(self, use_async=False, concurrency=5, timeout=10):
+        """Fetches job listings from every source and stores them in the database.
+
+        Records are committed in batches as pages arrive, so memory use does not grow with
+        the number of results. With use_async=True all sources and job titles are crawled
+        concurrently (see scrape_jobs_async). Returns the inserted/updated/skipped counts of
+        the run, plus `failed` for jobs that could not be saved; per-source latency and
+        throughput are kept in source_stats.
+
+        High-water marks move once the run's jobs are saved. Batches mix the jobs of several
+        crawls, so in the sync path any failed save keeps every mark of the run where it was;
+        async crawls save their own pages and only hold back their own mark.
+        """
+        self.source_stats = {source.name: SourceStats(source.name) for source in self.sources}
+        self.pending_marks = []
+        if use_async:
+            stats = asyncio.run(self.scrape_jobs_async(concurrency=concurrency, timeout=timeout))
+        else:
+            stats = Counter(inserted=0, updated=0, skipped=0)
+            for batch in self.iter_job_batches():
+                stats.update(self.save_to_db(batch))
+            if stats["failed"]:
+                self.pending_marks = []
+        self.commit_marks()
+        
+        if stats["failed"]:
+            print(f"❌ {stats['failed']} jobs could not be saved; they will be fetched again next run.")
+        if sum(stats.values()):
+            print(f"✅ Saved to database: {stats['inserted']} inserted, "
+                  f"{stats['updated']} updated, {stats['skipped']} unchanged.")
+        else:
+            print("❌ No job data to save.")
+        for source_stats in self.source_stats.values():
+            print(f"⏱️ {source_stats}")
+        return dict(stats)
+
+    def commit_marks(self):
+        """Advances the high-water marks queued by finish_crawl."""
+        for job_title, newest, source_name in self.pending_marks:
+            self.set_high_water_mark(job_title, newest, source_name)
+        self.pending_marks = []
+
+    def iter_job_batches(self, batch_size=None):
+        """Yields job records for every source and job title in lists of at most batch_size."""
+        batch_size = batch_size or self.batch_size
+        batch = []
+        for source in self.sources:
+            for job_title in self.job_titles:
+                for jobs in self.iter_jobs(source, job_title):
+                    batch.extend(jobs)
+                    while len(batch) >= batch_size:
+                        yield batch[:batch_size]
+                        batch = batch[batch_size:]
+        if batch:
+            yield batch
+
+    def iter_jobs(self, source, job_title):
+        """Walks the result pages of one source for one job title, yielding the records of each page.
+
+        Stops once the reported result count is exhausted, a page comes back empty,
+        max_pages is reached, a page can't be fetched or, in incremental mode, already-seen
+        postings are reached. Only the first two and the last count as a complete crawl.
+        """
+        since = self.start_crawl(source, job_title)
+        fetched = seen = 0
+        newest = None
+        complete = False
+        for page in range(1, self.max_pages + 1):
+            data = self.fetch_page(source, job_title, page, since=since)
+            if data is None:
+                break
+            jobs = source.parse_jobs(data)
+            if not jobs:
+                complete = True
+                break
+            seen += len(jobs)
+            newest = latest_created(jobs, newest)
+            jobs, reached_seen = self.filter_new_jobs(source, jobs, since)
+            if jobs:
+                fetched += len(jobs)
+                yield jobs
+            if reached_seen or seen >= source.total_results(data):
+                complete = True
+                break
         
-        for job_title in self.job_titles:
-            params = {
-                "app_id": self.app_id,
-                "app_key": self.api_key,
-                "what": job_title,
-                "where": self.location,
-                "results_per_page": 10
-            }
+        self.finish_crawl(source, job_title, newest, fetched, complete)
+
+    def fetch_page(self, source, job_title, page=1, retries=3, since=None):
+        """Fetches one results page for a job title, retrying with exponential backoff.
+
+        Returns the decoded response, or None if every attempt failed.
+        """
+        params = source.build_params(job_title, self.location, page, since)
+        url = source.page_url(page)
+        stats = self.source_stats.setdefault(source.name, SourceStats(source.name))
+        cache_key = ResponseCache.make_key(url, params)
+        if self.cache:
+            data = self.cache.get(cache_key)
+            if data is not None:
+                stats.cache_hits += 1
+                return data
+        
+        for attempt in range(retries):
+            try:
+                source.rate_limiter.acquire()
+                start = time.perf_counter()
+                response = self.session.get(url, params=params, auth=source.auth)
+                stats.record_request(time.perf_counter() - start, response.status_code == 200)
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    if self.cache:
+                        self.cache.set(cache_key, data)
+                    return data
+                
+                print(f"⚠️ Error fetching data for '{job_title}' from {source.name}: {response.status_code}")
+                print(f"Response: {response.text}")  # Debugging line
+                delay = retry_delay(attempt, response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    # acquire() waits this out, as does every other scraper sharing the key
+                    source.rate_limiter.block_for(delay)
+                elif attempt < retries - 1:
+                    time.sleep(delay)
+                if attempt == retries - 1:
+                    print("❌ Failed after multiple attempts.")
             
-            retries = 3
-            for attempt in range(retries):
-                try:
-                    response = requests.get(self.url, params=params)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        jobs = data.get("results", [])
-                        
-                        if jobs:
-                            for job in jobs:
-                                # Ensure job title and company are not missing
-                                job_title = job.get("title", "Unknown")
-                                company = job.get("company", {}).get("display_name", "Unknown")
-                                
-                                if job_title == "Unknown" or company == "Unknown":
-                                    print(f"⚠️ Missing details for a job: {job}")
-                                
-                                all_jobs.append({
-                                    "job_title": job_title,
-                                    "title": job_title,
-                                    "company": company,
-                                    "location": job.get("location", {}).get("display_name", "Unknown"),
-                                    "created": job.get("created", "Unknown"),
-                                    "description": job.get("description", "Unknown"),
-                                    "salary_min": job.get("salary_min", None),
-                                    "salary_max": job.get("salary_max", None),
-                                    "contract_type": job.get("contract_type", "Unknown"),
-                                    "contract_time": job.get("contract_time", "Unknown"),
-                                    "apply_link": job.get("redirect_url", "Unknown")
-                                })
-                            print(f"✅ Data for '{job_title}' added.")
-                        else:
-                            print(f"❌ No job data returned for '{job_title}'.")
-                        break  # Exit retry loop if successful
-                    else:
-                        print(f"⚠️ Error fetching data for '{job_title}': {response.status_code}")
-                        print(f"Response: {response.text}")  # Debugging line
-                        if attempt < retries - 1:
-                            time.sleep(2 ** attempt)  # Exponential backoff
+            except requests.exceptions.RequestException as e:
+                stats.failures += 1
+                print(f"🚨 Request failed for '{job_title}' from {source.name}: {e}")
+                time.sleep(retry_delay(attempt))
+        return None
+
+    async def scrape_jobs_async(self, concurrency=5, timeout=10, retries=3):
+        """Crawls every source and job title concurrently and saves each page as it arrives.
+
+        Each source has its own limit of `concurrency` requests in flight (and its own rate
+        limit), so a slow source only delays its own crawls. Requests are bounded by
+        `timeout` seconds. Returns the inserted/updated/skipped counts of the run.
+        """
+        import aiohttp  # Only the async path needs it, so plain imports of this module stay light
+
+        semaphores = {source.name: asyncio.Semaphore(concurrency) for source in self.sources}
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        connector = aiohttp.TCPConnector(limit=concurrency * len(self.sources), limit_per_host=concurrency,
+                                         keepalive_timeout=30)
+        async with aiohttp.ClientSession(timeout=client_timeout, connector=connector) as session:
+            results = await asyncio.gather(*[
+                self.crawl_jobs_async(session, semaphores[source.name], source, job_title, retries)
+                for source in self.sources
+                for job_title in self.job_titles
+            ])
+        stats = Counter(inserted=0, updated=0, skipped=0)
+        for result in results:
+            stats.update(result)
+        return stats
+
+    async def crawl_jobs_async(self, session, semaphore, source, job_title, retries=3):
+        """Async version of iter_jobs that saves every page and returns the save counts."""
+        since = self.start_crawl(source, job_title)
+        stats = Counter()
+        fetched = seen = 0
+        newest = None
+        complete = False
+        for page in range(1, self.max_pages + 1):
+            data = await self.fetch_page_async(session, semaphore, source, job_title, page, retries, since=since)
+            if data is None:
+                break
+            jobs = source.parse_jobs(data)
+            if not jobs:
+                complete = True
+                break
+            seen += len(jobs)
+            newest = latest_created(jobs, newest)
+            jobs, reached_seen = self.filter_new_jobs(source, jobs, since)
+            if jobs:
+                stats.update(self.save_to_db(jobs))
+                fetched += len(jobs)
+            if reached_seen or seen >= source.total_results(data):
+                complete = True
+                break
+        
+        self.finish_crawl(source, job_title, newest, fetched, complete and not stats["failed"])
+        return stats
+
+    async def fetch_page_async(self, session, semaphore, source, job_title, page=1, retries=3, since=None):
+        """Async version of fetch_page; backoff sleeps without blocking the other crawls."""
+        import aiohttp
+
+        params = source.build_params(job_title, self.location, page, since)
+        url = source.page_url(page)
+        auth = aiohttp.BasicAuth(*source.auth) if source.auth else None
+        stats = self.source_stats.setdefault(source.name, SourceStats(source.name))
+        cache_key = ResponseCache.make_key(url, params)
+        if self.cache:
+            data = self.cache.get(cache_key)
+            if data is not None:
+                stats.cache_hits += 1
+                return data
+        
+        for attempt in range(retries):
+            try:
+                async with semaphore:
+                    await source.rate_limiter.acquire_async()
+                    start = time.perf_counter()
+                    async with session.get(url, params=params, auth=auth) as response:
+                        status = response.status
+                        retry_after = response.headers.get("Retry-After")
+                        if status == 200:
+                            data = await response.json(content_type=None)
                         else:
-                            print("❌ Failed after multiple attempts.")
+                            text = await response.text()
+                    stats.record_request(time.perf_counter() - start, status == 200)
                 
-                except requests.exceptions.RequestException as e:
-                    print(f"🚨 Request failed for '{job_title}': {e}")
-                    time.sleep(2 ** attempt)
-        
-        if all_jobs:
-            self.save_to_db(all_jobs)
-            print("✅ Data saved to database.")
-        else:
-            print("❌ No job data to save.")
+                if status == 200:
+                    if self.cache:
+                        self.cache.set(cache_key, data)
+                    return data
+                
+                print(f"⚠️ Error fetching data for '{job_title}' from {source.name}: {status}")
+                print(f"Response: {text}")  # Debugging line
+                delay = retry_delay(attempt, retry_after)
+                if status == 429:
+                    # acquire_async() waits this out, as does every other scraper sharing the key
+                    source.rate_limiter.block_for(delay)
+                elif attempt < retries - 1:
+                    await asyncio.sleep(delay)
+                if attempt == retries - 1:
+                    print("❌ Failed after multiple attempts.")
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                stats.failures += 1
+                print(f"🚨 Request failed for '{job_title}' from {source.name}: {e}")
+                await asyncio.sleep(retry_delay(attempt))
+        return None
 
     def save_to_db(self, jobs):
-        """Saves job data to SQLite database."""
+        """Upserts job data into the SQLite database.
+
+        New jobs are inserted, jobs whose content changed are updated in place and identical
+        jobs are skipped. Returns the inserted/updated/skipped counts; if the write fails, the
+        error is printed and the jobs are counted as `failed`.
+        """
         try:
-            df = pd.DataFrame(jobs)
-            df.to_sql("jobs", self.conn, if_exists="append", index=False)
+            return self.writer.write(jobs)
         except Exception as e:
             print(f"❌ Error saving to database: {e}")
+            return {"inserted": 0, "updated": 0, "skipped": 0, "failed": len(jobs)}
     
-    def get_saved_jobs(self):
-        """Retrieves saved jobs from the database."""
-        return pd.read_sql("SELECT * FROM jobs", self.conn)
+    def get_saved_jobs(self, columns=None, limit=None, offset=0, **filters):
+        """Retrieves saved jobs from the database, newest first.
+
+        Projection, filters and pagination run inside SQLite (see src.job_query.query_jobs).
+        """
+        return query_jobs(self.conn, columns=columns, limit=limit, offset=offset, **filters)
+
+    def search_saved_jobs(self, query, limit=20, **filters):
+        """Full-text searches the saved jobs, best matches first (see src.job_search.search_jobs)."""
+        return search_jobs(self.conn, query, limit=limit, **filters)
+
+    def count_saved_jobs(self, **filters):
+        """Counts the saved jobs matching the filters."""
+        return count_jobs(self.conn, **filters)
     
     def check_db(self):
         """Check if the database is populated."""
@@ -135,19 +409,22 @@ class JobScraper:
         print(f"📊 Number of jobs in the database: {result[0]}")
 
 if __name__ == "__main__":
+    load_config()
     job_titles = ["Data Scientist", "Software Engineer", "Machine Learning Engineer", "AI Researcher", "DevOps Engineer"]
     location = "London"
 
-    scraper = JobScraper(job_titles=job_titles, location=location)
-    scraper.scrape_jobs()  # Corrected the method call
+    scraper = JobScraper(job_titles=job_titles, location=location, incremental=True)
+    scraper.scrape_jobs(use_async=True)  # Crawls every configured source in parallel
     
-    # Retrieve and save jobs
-    saved_jobs = scraper.get_saved_jobs()
+    # Preview the newest jobs
+    saved_jobs = scraper.get_saved_jobs(limit=20)
     print(saved_jobs)
 
-    # Export to CSV
-    saved_jobs.to_csv("./Data/saved_jobs.csv", index=False)
-    print("✅ Data exported to saved_jobs.csv")
+    # Export in chunks instead of loading the whole table into memory
+    exported = export_csv(scraper.conn, "./Data/saved_jobs.csv")
+    print(f"✅ {exported} jobs exported to saved_jobs.csv")
+    partitions = export_arrow(scraper.conn, "./Data/jobs")
+    print(f"✅ Parquet files written for {len(partitions)} scrape dates in ./Data/jobs")
 
     # Check database
     scraper.check_db()
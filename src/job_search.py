@@ -0,0 +1,49 @@
+import re
+import pandas as pd
+from src.job_query import QUERYABLE_COLUMNS, build_where, check_columns
+
+# Relative weight of a match in each indexed column when ranking with bm25
+FTS_WEIGHTS = {"title": 10.0, "company": 3.0, "description": 1.0}
+FTS_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def build_match(query, prefix=True):
+    """Turns free text into an FTS5 query that matches every word.
+
+    Words are quoted so input like "C++" or "full-time" can't break the query syntax, and
+    the last word matches as a prefix so results update while the user is still typing.
+    """
+    words = FTS_TOKEN_PATTERN.findall(query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+def search_jobs(conn, query, columns=None, limit=20, offset=0, highlight=("<mark>", "</mark>"), **filters):
+    """Ranks saved jobs against a keyword query with bm25 and returns a DataFrame.
+
+    Adds a `rank` column (lower is better) and a `snippet` of the description with the
+    matched words wrapped in `highlight`. Keyword arguments of build_where narrow the results.
+    """
+    columns = columns or QUERYABLE_COLUMNS
+    check_columns(columns)
+    match = build_match(query)
+    if match is None:
+        return pd.DataFrame(columns=list(columns) + ["rank", "snippet"])
+
+    weights = ", ".join(str(weight) for weight in FTS_WEIGHTS.values())
+    where, params = build_where(**filters)
+    filtered = f" WHERE hits.rowid IN (SELECT id FROM jobs{where})" if where else ""
+    sql = f'''
+    SELECT {', '.join('jobs_view.' + name for name in columns)}, hits.rank, hits.snippet
+    FROM (
+        SELECT rowid, bm25(jobs_fts, {weights}) AS rank,
+               snippet(jobs_fts, 2, ?, ?, '…', 24) AS snippet
+        FROM jobs_fts WHERE jobs_fts MATCH ?
+    ) AS hits
+    JOIN jobs_view ON jobs_view.id = hits.rowid{filtered}
+    ORDER BY hits.rank
+    LIMIT ? OFFSET ?
+    '''
+    return pd.read_sql_query(sql, conn, params=[highlight[0], highlight[1], match] + params + [limit, offset])
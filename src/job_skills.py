@@ -0,0 +1,171 @@
+import os
+import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from src.job_schema import create_schema
+from src.job_writer import configure_connection
+from src.skill_extractor import TAXONOMY_PATH, get_extractor
+
+# One row per (job, skill), with the number of mentions and the offsets of the first one.
+# job_skills_state records which version of each posting and of the taxonomy was indexed,
+# so re-runs only touch new, changed or out-of-date postings.
+JOB_SKILLS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id INTEGER NOT NULL,
+    skill TEXT NOT NULL,
+    category TEXT,
+    mentions INTEGER NOT NULL,
+    first_start INTEGER,
+    first_end INTEGER,
+    PRIMARY KEY (job_id, skill)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_job_skills_skill ON job_skills (skill);
+CREATE TABLE IF NOT EXISTS job_skills_state (
+    job_id INTEGER PRIMARY KEY,
+    content_hash TEXT,
+    taxonomy_version TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS job_skills_delete AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_skills WHERE job_id = old.id;
+    DELETE FROM job_skills_state WHERE job_id = old.id;
+END;
+'''
+
+def create_job_skills_tables(conn):
+    """Creates the job_skills tables and the trigger that clears them when a job is deleted."""
+    conn.executescript(JOB_SKILLS_SCHEMA)
+    conn.commit()
+
+def find_skills_in_batch(descriptions, taxonomy_path=TAXONOMY_PATH):
+    """Worker entry point: the skill matches of each description in a batch."""
+    extractor = get_extractor(taxonomy_path)
+    return [extractor.find(description or "") for description in descriptions]
+
+def extract_skills_batch(descriptions, n_process=1, batch_size=1000, as_tuples=False, taxonomy_path=TAXONOMY_PATH):
+    """Yields the SkillMatch list of every description, in input order.
+
+    Works like spaCy's nlp.pipe: descriptions are consumed lazily in batches of batch_size
+    and, with n_process > 1 (-1 for one per CPU), matched in a pool of worker processes.
+    At most two batches per worker are in flight, so memory stays flat however long the
+    input is. With as_tuples=True the input is (description, context) pairs and
+    (matches, context) pairs are yielded, to carry ids alongside the text.
+    """
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    items = iter(descriptions)
+    batches = iter(lambda: list(islice(items, batch_size)), [])
+
+    def split(batch):
+        return ([text for text, _ in batch], [context for _, context in batch]) if as_tuples else (batch, None)
+
+    def results(batch, matches):
+        return zip(matches, split(batch)[1]) if as_tuples else matches
+
+    if n_process <= 1:
+        for batch in batches:
+            yield from results(batch, find_skills_in_batch(split(batch)[0], taxonomy_path))
+        return
+
+    with ProcessPoolExecutor(max_workers=n_process) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append((batch, pool.submit(find_skills_in_batch, split(batch)[0], taxonomy_path)))
+            if len(pending) >= 2 * n_process:
+                batch, future = pending.popleft()
+                yield from results(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from results(batch, future.result())
+
+def iter_pending_jobs(conn, taxonomy_version, rebuild=False, page_size=1000):
+    """Yields (description, (job id, content hash)) for every posting whose skills are missing or stale.
+
+    Pages through jobs by id, so the caller can write to the database between pages.
+    """
+    condition = "" if rebuild else '''
+        AND (state.job_id IS NULL OR state.taxonomy_version != ?
+             OR state.content_hash IS NOT jobs.content_hash)'''
+    last_id = 0
+    while True:
+        params = [last_id] + ([] if rebuild else [taxonomy_version]) + [page_size]
+        rows = conn.execute(f'''
+        SELECT jobs.id, jobs.content_hash, jobs.description
+        FROM jobs LEFT JOIN job_skills_state AS state ON state.job_id = jobs.id
+        WHERE jobs.id > ? {condition}
+        ORDER BY jobs.id LIMIT ?
+        ''', params).fetchall()
+        if not rows:
+            return
+        for job_id, content_hash, description in rows:
+            yield description, (job_id, content_hash)
+        last_id = rows[-1][0]
+
+def write_job_skills(conn, results, taxonomy_version, commit_every=1000):
+    """Replaces the job_skills rows of each ((matches), (job id, content hash)) result.
+
+    Commits every commit_every postings. Returns {"jobs": postings written, "skills": rows written}.
+    """
+    stats = {"jobs": 0, "skills": 0}
+    results = iter(results)
+    while True:
+        batch = list(islice(results, commit_every))
+        if not batch:
+            return stats
+        rows = []
+        for matches, (job_id, _) in batch:
+            skills = {}
+            for match in matches:
+                if match.skill in skills:
+                    skills[match.skill][3] += 1
+                else:
+                    skills[match.skill] = [job_id, match.skill, match.category, 1, match.start, match.end]
+            rows.extend(skills.values())
+        with conn:
+            conn.executemany("DELETE FROM job_skills WHERE job_id = ?", [(job_id,) for _, (job_id, _) in batch])
+            conn.executemany(
+                "INSERT INTO job_skills (job_id, skill, category, mentions, first_start, first_end) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO job_skills_state (job_id, content_hash, taxonomy_version) VALUES (?, ?, ?)",
+                [(job_id, content_hash, taxonomy_version) for _, (job_id, content_hash) in batch]
+            )
+        stats["jobs"] += len(batch)
+        stats["skills"] += len(rows)
+
+def index_job_skills(conn, n_process=1, batch_size=1000, rebuild=False, taxonomy_path=TAXONOMY_PATH):
+    """Extracts the skills of every new or changed posting in the jobs table into job_skills.
+
+    Postings already indexed with the current taxonomy are skipped unless rebuild is set.
+    Returns {"jobs": postings indexed, "skills": job_skills rows written}.
+    """
+    conn = conn if isinstance(conn, sqlite3.Connection) else configure_connection(sqlite3.connect(conn, timeout=30))
+    create_schema(conn)
+    create_job_skills_tables(conn)
+    version = get_extractor(taxonomy_path).version
+    pending = iter_pending_jobs(conn, version, rebuild, page_size=batch_size)
+    results = extract_skills_batch(pending, n_process, batch_size, as_tuples=True, taxonomy_path=taxonomy_path)
+    return write_job_skills(conn, results, version, commit_every=batch_size)
+
+def top_skills(conn, limit=20):
+    """Returns [(skill, category, postings)] for the skills named in the most postings."""
+    return conn.execute(
+        "SELECT skill, category, COUNT(*) AS postings FROM job_skills "
+        "GROUP BY skill ORDER BY postings DESC, skill LIMIT ?", (limit,)
+    ).fetchall()
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Extract the skills of every stored posting into job_skills.")
+    parser.add_argument("db", nargs="?", default="jobs.db")
+    parser.add_argument("--processes", type=int, default=-1, help="Worker processes; -1 for one per CPU")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--rebuild", action="store_true", help="Re-index postings that are already up to date")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = index_job_skills(args.db, args.processes, args.batch_size, args.rebuild)
+    print(f"✅ Indexed {stats['jobs']} postings ({stats['skills']} skills) in {time.perf_counter() - start:.1f}s.")
@@ -0,0 +1,249 @@
+import statistics
+import time
+from datetime import datetime, timezone
+from src.config import get_setting
+from src.job_schema import make_job_key
+from src.rate_limiter import ADZUNA_REQUESTS_PER_MINUTE, RateLimiter
+
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/gb/search"
+REED_SEARCH_URL = "https://www.reed.co.uk/api/1.0/search"
+
+
+class JobSource:
+    """A job board API that JobScraper can crawl.
+
+    Subclasses say how to request one results page (page_url, build_params, auth), how to
+    turn a response into job records with the keys of src.job_schema.JOB_COLUMNS
+    (parse_jobs, total_results) and how fast the API may be called (rate, per, burst).
+    Every source gets its own rate-limit bucket, so a slow or throttled source never holds
+    up the others. Pass base_url to point a source at a local fixture server
+    (see src.source_fixtures).
+    """
+
+    name = None
+    search_url = None
+    max_results_per_page = 50
+    # Rate-limit policy: `rate` requests every `per` seconds, shared by all processes
+    rate = 60
+    per = 60.0
+    burst = 1
+    # Whether build_params(since=...) returns results newest first, so a crawl can stop at
+    # the first already-seen posting. Otherwise duplicates are left to the upsert to skip.
+    sorts_by_date = False
+
+    def __init__(self, base_url=None, results_per_page=None, rate_limiter=None):
+        self.base_url = (base_url or self.search_url).rstrip("/")
+        self.results_per_page = min(results_per_page or self.max_results_per_page, self.max_results_per_page)
+        self.rate_limiter = rate_limiter or RateLimiter(name=self.name, rate=self.rate, per=self.per, burst=self.burst)
+
+    def page_url(self, page):
+        """Returns the URL of a 1-based results page."""
+        return self.base_url
+
+    def build_params(self, job_title, location, page, since=None):
+        """Returns the query parameters for one page of a search."""
+        raise NotImplementedError
+
+    @property
+    def auth(self):
+        """(username, password) for HTTP basic auth, or None."""
+        return None
+
+    def parse_jobs(self, data):
+        """Converts a decoded response into job records."""
+        raise NotImplementedError
+
+    def total_results(self, data):
+        """Returns the number of results the search has in total, across all pages."""
+        raise NotImplementedError
+
+
+class AdzunaSource(JobSource):
+    """The Adzuna search API (https://developer.adzuna.com), credentials from APP_ID and API_KEY."""
+
+    name = "adzuna"
+    search_url = ADZUNA_SEARCH_URL
+    max_results_per_page = 50  # Largest page size Adzuna accepts
+    rate = ADZUNA_REQUESTS_PER_MINUTE
+    sorts_by_date = True
+
+    def __init__(self, base_url=None, results_per_page=None, rate_limiter=None, app_id=None, app_key=None):
+        # Fetch sensitive data securely from environment variables
+        self.app_id = app_id or get_setting('APP_ID')
+        self.api_key = app_key or get_setting('API_KEY')
+
+        # Ensure app_id and api_key are not None
+        if not self.app_id or not self.api_key:
+            raise ValueError("API credentials (app_id and api_key) must be set in the .env file.")
+        super().__init__(base_url, results_per_page, rate_limiter)
+
+    def page_url(self, page):
+        return f"{self.base_url}/{page}"
+
+    def build_params(self, job_title, location, page, since=None):
+        """Builds the Adzuna query parameters for a single job title.
+
+        When `since` is given, results are restricted to recent postings and sorted newest first.
+        """
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.api_key,
+            "what": job_title,
+            "where": location,
+            "results_per_page": self.results_per_page
+        }
+        if since:
+            since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
+            if since_dt.tzinfo is None:
+                since_dt = since_dt.replace(tzinfo=timezone.utc)
+            params["max_days_old"] = max((datetime.now(timezone.utc) - since_dt).days + 1, 1)
+            params["sort_by"] = "date"
+        return params
+
+    def parse_jobs(self, data):
+        """Converts an Adzuna search response into job records."""
+        parsed = []
+        for job in data.get("results", []):
+            # Ensure job title and company are not missing
+            job_title = job.get("title", "Unknown")
+            company = job.get("company", {}).get("display_name", "Unknown")
+
+            if job_title == "Unknown" or company == "Unknown":
+                print(f"⚠️ Missing details for a job: {job}")
+
+            parsed.append({
+                "job_title": job_title,
+                "title": job_title,
+                "company": company,
+                "location": job.get("location", {}).get("display_name", "Unknown"),
+                "created": job.get("created", "Unknown"),
+                "description": job.get("description", "Unknown"),
+                "salary_min": job.get("salary_min", None),
+                "salary_max": job.get("salary_max", None),
+                "contract_type": job.get("contract_type", "Unknown"),
+                "contract_time": job.get("contract_time", "Unknown"),
+                "apply_link": job.get("redirect_url", "Unknown"),
+                "location_area": job.get("location", {}).get("area")
+            })
+            parsed[-1]["job_key"] = make_job_key(parsed[-1], job.get("id"), self.name)
+        return parsed
+
+    def total_results(self, data):
+        return data.get("count", 0)
+
+
+class ReedSource(JobSource):
+    """The Reed.co.uk jobseeker API (https://www.reed.co.uk/developers), key from REED_API_KEY."""
+
+    name = "reed"
+    search_url = REED_SEARCH_URL
+    max_results_per_page = 100
+
+    def __init__(self, base_url=None, results_per_page=None, rate_limiter=None, api_key=None):
+        self.api_key = api_key or get_setting('REED_API_KEY')
+        if not self.api_key:
+            raise ValueError("The Reed API key (REED_API_KEY) must be set in the .env file.")
+        super().__init__(base_url, results_per_page, rate_limiter)
+
+    @property
+    def auth(self):
+        # Reed takes the key as the basic-auth user name with an empty password
+        return (self.api_key, "")
+
+    def build_params(self, job_title, location, page, since=None):
+        return {
+            "keywords": job_title,
+            "locationName": location,
+            "resultsToTake": self.results_per_page,
+            "resultsToSkip": (page - 1) * self.results_per_page,
+        }
+
+    def parse_jobs(self, data):
+        """Converts a Reed search response into job records."""
+        parsed = []
+        for job in data.get("results", []):
+            job_title = job.get("jobTitle") or "Unknown"
+            parsed.append({
+                "job_title": job_title,
+                "title": job_title,
+                "company": job.get("employerName") or "Unknown",
+                "location": job.get("locationName") or "Unknown",
+                "created": parse_reed_date(job.get("date")),
+                "description": job.get("jobDescription") or "Unknown",
+                "salary_min": job.get("minimumSalary"),
+                "salary_max": job.get("maximumSalary"),
+                "contract_type": "Unknown",
+                "contract_time": "Unknown",
+                "apply_link": job.get("jobUrl") or "Unknown",
+                "location_area": None
+            })
+            parsed[-1]["job_key"] = make_job_key(parsed[-1], job.get("jobId"), self.name)
+        return parsed
+
+    def total_results(self, data):
+        return data.get("totalResults", 0)
+
+
+def parse_reed_date(value):
+    """Converts Reed's dd/mm/yyyy dates to the ISO timestamps used for `created`."""
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").strftime("%Y-%m-%dT00:00:00Z")
+    except (TypeError, ValueError):
+        return "Unknown"
+
+
+# Every source JobScraper knows about, by name
+SOURCES = {source.name: source for source in (AdzunaSource, ReedSource)}
+
+def configured_sources(**adzuna_options):
+    """Returns Adzuna plus every other source whose credentials are present in the environment."""
+    sources = [AdzunaSource(**adzuna_options)]
+    if get_setting('REED_API_KEY'):
+        sources.append(ReedSource())
+    return sources
+
+
+class SourceStats:
+    """Request latency and job throughput of one source over a scrape run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []  # Seconds per request that reached the network
+        self.failures = 0
+        self.cache_hits = 0
+        self.jobs = 0
+        self.started = self.finished = time.perf_counter()
+
+    def record_request(self, latency, ok=True):
+        self.latencies.append(latency)
+        if not ok:
+            self.failures += 1
+
+    def record_jobs(self, count):
+        self.jobs += count
+        self.finished = time.perf_counter()
+
+    def summary(self):
+        """Returns the run's figures for this source as a dict."""
+        elapsed = self.finished - self.started
+        latencies = sorted(self.latencies)
+        return {
+            "source": self.name,
+            "requests": len(latencies),
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+            "jobs": self.jobs,
+            "latency_p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+            "latency_p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000 if latencies else None,
+            "seconds": elapsed,
+            "jobs_per_second": self.jobs / elapsed if elapsed > 0 else None,
+        }
+
+    def __str__(self):
+        summary = self.summary()
+        latency = (f"p50 {summary['latency_p50_ms']:.0f} ms, p95 {summary['latency_p95_ms']:.0f} ms"
+                   if summary["requests"] else "no requests")
+        throughput = f"{summary['jobs_per_second']:.1f} jobs/s" if summary["jobs_per_second"] else "0 jobs/s"
+        return (f"{self.name}: {summary['jobs']} jobs in {summary['seconds']:.1f}s ({throughput}), "
+                f"{summary['requests']} requests ({latency}), {summary['cache_hits']} cached, "
+                f"{summary['failures']} failed")
@@ -0,0 +1,476 @@
+import os
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+import numpy as np
+from src.job_query import duplicate_ids, jobs_by_id
+from src.text_tokens import tokenize
+from src.job_schema import create_schema
+from src.skill_extractor import get_extractor
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Dimensions of a posting vector; each is stored as float16, 512 bytes per posting
+VECTOR_DIM = 256
+# Vectors are brute-force scanned until there are this many, then clustered for IVF search
+TRAIN_ROWS = 50000
+# The clusters are trained again once the index has grown this many times over
+RETRAIN_GROWTH = 4
+# Vectors a query scores by default, spread over the IVF lists nearest to it: about 40 ms
+PROBE_ROWS = 40000
+# Rows scored per step of an exhaustive scan, so float16 blocks convert within the cache
+SCAN_BLOCK = 65536
+# Fixed, so k-means samples the same rows in every run
+SEED = 20250301
+# Rows appended after the IVF lists were last sorted, before they are sorted again
+INDEX_TAIL_ROWS = 20000
+# One record of the .rows file per vector
+ROW_DTYPE = np.dtype([("job_id", "<i8"), ("hash", "<u8"), ("list", "<i4"), ("alive", "?")], align=True)
+
+
+class HashingEmbedder:
+    """Embeds text as a dense vector with signed feature hashing, so no model or network is needed.
+
+    Features are the ranking tokens of a text, four-letter pieces of its longer words (so
+    "engineer" and "engineering" overlap) and the canonical names and categories of the
+    taxonomy skills it mentions, which map synonyms such as "ML" and "Machine Learning" onto
+    the same dimensions. Each feature adds ±(1 + log count) to one of dim dimensions, chosen
+    by a CRC32 of the feature, and vectors are L2-normalized so a dot product is the cosine.
+    """
+
+    def __init__(self, dim=VECTOR_DIM, extractor=None):
+        if dim & (dim - 1):
+            raise ValueError("The vector dimension must be a power of two")
+        self.dim = dim
+        self.extractor = extractor or get_extractor()
+
+    @property
+    def version(self):
+        """Changes whenever vectors of the same text would differ, e.g. after a taxonomy edit."""
+        return f"hashing-{self.dim}-{self.extractor.version}"
+
+    def features(self, text):
+        """Returns {feature: weight} for a text."""
+        tokens = Counter(tokenize(text))
+        features = {token: 1 + np.log(count) for token, count in tokens.items()}
+        for token in tokens:
+            for start in range(len(token) - 3 if len(token) > 5 else 0):
+                features["#" + token[start:start + 4]] = features.get("#" + token[start:start + 4], 0) + 0.25
+        for match in self.extractor.find(text):
+            features["skill:" + match.skill] = 2.0
+            features["category:" + match.category] = 1.0
+        return features
+
+    def embed(self, text):
+        """Returns the unit vector of a text as float32 (all zeros for text without features)."""
+        features = self.features(text)
+        if not features:
+            return np.zeros(self.dim, np.float32)
+        hashes = np.fromiter((zlib.crc32(feature.encode("utf-8")) for feature in features), np.int64, len(features))
+        # The low bits pick the dimension and an independent high bit the sign
+        weights = np.fromiter(features.values(), np.float64, len(features)) * (1 - 2 * ((hashes >> 24) & 1))
+        vector = np.bincount(hashes & (self.dim - 1), weights=weights, minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts):
+        """Returns a (len(texts), dim) float32 matrix of unit vectors."""
+        vectors = np.zeros((len(texts), self.dim), np.float32)
+        for row, text in enumerate(texts):
+            vectors[row] = self.embed(text)
+        return vectors
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """Holds a lock on path (created if missing) across processes: exclusive, or shared with
+    other shared holders where the platform supports it."""
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def content_key(content_hash):
+    """A posting's content hash as the 64-bit integer kept in the index (0 if it has none)."""
+    return int(content_hash[:16], 16) if content_hash else 0
+
+def spherical_kmeans(sample, clusters, iterations=10, rng=None):
+    """Returns (clusters, dim) unit centroids of unit vectors, by cosine k-means."""
+    rng = rng or np.random.default_rng(SEED)
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        used, starts = np.unique(assignment[order], return_index=True)
+        sums = np.add.reduceat(sample[order], starts, axis=0)
+        # Clusters that lost every member restart from a random sample vector
+        centroids = sample[rng.choice(len(sample), clusters, replace=False)].copy()
+        centroids[used] = sums
+        centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+class VectorIndex:
+    """Semantic search over stored postings: an append-only float16 matrix memory-mapped from disk.
+
+    Vectors are appended to a raw .f16 file next to the database and each row's job id,
+    content hash, IVF cluster and alive flag to a .rows file of fixed-size records; both are
+    mapped with np.memmap, so opening an index reads only the small metadata file (.npz with
+    the centroids and the IVF lists) and the operating system pages vectors in as queries
+    touch them. Changed or deleted postings only flip their old row's alive flag in place.
+
+    Below TRAIN_ROWS rows a query scans every vector block by block. From then on the index
+    is an inverted file (IVF): spherical k-means splits the vectors into about sqrt(n)
+    clusters, every vector is filed under its nearest centroid as it is added, and a query
+    scores only the vectors of its nprobe nearest clusters, a few percent of the index. The
+    rows of each cluster are sorted into the metadata file only every INDEX_TAIL_ROWS
+    appends; rows added since are found by their cluster id.
+
+    Any number of writers, in threads or processes (several schedulers, the scraper and the
+    CLI), can append to one index: each write holds an exclusive lock on the .lock file and
+    first catches up with the rows other writers committed. Readers, such as the dashboard,
+    call refresh() to pick up the rows committed since they opened it.
+    """
+
+    def __init__(self, path, embedder=None):
+        self.path = path  # The vector file, e.g. jobs.vectors.f16, next to jobs.vectors.rows and .npz
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self.lock = threading.Lock()
+        self.writable = False
+        self.records = np.zeros(0, ROW_DTYPE)  # Row -> (job_id, hash, list, alive), mapped from the .rows file
+        self.centroids = None
+        self.trained_rows = 0  # Size of the index when the centroids were trained
+        self.order = np.zeros(0, np.int32)  # Rows sorted by cluster ...
+        self.offsets = np.zeros(1, np.int64)  # ... and where each cluster's rows start
+        self.indexed_rows = 0  # Rows covered by order; later ones are found by their list
+        self.rows = {}  # jobs.id -> live row
+        self.vectors = None
+        self.loaded_at = None  # mtime of the metadata file last loaded
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    @property
+    def job_ids(self):
+        return self.records["job_id"]
+
+    @property
+    def hashes(self):
+        return self.records["hash"]
+
+    @property
+    def lists(self):
+        return self.records["list"]
+
+    @property
+    def alive(self):
+        return self.records["alive"]
+
+    @property
+    def version(self):
+        """Stamped in the metadata; an index of another embedder or file layout is started over."""
+        return f"{self.embedder.version}-rows"
+
+    @property
+    def meta_path(self):
+        return os.path.splitext(self.path)[0] + ".npz"
+
+    @property
+    def rows_path(self):
+        return os.path.splitext(self.path)[0] + ".rows"
+
+    @property
+    def lock_path(self):
+        return os.path.splitext(self.path)[0] + ".lock"
+
+    @classmethod
+    def open(cls, path, embedder=None, writable=False):
+        """Opens the index stored at path, or an empty one. Vectors of a different embedder
+        version are discarded by the first write."""
+        index = cls(path, embedder)
+        index.writable = writable
+        index.refresh()
+        return index
+
+    def refresh(self):
+        """Picks up the rows and metadata other processes saved since. Returns True when there were any."""
+        if not os.path.exists(self.meta_path):
+            return False
+        with file_lock(self.lock_path, shared=True):
+            return self.sync()
+
+    def sync(self):
+        """Catches up with the files; the caller holds the file lock. Returns True when anything changed."""
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        changed = mtime != self.loaded_at
+        if changed:
+            with np.load(self.meta_path) as data:
+                if str(data["version"]) != self.version:
+                    return False
+                self.centroids = data["centroids"] if len(data["centroids"]) else None
+                self.trained_rows, self.indexed_rows = int(data["trained_rows"]), int(data["indexed_rows"])
+                self.order, self.offsets = data["order"], data["offsets"]
+            # The metadata is only replaced on training, re-sorting or a new embedder: read every row again
+            self.records, self.rows = np.zeros(0, ROW_DTYPE), {}
+            self.loaded_at = mtime
+        first_row = len(self.records)
+        count = os.path.getsize(self.rows_path) // ROW_DTYPE.itemsize if os.path.exists(self.rows_path) else 0
+        if count != first_row:
+            self.map_rows(count)
+            added = np.arange(first_row, count)[self.alive[first_row:count]]
+            self.rows.update(zip(self.job_ids[added].tolist(), added.tolist()))
+            changed = True
+        if len(self.rows) != len(self):
+            # Another process removed jobs, which only flips their alive flags
+            live = np.flatnonzero(self.alive)
+            self.rows = dict(zip(self.job_ids[live].tolist(), live.tolist()))
+        return changed
+
+    def map_rows(self, count):
+        """Maps the first count rows of the .rows and .f16 files."""
+        mode = "r+" if self.writable else "r"
+        self.records = (np.memmap(self.rows_path, ROW_DTYPE, mode=mode, shape=(count,))
+                        if count else np.zeros(0, ROW_DTYPE))
+        self.vectors = np.memmap(self.path, np.float16, mode="r", shape=(count, self.dim)) if count else None
+
+    @contextmanager
+    def writing(self):
+        """Holds the locks of a write, with the index caught up with the other writers.
+
+        Rows a crashed writer appended past the last committed record are cut off, and an
+        index of another embedder version is started over.
+        """
+        with self.lock, file_lock(self.lock_path):
+            self.writable = True
+            self.sync()
+            if self.loaded_at is None or not (os.path.exists(self.path) and os.path.exists(self.rows_path)):
+                self.reset()
+            for path, size in ((self.path, len(self.records) * self.dim * 2),
+                               (self.rows_path, len(self.records) * ROW_DTYPE.itemsize)):
+                if os.path.getsize(path) != size:
+                    os.truncate(path, size)
+            yield
+
+    def reset(self):
+        """Replaces the files with an empty index. Readers keep the files they mapped until they refresh."""
+        for path in (self.path, self.rows_path):
+            with open(path + ".partial", "wb"):
+                pass
+            os.replace(path + ".partial", path)
+        self.records, self.rows, self.vectors = np.zeros(0, ROW_DTYPE), {}, None
+        self.centroids, self.trained_rows = None, 0
+        self.order, self.offsets, self.indexed_rows = np.zeros(0, np.int32), np.zeros(1, np.int64), 0
+        self.save()
+
+    def save(self):
+        """Writes the metadata next to the vector file, replacing it atomically."""
+        temp_path = os.path.splitext(self.path)[0] + ".partial.npz"
+        centroids = self.centroids if self.centroids is not None else np.zeros((0, self.dim), np.float32)
+        np.savez(temp_path, version=self.version, centroids=centroids, trained_rows=self.trained_rows,
+                 order=self.order, offsets=self.offsets, indexed_rows=self.indexed_rows)
+        os.replace(temp_path, self.meta_path)
+        self.loaded_at = os.stat(self.meta_path).st_mtime_ns
+
+    def add(self, jobs):
+        """Embeds and appends (job id, content hash, text) rows, replacing older versions of the
+        same jobs. Returns the number of rows added."""
+        jobs = list(jobs)
+        if not jobs:
+            return 0
+        return self.append([job_id for job_id, _, _ in jobs], [content_hash for _, content_hash, _ in jobs],
+                           self.embedder.embed_many([text for _, _, text in jobs]))
+
+    def append(self, job_ids, content_hashes, vectors):
+        """Appends already embedded rows and files them under their IVF clusters."""
+        with self.writing():
+            first_row = len(self.records)
+            records = np.zeros(len(job_ids), ROW_DTYPE)
+            records["job_id"] = job_ids
+            records["hash"] = [content_key(value) for value in content_hashes]
+            records["list"] = self.nearest_lists(vectors) if self.centroids is not None else -1
+            # A job repeated within the batch keeps only its last row
+            latest = {job_id: row for row, job_id in enumerate(job_ids, first_row)}
+            records["alive"][[row - first_row for row in latest.values()]] = True
+            with open(self.path, "ab") as f:
+                f.write(vectors.astype(np.float16).tobytes())
+            # Older versions die before the new rows are committed, so a crash in between
+            # leaves the job missing (update() adds it again) rather than listed twice
+            self.alive[[self.rows[job_id] for job_id in latest if job_id in self.rows]] = False
+            with open(self.rows_path, "ab") as f:
+                f.write(records.tobytes())
+            self.map_rows(first_row + len(job_ids))
+            self.rows.update(latest)
+            if len(self.records) >= max(TRAIN_ROWS, self.trained_rows * RETRAIN_GROWTH):
+                self.train()
+            if self.centroids is not None and (self.indexed_rows < self.trained_rows
+                                               or len(self.records) - self.indexed_rows >= INDEX_TAIL_ROWS):
+                self.index_lists()
+        return len(job_ids)
+
+    def remove(self, job_ids):
+        """Drops jobs from the results; their vectors stay in the file, marked dead."""
+        with self.writing():
+            self.alive[[row for row in (self.rows.pop(job_id, None) for job_id in job_ids) if row is not None]] = False
+
+    def nearest_lists(self, vectors):
+        """Returns the IVF cluster of each vector."""
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def train(self, iterations=10):
+        """Clusters a sample of the live vectors and files every vector under its nearest centroid."""
+        rng = np.random.default_rng(SEED)
+        live = np.flatnonzero(self.alive)
+        clusters = int(np.clip(np.sqrt(len(live)), 16, 4096))
+        sample = np.sort(rng.choice(live, min(len(live), clusters * 40), replace=False))
+        self.centroids = spherical_kmeans(self.vectors[sample].astype(np.float32), clusters, iterations, rng)
+        for start in range(0, len(self.records), SCAN_BLOCK):
+            block = self.vectors[start:start + SCAN_BLOCK].astype(np.float32)
+            self.lists[start:start + SCAN_BLOCK] = self.nearest_lists(block)
+        self.trained_rows = len(self.records)
+
+    def index_lists(self):
+        """Sorts the live rows by IVF cluster, so each cluster's rows are one slice of order, and saves."""
+        live = np.flatnonzero(self.alive)
+        self.order = live[np.argsort(self.lists[live], kind="stable")].astype(np.int32)
+        self.offsets = np.searchsorted(self.lists[self.order], np.arange(len(self.centroids) + 1)).astype(np.int64)
+        self.indexed_rows = len(self.records)
+        self.save()
+
+    def update(self, conn, chunk_size=5000):
+        """Brings the index in line with the jobs table: new and changed postings are embedded,
+        deleted ones removed. Returns {"added": count, "removed": count}."""
+        current = {job_id: content_key(content_hash)
+                   for job_id, content_hash in conn.execute("SELECT id, content_hash FROM jobs")}
+        removed = [job_id for job_id in self.rows if job_id not in current]
+        if removed:
+            self.remove(removed)
+        changed = [job_id for job_id, key in current.items()
+                   if job_id not in self.rows or int(self.hashes[self.rows[job_id]]) != key]
+        added = 0
+        for start in range(0, len(changed), chunk_size):
+            chunk = changed[start:start + chunk_size]
+            added += self.add_rows(conn, f"id IN ({', '.join('?' * len(chunk))})", chunk)
+        return {"added": added, "removed": len(removed)}
+
+    def add_keys(self, conn, job_keys):
+        """Embeds the stored postings with the given job_keys, e.g. the ones just upserted."""
+        job_keys = list(job_keys)
+        added = 0
+        for start in range(0, len(job_keys), 500):
+            chunk = job_keys[start:start + 500]
+            added += self.add_rows(conn, f"job_key IN ({', '.join('?' * len(chunk))})", chunk)
+        return added
+
+    def add_rows(self, conn, where, params):
+        return self.add((job_id, content_hash, f"{title or ''}. {description or ''}")
+                        for job_id, content_hash, title, description in conn.execute(
+                            f"SELECT id, content_hash, title, description FROM jobs WHERE {where} ORDER BY id", params
+                        ))
+
+    def candidates(self, query, nprobe):
+        """Returns the rows of the nprobe IVF clusters nearest to a query vector, in file order."""
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(self.centroids @ query, -nprobe)[-nprobe:]
+        rows = [self.order[self.offsets[probe]:self.offsets[probe + 1]] for probe in probes]
+        tail = self.lists[self.indexed_rows:]
+        rows.append(self.indexed_rows + np.flatnonzero(np.isin(tail, probes)).astype(np.int32))
+        rows = np.concatenate(rows)
+        # Reading the memmap in file order turns random page faults into forward reads
+        return np.sort(rows[self.alive[rows]])
+
+    def search(self, text, k=10, exclude=None, nprobe=None, exact=False):
+        """Returns [(job id, cosine similarity)] of the k postings closest in meaning to text, best first.
+
+        exclude is an optional set of job ids to leave out. nprobe is the number of IVF
+        clusters scanned, by default enough for about PROBE_ROWS vectors and at least 1/32 of
+        the clusters; exact=True scans every vector instead.
+        """
+        query = self.embedder.embed(text)
+        if self.vectors is None or not query.any():
+            return []
+        if exact or self.centroids is None:
+            scores = np.empty(len(self.job_ids), np.float32)
+            for start in range(0, len(scores), SCAN_BLOCK):
+                scores[start:start + SCAN_BLOCK] = self.vectors[start:start + SCAN_BLOCK].astype(np.float32) @ query
+            rows = np.flatnonzero(self.alive)
+            scores = scores[rows]
+        else:
+            share = max(PROBE_ROWS / max(1, len(self.records)), 1 / 32)
+            rows = self.candidates(query, nprobe or int(np.ceil(len(self.centroids) * share)))
+            scores = self.vectors[rows].astype(np.float32) @ query
+        if exclude:
+            keep = ~np.isin(self.job_ids[rows], np.fromiter(exclude, np.int64))
+            rows, scores = rows[keep], scores[keep]
+        if len(rows) > k:
+            best = np.argpartition(scores, -k)[-k:]
+            rows, scores = rows[best], scores[best]
+        order = np.argsort(-scores, kind="stable")
+        return [(int(self.job_ids[rows[i]]), float(scores[i])) for i in order if scores[i] > 0]
+
+
+def vector_path(db_path):
+    """The vector file kept next to a jobs database, e.g. jobs.db -> jobs.vectors.f16."""
+    return os.path.splitext(db_path)[0] + ".vectors.f16"
+
+@lru_cache(maxsize=None)
+def get_vector_index(db_path):
+    """Returns the writable index of a database, shared by every writer in this process."""
+    return VectorIndex.open(vector_path(db_path), writable=True)
+
+def load_vector_index(db_path):
+    """Returns the index of a database in sync with its jobs table, embedding whatever changed."""
+    index = get_vector_index(db_path)
+    with sqlite3.connect(db_path) as conn:
+        create_schema(conn)
+        index.update(conn)
+    return index
+
+def semantic_search(conn, index, text, k=10, columns=None, hide_duplicates=True):
+    """Returns the k stored jobs closest in meaning to text as a DataFrame, best first, with
+    their cosine `similarity`. Reposts of a job already in the results are left out unless
+    hide_duplicates is False."""
+    hits = index.search(text, k, exclude=duplicate_ids(conn) if hide_duplicates else None)
+    jobs = jobs_by_id(conn, [job_id for job_id, _ in hits], columns)
+    jobs["similarity"] = jobs.index.map(dict(hits)).astype(float)
+    return jobs.reset_index(drop=True)
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Embed the stored postings and search them by meaning.")
+    parser.add_argument("db", nargs="?", default="jobs.db")
+    parser.add_argument("--query", help="Print the postings closest to this text")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = load_vector_index(args.db)
+    print(f"✅ {len(index)} postings embedded in {vector_path(args.db)} ({time.perf_counter() - start:.1f}s).")
+    if args.query:
+        with sqlite3.connect(args.db) as conn:
+            start = time.perf_counter()
+            results = semantic_search(conn, index, args.query, args.k, columns=["job_title", "company", "location"])
+        print(f"🔎 {len(results)} results in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(results.to_string(index=False))
@@ -0,0 +1,155 @@
+import sqlite3
+from itertools import islice
+from src.job_schema import (
+    CONTRACT_TIMES, CONTRACT_TYPES, JOB_COLUMNS, LOCATION_LEVELS, STORAGE_COLUMNS,
+    hash_row, make_job_key, parse_location, utc_timestamp
+)
+
+# Pragmas for a write-heavy local database: WAL lets readers (the dashboard) work during
+# ingestion and synchronous=NORMAL only fsyncs at checkpoints instead of on every commit.
+WRITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # Negative means KiB, so 64 MB of page cache
+    "temp_store": "MEMORY",
+}
+
+def configure_connection(conn, pragmas=WRITE_PRAGMAS):
+    """Applies the write-path pragmas to a SQLite connection."""
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+class JobWriter:
+    """Bulk upsert path for the jobs table.
+
+    Rows go straight from job dicts to executemany, with no DataFrame in between, and each
+    batch of batch_size jobs is written in one explicit transaction. Company and location
+    names are swapped for their lookup-table ids, which are cached in memory. With a
+    dedup_index (src.job_dedup.NearDuplicateIndex), inserted and changed postings are
+    clustered with their near duplicates in the same transaction. With a vector_index
+    (src.job_vectors.VectorIndex), they are embedded for semantic search once it commits.
+    """
+
+    def __init__(self, conn, batch_size=5000, pragmas=WRITE_PRAGMAS, dedup_index=None, vector_index=None):
+        self.conn = conn if isinstance(conn, sqlite3.Connection) else sqlite3.connect(conn)
+        self.batch_size = batch_size
+        self.dedup_index = dedup_index
+        self.vector_index = vector_index
+        self.company_ids = {}
+        self.location_ids = {}
+        if pragmas:
+            configure_connection(self.conn, pragmas)
+
+    def resolve_companies(self, names):
+        """Makes sure every company name has a row in companies and its id is cached."""
+        missing = list({name for name in names if name not in self.company_ids})
+        if not missing:
+            return
+        self.conn.executemany("INSERT OR IGNORE INTO companies (name) VALUES (?)", [(name,) for name in missing])
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            self.company_ids.update((name, company_id) for company_id, name in self.conn.execute(
+                f"SELECT id, name FROM companies WHERE name IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+
+    def resolve_locations(self, locations):
+        """Like resolve_companies, for a {display_name: levels} dict of locations."""
+        missing = {name: levels for name, levels in locations.items() if name not in self.location_ids}
+        if not missing:
+            return
+        self.conn.executemany(
+            f"INSERT INTO locations (display_name, {', '.join(LOCATION_LEVELS)}) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (display_name) DO UPDATE SET "
+            + ", ".join(f"{level} = COALESCE({level}, excluded.{level})" for level in LOCATION_LEVELS),
+            [[name] + levels for name, levels in missing.items()]
+        )
+        names = list(missing)
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            self.location_ids.update((name, location_id) for location_id, name in self.conn.execute(
+                f"SELECT id, display_name FROM locations WHERE display_name IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+
+    def write(self, jobs):
+        """Upserts any iterable of jobs in batches. Returns the inserted/updated/skipped counts."""
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        jobs = iter(jobs)
+        while True:
+            batch = list(islice(jobs, self.batch_size))
+            if not batch:
+                break
+            for name, count in self.upsert_batch(batch).items():
+                stats[name] += count
+        return stats
+
+    def upsert_batch(self, jobs):
+        """Upserts one batch in a single transaction.
+
+        New jobs are inserted with the current time as their scraped_at, jobs whose content
+        changed are updated in place (keeping when they were first scraped) and identical jobs
+        are skipped.
+        """
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        # Later copies of a job within one batch win, as they would across batches
+        incoming, locations = {}, {}
+        for job in jobs:
+            key = job.get("job_key") or make_job_key(job)
+            values = [job.get(name) for name in JOB_COLUMNS]
+            values += [hash_row(values), key]
+            # Dictionary-encode the repeated strings
+            location, levels = parse_location(values[3], job.get("location_area"))
+            locations.setdefault(location, levels)
+            values[2] = values[2] or "Unknown"
+            values[3] = location
+            values[8] = CONTRACT_TYPES.get(values[8], 0)
+            values[9] = CONTRACT_TIMES.get(values[9], 0)
+            incoming[key] = values
+        stats["skipped"] += len(jobs) - len(incoming)
+
+        existing = {}
+        keys = list(incoming)
+        for start in range(0, len(keys), 500):  # Stay below SQLite's bound parameter limit
+            chunk = keys[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            existing.update(self.conn.execute(
+                f"SELECT job_key, content_hash FROM jobs WHERE job_key IN ({placeholders})", chunk
+            ))
+
+        inserts = [row for key, row in incoming.items() if key not in existing]
+        updates = [row for key, row in incoming.items() if key in existing and existing[key] != row[-2]]
+        stats["inserted"] += len(inserts)
+        stats["updated"] += len(updates)
+        stats["skipped"] += len(incoming) - len(inserts) - len(updates)
+
+        try:
+            with self.conn:
+                self.resolve_companies(row[2] for row in inserts + updates)
+                self.resolve_locations({row[3]: locations[row[3]] for row in inserts + updates})
+                for row in inserts + updates:
+                    row[2] = self.company_ids[row[2]]
+                    row[3] = self.location_ids[row[3]]
+                scraped_at = utc_timestamp()
+                self.conn.executemany(
+                    f"INSERT INTO jobs ({', '.join(STORAGE_COLUMNS)}, content_hash, job_key, scraped_at) "
+                    f"VALUES ({', '.join('?' * (len(STORAGE_COLUMNS) + 3))})",
+                    [row + [scraped_at] for row in inserts]
+                )
+                self.conn.executemany(
+                    f"UPDATE jobs SET {', '.join(name + ' = ?' for name in STORAGE_COLUMNS)}, content_hash = ? "
+                    "WHERE job_key = ?",
+                    updates
+                )
+                if self.dedup_index is not None:
+                    self.dedup_index.add_keys(self.conn, [row[-1] for row in inserts + updates])
+        except Exception:
+            # Ids handed out inside the rolled-back transaction no longer exist
+            self.company_ids.clear()
+            self.location_ids.clear()
+            raise
+        # The vector file isn't transactional; postings missed by a crash here are caught by
+        # the next VectorIndex.update, which compares content hashes
+        if self.vector_index is not None:
+            self.vector_index.add_keys(self.conn, [row[-1] for row in inserts + updates])
+        return stats
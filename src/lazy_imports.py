@@ -0,0 +1,34 @@
+import importlib
+from functools import lru_cache
+
+# Heavy optional libraries, imported on first use rather than when a module is imported.
+# benchmarks/bench_import_time.py checks that importing the app never pulls these in.
+HEAVY_MODULES = ["spacy", "PyPDF2", "docx", "gspread", "google.oauth2", "google_auth_oauthlib"]
+
+def lazy_import(name):
+    """Imports and returns a module by name; repeated calls are dictionary lookups."""
+    return importlib.import_module(name)
+
+@lru_cache(maxsize=None)
+def get_nlp(model="en_core_web_sm"):
+    """Returns the spaCy pipeline, loading it on the first call only."""
+    return lazy_import("spacy").load(model)
+
+def get_pdf_reader():
+    """Returns PyPDF2's PdfReader class."""
+    return lazy_import("PyPDF2").PdfReader
+
+def get_docx_document():
+    """Returns python-docx's Document class."""
+    return lazy_import("docx").Document
+
+def get_gspread():
+    """Returns the gspread module."""
+    return lazy_import("gspread")
+
+def get_google_auth():
+    """Returns (Flow, Request, Credentials) from the Google auth libraries, as used for OAuth."""
+    flow = lazy_import("google_auth_oauthlib.flow").Flow
+    request = lazy_import("google.auth.transport.requests").Request
+    credentials = lazy_import("google.oauth2.credentials").Credentials
+    return flow, request, credentials
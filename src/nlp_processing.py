@@ -1,16 +1,16 @@
-import spacy
-
-nlp = spacy.load("en_core_web_sm")
+from src.skill_cache import get_skill_cache
+from src.skill_extractor import get_extractor
 
 def extract_skills_from_description(job_desc):
-    skills = ["Python", "Machine Learning", "Data Analysis", "AI", "Deep Learning", "SQL", "Java", "Cloud Computing"]
-    doc = nlp(job_desc)
-    extracted_skills = set()
-    for token in doc:
-        if token.text.lower() in [skill.lower() for skill in skills]:
-            extracted_skills.add(token.text)
-    return list(extracted_skills)
+    """Returns the canonical names of the taxonomy skills mentioned in a job description.
+
+    Results are cached by description content, so repeat calls skip the extraction.
+    """
+    return get_skill_cache().get_or_extract(job_desc, get_extractor())
 
+def find_skills_in_description(job_desc):
+    """Returns each skill mention in a job description as a SkillMatch, with character offsets."""
+    return get_extractor().find(job_desc)
 
 # cover_letter_generator.py
 from src.nlp_processing import extract_skills_from_description
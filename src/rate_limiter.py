@@ -0,0 +1,130 @@
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Adzuna's default allowance for a single API key
+ADZUNA_REQUESTS_PER_MINUTE = 25
+
+
+class RateLimiter:
+    """Token bucket shared by every thread and process that uses the same state file.
+
+    The bucket lives in a SQLite row that is read and updated inside an IMMEDIATE
+    transaction, so concurrent scrapers draw from one allowance instead of each assuming
+    they have the whole API quota. `rate` tokens are added every `per` seconds, up to
+    `burst` tokens. With burst=1 no window of `per` seconds can see more than rate + 1
+    requests.
+    """
+
+    def __init__(self, name="adzuna", rate=ADZUNA_REQUESTS_PER_MINUTE, per=60.0, burst=1, path="rate_limit.db"):
+        self.name = name
+        self.fill_rate = rate / per  # Tokens per second
+        self.burst = burst
+        self.path = path
+        self.lock = threading.Lock()
+        # Autocommit mode so transactions are controlled explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS token_buckets (
+            name TEXT PRIMARY KEY,
+            tokens REAL,
+            updated_at REAL,
+            blocked_until REAL
+        )
+        ''')
+
+    def try_acquire(self, tokens=1):
+        """Takes tokens if available. Returns 0 on success, otherwise the seconds to wait."""
+        with self.lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT tokens, updated_at, blocked_until FROM token_buckets WHERE name = ?", (self.name,)
+                ).fetchone()
+                available, updated_at, blocked_until = row if row else (self.burst, now, 0.0)
+                available = min(self.burst, available + (now - updated_at) * self.fill_rate)
+
+                if now < blocked_until:
+                    wait = blocked_until - now
+                elif available >= tokens:
+                    available -= tokens
+                    wait = 0.0
+                else:
+                    wait = (tokens - available) / self.fill_rate
+
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)",
+                    (self.name, available, now, blocked_until)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def acquire(self, tokens=1):
+        """Blocks until tokens are available."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """Waits for tokens without blocking the event loop."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def block_for(self, seconds):
+        """Pauses every user of the bucket, e.g. after the API answered 429 Too Many Requests."""
+        with self.lock:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "INSERT INTO token_buckets (name, tokens, updated_at, blocked_until) VALUES (?, 0, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET tokens = 0, updated_at = excluded.updated_at, "
+                    "blocked_until = MAX(blocked_until, excluded.blocked_until)",
+                    (self.name, now, now + seconds)
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+
+def parse_retry_after(value):
+    """Converts a Retry-After header (seconds or an HTTP date) into seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_delay(attempt, retry_after=None, base=1.0, cap=60.0):
+    """Seconds to wait before the next attempt.
+
+    Honours the server's Retry-After when present (plus a little jitter so waiting clients
+    don't all return at once); otherwise uses exponential backoff with full jitter.
+    """
+    server_delay = parse_retry_after(retry_after)
+    if server_delay is not None:
+        return server_delay + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
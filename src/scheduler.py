@@ -0,0 +1,381 @@
+import json
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import pandas as pd
+from src.config import load_config
+from src.job_schema import create_schema, utc_timestamp
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS saved_searches (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    job_titles TEXT NOT NULL,
+    location TEXT NOT NULL,
+    schedule TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    next_run_at TEXT,
+    running_since TEXT,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY,
+    search_id INTEGER NOT NULL REFERENCES saved_searches (id),
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL,
+    inserted INTEGER,
+    updated INTEGER,
+    skipped INTEGER,
+    error TEXT,
+    worker TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_search ON scrape_runs (search_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_saved_searches_next_run ON saved_searches (enabled, next_run_at);
+'''
+
+CRON_ALIASES = {"@hourly": "0 * * * *", "@daily": "0 0 * * *", "@weekly": "0 0 * * 0"}
+# (lowest, highest) value of the minute, hour, day of month, month and day of week fields;
+# as in cron, both 0 and 7 are Sunday
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+INTERVAL_UNITS = {"m": 60, "h": 3600, "d": 86400}
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+def parse_cron_field(field, low, high):
+    """Expands one cron field ("*", "*/15", "1-5", "0,30", "10-50/20") into a set of values."""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/", 1)
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = map(int, part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+def format_timestamp(moment):
+    return moment.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+class Schedule:
+    """When a saved search runs: a five-field cron expression, an alias or a fixed interval.
+
+    Cron expressions ("*/30 * * * *", "0 8 * * 1-5") and the @hourly, @daily and @weekly
+    aliases are evaluated in UTC. "@every 30m" (or 2h, 1d) runs that long after the previous
+    run started.
+    """
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        self.interval = None
+        if self.expression.startswith("@every "):
+            amount = self.expression.split(None, 1)[1].strip()
+            if amount[-1:] not in INTERVAL_UNITS or not amount[:-1].isdigit() or int(amount[:-1]) < 1:
+                raise ValueError(f"Invalid interval {amount!r}, expected e.g. 30m, 2h or 1d")
+            self.interval = timedelta(seconds=int(amount[:-1]) * INTERVAL_UNITS[amount[-1]])
+            return
+        fields = CRON_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid schedule {expression!r}, expected a cron expression or '@every 30m'")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)
+        ]
+        if 7 in self.weekdays:
+            self.weekdays = (self.weekdays - {7}) | {0}
+        # As in cron, restricting both day fields matches either one
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    def matches_day(self, moment):
+        in_month = moment.day in self.days
+        in_week = (moment.weekday() + 1) % 7 in self.weekdays  # Cron counts from Sunday = 0
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment):
+        """Returns the first time after `moment` at which the schedule is due."""
+        if self.interval:
+            return moment + self.interval
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        # Skip whole months, days and hours that can't match instead of testing every minute
+        while moment < limit:
+            if moment.month not in self.months:
+                month = moment.month % 12 + 1
+                moment = moment.replace(year=moment.year + (month == 1), month=month, day=1, hour=0, minute=0)
+            elif not self.matches_day(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Schedule {self.expression!r} never runs")
+
+
+def create_scheduler_tables(conn):
+    """Creates the saved_searches and scrape_runs tables if they don't exist."""
+    conn.executescript(SCHEDULER_SCHEMA)
+    conn.commit()
+
+def save_search(conn, name, job_titles, location="London", schedule="@every 1h", enabled=True):
+    """Adds or updates a saved search. New searches are due immediately."""
+    Schedule(schedule)  # Reject invalid schedules before they reach the daemon
+    titles = [title.strip() for title in job_titles if title.strip()]
+    if not titles:
+        raise ValueError("A saved search needs at least one job title.")
+    now = utc_timestamp()
+    with conn:
+        conn.execute('''
+        INSERT INTO saved_searches (name, job_titles, location, schedule, enabled, next_run_at, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            job_titles = excluded.job_titles,
+            location = excluded.location,
+            schedule = excluded.schedule,
+            enabled = excluded.enabled
+        ''', (name, json.dumps(titles), location, schedule, int(enabled), now, now))
+
+def request_refresh(conn, name):
+    """Makes a saved search due now, e.g. when the user asks for fresh results."""
+    with conn:
+        conn.execute("UPDATE saved_searches SET next_run_at = ? WHERE name = ?", (utc_timestamp(), name))
+
+def list_searches(conn):
+    """Returns the saved searches with the outcome of their latest run as a DataFrame."""
+    return pd.read_sql_query('''
+    SELECT searches.id, searches.name, searches.job_titles, searches.location, searches.schedule,
+           searches.enabled, searches.next_run_at, searches.running_since,
+           runs.started_at AS last_run_at, runs.status AS last_status, runs.inserted AS last_inserted
+    FROM saved_searches AS searches
+    LEFT JOIN scrape_runs AS runs ON runs.id = (
+        SELECT id FROM scrape_runs WHERE search_id = searches.id ORDER BY started_at DESC, id DESC LIMIT 1
+    )
+    ORDER BY searches.name
+    ''', conn)
+
+def run_history(conn, name=None, limit=20):
+    """Returns the most recent runs, of one saved search or all of them, newest first."""
+    where, params = (" WHERE searches.name = ?", [name]) if name else ("", [])
+    return pd.read_sql_query(f'''
+    SELECT runs.id, searches.name, runs.started_at, runs.finished_at, runs.status,
+           runs.inserted, runs.updated, runs.skipped, runs.error, runs.worker
+    FROM scrape_runs AS runs
+    JOIN saved_searches AS searches ON searches.id = runs.search_id{where}
+    ORDER BY runs.started_at DESC, runs.id DESC
+    LIMIT ?
+    ''', conn, params=params + [limit])
+
+
+class Scheduler:
+    """Runs saved searches on their schedules through a bounded pool of worker threads.
+
+    A search is claimed by setting its running_since in one UPDATE, so it never runs twice at
+    once, even with several scheduler processes on the same database. Claims older than
+    stale_after seconds (e.g. left by a killed process) can be taken over. Every run is
+    recorded in scrape_runs. scraper_options are passed on to JobScraper.
+    """
+
+    def __init__(self, db_name="jobs.db", max_workers=2, poll_interval=30, stale_after=6 * 3600,
+                 scraper_options=None):
+        self.db_name = db_name
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.scraper_options = {"incremental": True, "use_async": True, **(scraper_options or {})}
+        self.worker_name = f"{socket.gethostname()}:{os.getpid()}"
+        self.conn = sqlite3.connect(db_name, timeout=30)
+        # Create everything up front so workers don't race to migrate the schema
+        create_schema(self.conn)
+        create_scheduler_tables(self.conn)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        self.running = {}  # Future -> (search, run id, started_at)
+        self.stopping = threading.Event()
+
+    def due_searches(self, now):
+        """Returns the enabled searches whose next run time has passed, most overdue first."""
+        rows = self.conn.execute('''
+        SELECT id, name, job_titles, location, schedule FROM saved_searches
+        WHERE enabled = 1 AND (next_run_at IS NULL OR next_run_at <= ?)
+        ORDER BY next_run_at
+        ''', (format_timestamp(now),)).fetchall()
+        return [dict(zip(["id", "name", "job_titles", "location", "schedule"], row)) for row in rows]
+
+    def claim(self, search, now):
+        """Marks the search as running and opens its run record. Returns the run id, or None.
+
+        The search must still be due: another process may have run and rescheduled it since
+        `search` was read.
+        """
+        started_at = format_timestamp(now)
+        stale = format_timestamp(now - timedelta(seconds=self.stale_after))
+        with self.conn:
+            claimed = self.conn.execute(
+                "UPDATE saved_searches SET running_since = ? "
+                "WHERE id = ? AND enabled = 1 AND (next_run_at IS NULL OR next_run_at <= ?) "
+                "AND (running_since IS NULL OR running_since < ?)",
+                (started_at, search["id"], started_at, stale)
+            ).rowcount
+            if not claimed:
+                return None
+            self.conn.execute(
+                "UPDATE scrape_runs SET status = 'abandoned', finished_at = ? WHERE search_id = ? AND status = 'running'",
+                (started_at, search["id"])
+            )
+            return self.conn.execute(
+                "INSERT INTO scrape_runs (search_id, started_at, status, worker) VALUES (?, ?, 'running', ?)",
+                (search["id"], started_at, self.worker_name)
+            ).lastrowid
+
+    def run_search(self, search):
+        """Scrapes one saved search; runs on a worker thread with its own connections."""
+        from src.job_scraper import JobScraper
+
+        options = dict(self.scraper_options)
+        use_async = options.pop("use_async")
+        scraper = JobScraper(json.loads(search["job_titles"]), location=search["location"],
+                             db_name=self.db_name, **options)
+        try:
+            return scraper.scrape_jobs(use_async=use_async)
+        finally:
+            scraper.conn.close()
+
+    def finish(self, search, run_id, started, stats=None, error=None):
+        """Closes the run record, releases the search and schedules its next run."""
+        finished = datetime.now(timezone.utc)
+        schedule = Schedule(search["schedule"])
+        next_run = schedule.next_after(started)
+        if next_run <= finished:
+            # The run overlapped its next slot; skip ahead instead of starting again at once
+            next_run = schedule.next_after(finished)
+        stats = stats or {}
+        with self.conn:
+            self.conn.execute('''
+            UPDATE scrape_runs SET finished_at = ?, status = ?, inserted = ?, updated = ?, skipped = ?, error = ?
+            WHERE id = ?
+            ''', (format_timestamp(finished), "failed" if error else "succeeded", stats.get("inserted"),
+                  stats.get("updated"), stats.get("skipped"), error, run_id))
+            self.conn.execute(
+                "UPDATE saved_searches SET running_since = NULL, next_run_at = ? WHERE id = ?",
+                (format_timestamp(next_run), search["id"])
+            )
+
+    def collect(self):
+        """Records the outcome of every finished run."""
+        for future in [future for future in self.running if future.done()]:
+            search, run_id, started = self.running.pop(future)
+            error = future.exception()
+            if error:
+                logger.error("Saved search %r failed: %s", search["name"], error)
+                self.finish(search, run_id, started, error=f"{type(error).__name__}: {error}")
+            else:
+                stats = future.result()
+                logger.info("Saved search %r done: %s", search["name"], stats)
+                self.finish(search, run_id, started, stats=stats)
+
+    def tick(self):
+        """Starts due searches while workers are free. Returns the number started."""
+        self.collect()
+        started = 0
+        now = datetime.now(timezone.utc)
+        busy = {search["id"] for search, _, _ in self.running.values()}
+        for search in self.due_searches(now):
+            if len(self.running) >= self.max_workers:
+                break  # The rest stay due and are picked up as workers free up
+            if search["id"] in busy:
+                continue
+            run_id = self.claim(search, now)
+            if run_id is None:
+                continue  # Already running, here or in another scheduler process
+            logger.info("Starting saved search %r", search["name"])
+            future = self.executor.submit(self.run_search, search)
+            self.running[future] = (search, run_id, now)
+            started += 1
+        return started
+
+    def run_once(self):
+        """Runs every due search (max_workers at a time) and returns when all have finished."""
+        while self.tick() or self.running:
+            time.sleep(0.5)
+        self.collect()
+
+    def run_forever(self):
+        """Polls for due searches until stop() is called, then waits for running searches."""
+        logger.info("Scheduler started with %d workers on %s", self.max_workers, self.db_name)
+        while not self.stopping.is_set():
+            self.tick()
+            # Wake up early when a run finishes so queued searches start promptly
+            deadline = time.monotonic() + self.poll_interval
+            while not self.stopping.is_set() and time.monotonic() < deadline:
+                if any(future.done() for future in self.running):
+                    break
+                self.stopping.wait(0.5)
+        logger.info("Stopping, waiting for %d running searches", len(self.running))
+        self.executor.shutdown(wait=True)
+        self.collect()
+
+    def stop(self, *args):
+        self.stopping.set()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    load_config()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Runs saved job searches on a schedule.")
+    parser.add_argument("--db", default="jobs.db")
+    commands = parser.add_subparsers(dest="command")
+    run = commands.add_parser("run", help="Run the scheduler (the default)")
+    run.add_argument("--workers", type=int, default=2)
+    run.add_argument("--poll", type=float, default=30, help="Seconds between checks for due searches")
+    run.add_argument("--once", action="store_true", help="Run the searches that are due, then exit")
+    add = commands.add_parser("add", help="Add or update a saved search")
+    add.add_argument("name")
+    add.add_argument("--titles", required=True, help="Comma separated job titles")
+    add.add_argument("--location", default="London")
+    add.add_argument("--schedule", default="@every 1h", help="Cron expression (UTC) or e.g. '@every 30m'")
+    add.add_argument("--disabled", action="store_true")
+    commands.add_parser("list", help="Show saved searches")
+    history = commands.add_parser("history", help="Show recent runs")
+    history.add_argument("name", nargs="?")
+    args = parser.parse_args()
+
+    if args.command in (None, "run"):
+        scheduler = Scheduler(args.db, max_workers=getattr(args, "workers", 2), poll_interval=getattr(args, "poll", 30))
+        signal.signal(signal.SIGINT, scheduler.stop)
+        signal.signal(signal.SIGTERM, scheduler.stop)
+        if getattr(args, "once", False):
+            scheduler.run_once()
+        else:
+            scheduler.run_forever()
+    else:
+        conn = sqlite3.connect(args.db, timeout=30)
+        create_scheduler_tables(conn)
+        if args.command == "add":
+            save_search(conn, args.name, args.titles.split(","), args.location, args.schedule, not args.disabled)
+            print(f"✅ Saved search '{args.name}' ({args.schedule}).")
+        elif args.command == "list":
+            print(list_searches(conn).to_string(index=False))
+        else:
+            print(run_history(conn, args.name).to_string(index=False))
+        conn.close()
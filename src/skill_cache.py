@@ -0,0 +1,147 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from src.config import get_setting
+from src.job_writer import configure_connection
+from src.skill_extractor import get_extractor
+
+
+class SkillCache:
+    """Content-addressed cache of the skills extracted from job descriptions.
+
+    Entries are keyed by a SHA-256 of the whitespace-normalized description and the
+    taxonomy version, so duplicate postings share one entry and a taxonomy change makes
+    every old entry unreachable (they are deleted the next time the cache is opened).
+    A small in-process LRU sits in front of the SQLite table (in WAL mode, so lookups
+    from several processes don't block each other) and repeated calls within a session
+    never touch the disk. Once more than max_entries are stored on disk the least
+    recently used ones are evicted.
+    """
+
+    def __init__(self, path="skill_cache.db", taxonomy_version=None, memory_entries=1024, max_entries=200000):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = configure_connection(sqlite3.connect(path, timeout=30, check_same_thread=False))
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            key TEXT PRIMARY KEY,
+            taxonomy_version TEXT,
+            skills TEXT,
+            last_used REAL
+        )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_skills_last_used ON skills (last_used)")
+        if taxonomy_version:
+            self.conn.execute("DELETE FROM skills WHERE taxonomy_version != ?", (taxonomy_version,))
+        self.conn.commit()
+        self.entries = self.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+    @staticmethod
+    def make_key(description, taxonomy_version):
+        """Hashes a description with runs of whitespace collapsed, which never changes its skills."""
+        normalized = " ".join((description or "").split())
+        return hashlib.sha256(f"{taxonomy_version}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def remember(self, memory_key, skills):
+        """Puts an entry in the in-process LRU, dropping the least recently used overflow."""
+        self.memory[memory_key] = skills
+        self.memory.move_to_end(memory_key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, description, taxonomy_version):
+        """Returns the cached skill names of a description, or None if they have not been extracted."""
+        # The LRU is keyed by the text itself: Python caches string hashes, so a repeat
+        # call with the same string costs a dictionary lookup and no SHA-256
+        memory_key = (taxonomy_version, description)
+        with self.lock:
+            skills = self.memory.get(memory_key)
+            if skills is not None:
+                self.memory.move_to_end(memory_key)
+                self.memory_hits += 1
+                return list(skills)
+            key = self.make_key(description, taxonomy_version)
+            row = self.conn.execute("SELECT skills FROM skills WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE skills SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            self.disk_hits += 1
+            skills = json.loads(row[0])
+            self.remember(memory_key, skills)
+            return list(skills)
+
+    def set(self, description, taxonomy_version, skills):
+        """Stores the skill names extracted from a description and evicts the least recently used overflow."""
+        with self.lock:
+            self.remember((taxonomy_version, description), list(skills))
+            key = self.make_key(description, taxonomy_version)
+            row = (json.dumps(list(skills)), time.time(), key)
+            # Only a new key adds an entry; replacing an existing one must not count
+            if not self.conn.execute("UPDATE skills SET skills = ?, last_used = ? WHERE key = ?", row).rowcount:
+                self.conn.execute(
+                    "INSERT INTO skills (key, taxonomy_version, skills, last_used) VALUES (?, ?, ?, ?)",
+                    (key, taxonomy_version, row[0], row[1])
+                )
+                self.entries += 1
+            if self.entries > self.max_entries:
+                # Other processes add and evict entries too, so count before deciding
+                self.entries = self.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+            if self.entries > self.max_entries:
+                # Evict a tenth at a time so the ordered delete runs once per many inserts
+                keep = int(self.max_entries * 0.9)
+                self.conn.execute(
+                    "DELETE FROM skills WHERE key IN ("
+                    "SELECT key FROM skills ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (keep,)
+                )
+                self.entries = keep
+            self.conn.commit()
+
+    def get_or_extract(self, description, extractor):
+        """Returns the skill names of a description, running extractor.extract only on a miss."""
+        description = description or ""
+        skills = self.get(description, extractor.version)
+        if skills is None:
+            skills = extractor.extract(description)
+            self.set(description, extractor.version, skills)
+        return skills
+
+    def clear(self):
+        """Removes every cached entry, in memory and on disk."""
+        with self.lock:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM skills")
+            self.conn.commit()
+            self.entries = 0
+
+    def stats(self):
+        """Returns the hit and miss counters, the hit rate and the number of stored entries."""
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else None,
+                "entries": self.entries,
+                "memory_entries": len(self.memory),
+            }
+
+
+@lru_cache(maxsize=None)
+def get_skill_cache():
+    """Returns the shared cache for the default taxonomy, stored at SKILL_CACHE_PATH (skill_cache.db)."""
+    return SkillCache(get_setting("SKILL_CACHE_PATH", "skill_cache.db"), get_extractor().version)
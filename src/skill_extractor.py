@@ -0,0 +1,472 @@
+import csv
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import zlib
+from array import array
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "static" / "Data" / "skill_taxonomy.csv"
+# Words keep a trailing + or # ("C++", "C#"); other punctuation is a token of its own so
+# phrases never match across it. Whitespace, "-" and "/" only separate tokens, which makes
+# "scikit-learn" match "scikit learn" and "CI/CD" match "CI CD".
+TOKEN_PATTERN = re.compile(r"[^\W_]+[+#]*|[^\w\s/-]")
+# What around a single letter makes it an abbreviation or a grade rather than a language:
+# "R&D", "P&L", "C: ..." and "a C grade"
+LETTER_NOISE_BEFORE = re.compile(r"&\s*$")
+LETTER_NOISE_AFTER = re.compile(r"\s*(?:&|:|grades?\b)", re.IGNORECASE)
+# Characters inspected before a match to tell whether it starts a sentence
+LOOKBEHIND = 16
+# Values of pattern_exact: case-insensitive, case-sensitive, and case-sensitive except that
+# it never counts at the start of a sentence (match=inline), where it is capitalized anyway
+ANY_CASE, EXACT, INLINE = 0, 1, 2
+MATCH_MODES = {"": ANY_CASE, "exact": EXACT, "inline": INLINE}
+# Compiled taxonomy artifacts (see CompiledTaxonomy). Bump ARTIFACT_FORMAT whenever the
+# layout changes, so stale files are rebuilt rather than misread.
+ARTIFACT_MAGIC = b"SKTX"
+ARTIFACT_FORMAT = 3
+ARTIFACT_SECTIONS = [
+    ("strings", "B"), ("token_offsets", "I"), ("token_slots", "i"), ("edge_keys", "q"),
+    ("edge_children", "i"), ("fail", "i"), ("output_offsets", "i"), ("outputs", "i"),
+    ("pattern_skills", "i"), ("pattern_exact", "B"), ("form_offsets", "I"),
+    ("name_offsets", "I"), ("category_offsets", "I"), ("context_offsets", "I"), ("context_skills", "i"),
+]
+# Magic, format, taxonomy version, then the number of items in each section
+ARTIFACT_HEADER = struct.Struct(f"<4sI16s{len(ARTIFACT_SECTIONS)}Q")
+# Distinct tokens an extractor remembers the ids of before starting over
+MEMO_SIZE = 1_000_000
+
+
+class Skill(NamedTuple):
+    name: str  # Canonical name
+    category: str
+
+
+class SkillMatch(NamedTuple):
+    skill: str  # Canonical name
+    category: str
+    start: int  # Character offsets of the matched text
+    end: int
+    text: str
+
+
+def is_letter_noise(text, start, end):
+    """Whether a one-letter match is part of an abbreviation such as "R&D" or a grade."""
+    return bool(LETTER_NOISE_BEFORE.search(text, max(0, start - LOOKBEHIND), start)
+                or LETTER_NOISE_AFTER.match(text, end))
+
+def starts_sentence(text, start):
+    """Whether the text at start begins the text or a sentence, where capitals say nothing."""
+    before = text[max(0, start - LOOKBEHIND):start].rstrip()
+    return before.endswith((".", "!", "?")) or (not before and start <= LOOKBEHIND)
+
+def tokenize(text):
+    """Returns the lowercased tokens of text and their regex matches, which carry the offsets."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters change length when lowercased; lower token by token instead
+        matches = list(TOKEN_PATTERN.finditer(text))
+        return [match.group().lower() for match in matches], matches
+    matches = list(TOKEN_PATTERN.finditer(lowered))
+    return [match.group() for match in matches], matches
+
+
+class SkillTaxonomy:
+    """Canonical skills and the surface forms (synonyms) that refer to them.
+
+    The taxonomy is a CSV file with the columns skill, category, synonyms, match and context.
+    Synonyms are separated by ";" and the canonical name is always a synonym of itself.
+    Forms match regardless of case, except for names such as "R" or "Go" that are also
+    ordinary words: match=exact makes the canonical name case-sensitive and a leading "="
+    does the same for a single synonym ("=SPA"). match=inline also ignores the name at the
+    start of a sentence ("Go to the office"). Names that are ordinary words or names even
+    when capitalized ("Spring", "Julia") also list a context: skills or categories separated
+    by ";", one of which the text must mention for those case-sensitive forms to count.
+    `version` is a hash of the file contents.
+    """
+
+    def __init__(self, skills, patterns, version, contexts=None):
+        self.skills = skills  # [Skill]
+        self.patterns = patterns  # [(surface form, skill index, ANY_CASE, EXACT or INLINE)]
+        self.version = version
+        self.contexts = contexts or [[] for _ in skills]  # Per skill, the [skill index] of its context
+
+    @classmethod
+    def load(cls, path=TAXONOMY_PATH):
+        data = Path(path).read_bytes()
+        skills, patterns, seen, context_names = [], [], set(), []
+        for row in csv.DictReader(data.decode("utf-8").splitlines()):
+            name = row["skill"].strip()
+            if not name or name.startswith("#"):
+                continue
+            skills.append(Skill(name, row["category"].strip()))
+            context_names.append([entry.strip() for entry in (row.get("context") or "").split(";") if entry.strip()])
+            mode = (row.get("match") or "").strip()
+            if mode not in MATCH_MODES:
+                raise ValueError(f"Unknown match {mode} for skill {name}")
+            forms = [(name, MATCH_MODES[mode])]
+            forms += [(form.strip().lstrip("="), EXACT if form.strip().startswith("=") else ANY_CASE)
+                      for form in (row.get("synonyms") or "").split(";")]
+            for form, mode in forms:
+                key = form if mode else form.lower()
+                if form and key not in seen:
+                    seen.add(key)
+                    patterns.append((form, len(skills) - 1, mode))
+
+        # Context entries name skills or whole categories; a skill is never its own context
+        members = {}
+        for index, skill in enumerate(skills):
+            members.setdefault(skill.name, []).append(index)
+            members.setdefault(skill.category, []).append(index)
+        contexts = []
+        for index, names in enumerate(context_names):
+            unknown = [name for name in names if name not in members]
+            if unknown:
+                raise ValueError(f"Unknown context {', '.join(unknown)} for skill {skills[index].name}")
+            contexts.append(sorted({member for name in names for member in members[name]} - {index}))
+        return cls(skills, patterns, hashlib.sha1(data).hexdigest()[:16], contexts)
+
+
+def build_automaton(taxonomy):
+    """Compiles every surface form of a taxonomy into a token-level Aho-Corasick automaton.
+
+    Returns (goto, outputs, fail): goto[node] is {token: child}, outputs[node] the
+    (pattern index, token count) of the forms ending there, including the ones inherited
+    through failure links, and fail[node] the node its failure link points to.
+    """
+    goto = [{}]
+    outputs = [[]]
+    for index, (form, _, _) in enumerate(taxonomy.patterns):
+        tokens = tokenize(form)[0]
+        if not tokens:
+            continue
+        node = 0
+        for token in tokens:
+            if token not in goto[node]:
+                goto.append({})
+                outputs.append([])
+                goto[node][token] = len(goto) - 1
+            node = goto[node][token]
+        outputs[node].append((index, len(tokens)))
+
+    # Failure links breadth first, merging inherited outputs
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for token, child in goto[node].items():
+            queue.append(child)
+            fallback = fail[node]
+            while fallback and token not in goto[fallback]:
+                fallback = fail[fallback]
+            target = goto[fallback].get(token, 0)
+            fail[child] = target if target != child else 0
+            outputs[child] = outputs[child] + outputs[fail[child]]
+    return goto, outputs, fail
+
+
+def hash_slot(key, bits):
+    """Fibonacci hash of a non-negative integer key into a table of 2 ** bits slots."""
+    return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+class CompiledTaxonomy:
+    """A taxonomy compiled into one flat binary artifact that the matcher reads in place.
+
+    The file is a header (magic, ARTIFACT_FORMAT, the taxonomy version it was built from and
+    the length of every section) followed by 8-byte aligned arrays: a string table holding
+    the tokens, canonical names, categories and surface forms, open-addressing hash tables
+    from token to token id and from (node, token id) to child node, the failure links
+    and outputs of the automaton, and the context skills of every skill. Opening it maps
+    the file and takes typed memoryviews of the sections, so nothing is parsed or rebuilt
+    at start up and forked processes share the pages; lookups probe the tables directly.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer  # bytes or an mmap, kept alive for the views below
+        magic, file_format, version, *counts = ARTIFACT_HEADER.unpack_from(buffer)
+        if magic != ARTIFACT_MAGIC or file_format != ARTIFACT_FORMAT:
+            raise ValueError("Not a compiled skill taxonomy of this version")
+        self.version = version.decode("ascii")
+        view = memoryview(buffer)
+        offset = ARTIFACT_HEADER.size
+        for (name, code), count in zip(ARTIFACT_SECTIONS, counts):
+            size = count * struct.calcsize(code)
+            setattr(self, name, view[offset:offset + size].cast(code))
+            offset += -size % 8 + size
+        if offset > len(buffer):
+            raise ValueError("Truncated compiled skill taxonomy")
+        self.token_bits = len(self.token_slots).bit_length() - 1
+        self.edge_bits = len(self.edge_keys).bit_length() - 1
+
+    @classmethod
+    def compile(cls, taxonomy):
+        """Returns the artifact of a taxonomy as bytes."""
+        goto, outputs, fail = build_automaton(taxonomy)
+        tokens = sorted({token for edges in goto for token in edges})
+        token_ids = {token: token_id for token_id, token in enumerate(tokens)}
+        strings = bytearray()
+        offsets = {}
+        for name, values in (("token_offsets", tokens), ("name_offsets", [skill.name for skill in taxonomy.skills]),
+                             ("category_offsets", [skill.category for skill in taxonomy.skills]),
+                             ("form_offsets", [form for form, _, _ in taxonomy.patterns])):
+            offsets[name] = [len(strings)]
+            for value in values:
+                strings += value.encode("utf-8")
+                offsets[name].append(len(strings))
+
+        # Tables at most half full, so probe sequences stay short
+        token_bits = max(1, (2 * len(tokens)).bit_length())
+        token_slots = [-1] * (1 << token_bits)
+        for token_id, token in enumerate(tokens):
+            slot = zlib.crc32(token.encode("utf-8")) & ((1 << token_bits) - 1)
+            while token_slots[slot] >= 0:
+                slot = (slot + 1) & ((1 << token_bits) - 1)
+            token_slots[slot] = token_id
+        edges = [(node << 32 | token_ids[token], child) for node, children in enumerate(goto)
+                 for token, child in children.items()]
+        edge_bits = max(1, (2 * len(edges)).bit_length())
+        edge_keys, edge_children = [-1] * (1 << edge_bits), [0] * (1 << edge_bits)
+        for key, child in edges:
+            slot = hash_slot(key, edge_bits)
+            while edge_keys[slot] >= 0:
+                slot = (slot + 1) & ((1 << edge_bits) - 1)
+            edge_keys[slot], edge_children[slot] = key, child
+
+        output_offsets = [0]
+        for node_outputs in outputs:
+            output_offsets.append(output_offsets[-1] + 2 * len(node_outputs))
+        context_offsets = [0]
+        for context in taxonomy.contexts:
+            context_offsets.append(context_offsets[-1] + len(context))
+        sections = {
+            "strings": bytes(strings), "token_slots": token_slots, "edge_keys": edge_keys,
+            "edge_children": edge_children, "fail": fail, "output_offsets": output_offsets,
+            "outputs": [value for node_outputs in outputs for pair in node_outputs for value in pair],
+            "pattern_skills": [skill_index for _, skill_index, _ in taxonomy.patterns],
+            "pattern_exact": [mode for _, _, mode in taxonomy.patterns], **offsets,
+            "context_offsets": context_offsets,
+            "context_skills": [skill_index for context in taxonomy.contexts for skill_index in context],
+        }
+        body = bytearray()
+        for name, code in ARTIFACT_SECTIONS:
+            data = bytes(sections[name]) if code == "B" else array(code, sections[name]).tobytes()
+            body += data + bytes(-len(data) % 8)
+        counts = [len(sections[name]) for name, _ in ARTIFACT_SECTIONS]
+        header = ARTIFACT_HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT, taxonomy.version.encode("ascii"), *counts)
+        return header + bytes(body)
+
+    @classmethod
+    def open(cls, path):
+        """Maps an artifact file read-only."""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def string(self, offsets, index):
+        return bytes(self.strings[offsets[index]:offsets[index + 1]]).decode("utf-8")
+
+    def token_id(self, token):
+        """Returns the id of a token, or -1 if no surface form contains it."""
+        encoded = token.encode("utf-8")
+        mask = (1 << self.token_bits) - 1
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            token_id = self.token_slots[slot]
+            if token_id < 0:
+                return -1
+            if self.strings[self.token_offsets[token_id]:self.token_offsets[token_id + 1]] == encoded:
+                return token_id
+            slot = (slot + 1) & mask
+
+    def child(self, node, token_id):
+        """Returns the node reached from node on a token id, or -1 if there is no such edge."""
+        key = node << 32 | token_id
+        slot = hash_slot(key, self.edge_bits)
+        while True:
+            found = self.edge_keys[slot]
+            if found == key:
+                return self.edge_children[slot]
+            if found < 0:
+                return -1
+            slot = (slot + 1) & ((1 << self.edge_bits) - 1)
+
+
+class SkillExtractor:
+    """Finds taxonomy skills in free text with a token-level Aho-Corasick automaton.
+
+    Every surface form is compiled once into a trie over lowercased tokens, with failure
+    links, so a description is scanned token by token in a single pass regardless of the
+    number of skills. Overlapping matches resolve to the leftmost, then longest, form, so
+    "Machine Learning Engineer" yields "Machine Learning" and not also "Learning". A
+    case-sensitive form of a skill with a context is dropped unless the text also mentions
+    one of the context skills through a form that needs none, so two ambiguous words never
+    vouch for each other. One-letter names ("C", "R") never count in abbreviations or
+    grades, and inline names never at the start of a sentence.
+    The automaton is a CompiledTaxonomy, usually mapped from the artifact file (see
+    get_extractor); the tokens and transitions a text uses are memoized as it is scanned,
+    which turns the hot part of the automaton into a dict-based DFA.
+    """
+
+    def __init__(self, taxonomy=None, compiled=None):
+        self.compiled = compiled or CompiledTaxonomy(CompiledTaxonomy.compile(taxonomy or SkillTaxonomy.load()))
+        self.token_ids = {}  # Token -> token id, -1 for tokens of no surface form
+        self.transitions = {}  # node << 32 | token id -> next node, after following failure links
+        self.outputs = {}  # Node reached -> [(token count, pattern index)], only for nodes with outputs
+        self.skills = {}  # Skill index -> Skill
+        self.forms = {}  # Pattern index -> surface form
+        self.contexts = {}  # Skill index -> frozenset of context skill indices, empty if it needs none
+
+    @property
+    def version(self):
+        return self.compiled.version
+
+    def skill(self, index):
+        if index not in self.skills:
+            self.skills[index] = Skill(self.compiled.string(self.compiled.name_offsets, index),
+                                       self.compiled.string(self.compiled.category_offsets, index))
+        return self.skills[index]
+
+    def form(self, index):
+        if index not in self.forms:
+            self.forms[index] = self.compiled.string(self.compiled.form_offsets, index)
+        return self.forms[index]
+
+    def context(self, index):
+        if index not in self.contexts:
+            first, last = self.compiled.context_offsets[index], self.compiled.context_offsets[index + 1]
+            self.contexts[index] = frozenset(self.compiled.context_skills[first:last])
+        return self.contexts[index]
+
+    def step(self, node, token_id):
+        """Follows failure links from node until an edge on the token id, and notes the outputs of
+        the node it leads to."""
+        compiled = self.compiled
+        while True:
+            child = compiled.child(node, token_id)
+            if child >= 0 or not node:
+                break
+            node = compiled.fail[node]
+        node = max(child, 0)
+        first, last = compiled.output_offsets[node], compiled.output_offsets[node + 1]
+        if last > first:
+            self.outputs[node] = [(compiled.outputs[offset + 1], compiled.outputs[offset])
+                                  for offset in range(first, last, 2)]
+        return node
+
+    def find(self, text):
+        """Returns every skill mention in text as SkillMatch tuples, in order of position."""
+        if not text:
+            return []
+        tokens, spans = tokenize(text)
+        compiled, token_ids, transitions, outputs = self.compiled, self.token_ids, self.transitions, self.outputs
+        if len(token_ids) > MEMO_SIZE:
+            token_ids.clear()
+        candidates = []
+        node = 0
+        for position, token in enumerate(tokens):
+            token_id = token_ids.get(token)
+            if token_id is None:
+                token_id = token_ids[token] = compiled.token_id(token)
+            if token_id < 0:
+                # No edge anywhere in the automaton, so every failure link leads back to the root
+                node = 0
+                continue
+            key = node << 32 | token_id
+            target = transitions.get(key)
+            if target is None:
+                target = transitions[key] = self.step(node, token_id)
+            node = target
+            if node in outputs:
+                for length, index in outputs[node]:
+                    candidates.append((position - length + 1, -length, index))
+        if not candidates:
+            return []
+
+        matches = []
+        covered = -1  # Last token position taken by an accepted match
+        unconditional = set()  # Skills mentioned through a form that needs no context
+        for first, negative_length, index in sorted(candidates):
+            if first <= covered:
+                continue
+            start, end = spans[first].start(), spans[first - negative_length - 1].end()
+            if compiled.pattern_exact[index] and text[start:end] != self.form(index):
+                continue
+            if end - start == 1 and is_letter_noise(text, start, end):
+                continue
+            skill_index = compiled.pattern_skills[index]
+            needs_context = bool(compiled.pattern_exact[index] and self.context(skill_index))
+            if compiled.pattern_exact[index] == INLINE and starts_sentence(text, start):
+                continue
+            if not needs_context:
+                unconditional.add(skill_index)
+            matches.append((skill_index, start, end, needs_context))
+            covered = first - negative_length - 1
+        return [SkillMatch(*self.skill(skill_index), start, end, text[start:end])
+                for skill_index, start, end, needs_context in matches
+                if not needs_context or self.context(skill_index) & unconditional]
+
+    def extract(self, text):
+        """Returns the canonical names of the skills mentioned in text, in order of first mention."""
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+
+def artifact_path(path=TAXONOMY_PATH):
+    """The compiled artifact kept next to a taxonomy file, e.g. skill_taxonomy.csv -> skill_taxonomy.bin."""
+    return Path(path).with_suffix(".bin")
+
+def compile_artifact(path=TAXONOMY_PATH):
+    """Compiles a taxonomy file into its artifact, replacing it atomically. Returns the artifact path."""
+    target = artifact_path(path)
+    data = CompiledTaxonomy.compile(SkillTaxonomy.load(path))
+    # A unique temp file per writer, so processes compiling at once don't overwrite each other's
+    with tempfile.NamedTemporaryFile(dir=target.parent, prefix=target.name, suffix=".partial",
+                                     delete=False) as temp_file:
+        temp_file.write(data)
+    try:
+        os.replace(temp_file.name, target)
+    except OSError:
+        os.unlink(temp_file.name)
+        raise
+    return target
+
+def load_compiled(path=TAXONOMY_PATH):
+    """Maps the artifact of a taxonomy file, compiling it first if it is missing or was built
+    from another version of the file. Falls back to compiling in memory if it can't be written."""
+    version = hashlib.sha1(Path(path).read_bytes()).hexdigest()[:16]
+    target = artifact_path(path)
+    try:
+        compiled = CompiledTaxonomy.open(target)
+        if compiled.version == version:
+            return compiled
+    except (OSError, ValueError, IndexError, struct.error):
+        pass  # Missing, truncated or corrupt; rebuild it
+    try:
+        return CompiledTaxonomy.open(compile_artifact(path))
+    except OSError:
+        return CompiledTaxonomy(CompiledTaxonomy.compile(SkillTaxonomy.load(path)))
+
+@lru_cache(maxsize=None)
+def get_extractor(path=TAXONOMY_PATH):
+    """Returns the shared extractor for a taxonomy file, mapped from its compiled artifact."""
+    return SkillExtractor(compiled=load_compiled(path))
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Compile the skill taxonomy into the artifact the extractor maps.")
+    parser.add_argument("taxonomy", nargs="?", default=str(TAXONOMY_PATH))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    target = compile_artifact(args.taxonomy)
+    compiled = CompiledTaxonomy.open(target)
+    print(f"✅ Compiled {len(compiled.pattern_skills)} surface forms of {len(compiled.name_offsets) - 1} skills "
+          f"into {target} ({target.stat().st_size / 1024:.0f} KB, version {compiled.version}) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms.")
@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+def adzuna_page(path, params, total=120):
+    """A page of an Adzuna search response, with the page number taken from the URL path."""
+    page = int(path.rstrip("/").split("/")[-1])
+    what = params.get("what", "job")
+    prefix = zlib.crc32(what.encode("utf-8")) % 10 ** 6  # Distinct, stable ids per search
+    per_page = int(params.get("results_per_page", 50))
+    start = (page - 1) * per_page
+    results = [{
+        "id": f"{prefix}{i:05d}",
+        "title": f"{what} {i}",
+        "company": {"display_name": f"Company {i % 7}"},
+        "location": {"display_name": "London", "area": ["UK", "London"]},
+        "created": f"2025-03-{1 + i % 28:02d}T10:00:00Z",
+        "description": f"{what} role {i} working with Python and SQL.",
+        "salary_min": 40000 + i,
+        "salary_max": 50000 + i,
+        "contract_type": "permanent",
+        "contract_time": "full_time",
+        "redirect_url": f"https://www.adzuna.co.uk/jobs/details/{prefix}{i:05d}",
+    } for i in range(start, min(start + per_page, total))]
+    return {"count": total, "results": results}
+
+def reed_page(path, params, total=120):
+    """A page of a Reed search response, paged with resultsToSkip and resultsToTake."""
+    what = params.get("keywords", "job")
+    prefix = zlib.crc32(what.encode("utf-8")) % 10 ** 6
+    start = int(params.get("resultsToSkip", 0))
+    per_page = int(params.get("resultsToTake", 100))
+    results = [{
+        "jobId": prefix * 10 ** 5 + i,
+        "jobTitle": f"{what} {i}",
+        "employerName": f"Employer {i % 5}",
+        "locationName": "London",
+        "minimumSalary": 45000.0,
+        "maximumSalary": 55000.0,
+        "date": f"{1 + i % 28:02d}/03/2025",
+        "jobDescription": f"{what} position {i} using Python.",
+        "jobUrl": f"https://www.reed.co.uk/jobs/{what.lower().replace(' ', '-')}/{prefix * 10 ** 5 + i}",
+    } for i in range(start, min(start + per_page, total))]
+    return {"results": results, "totalResults": total}
+
+# Synthetic responses for each source in src.job_sources, by source name
+FIXTURES = {"adzuna": adzuna_page, "reed": reed_page}
+
+
+class FixtureReply(NamedTuple):
+    """A response other than 200 OK, e.g. FixtureReply(429, headers={"Retry-After": "1"})."""
+    status: int
+    body: object = None  # Sent as JSON
+    headers: dict = {}
+
+
+class FixtureServer:
+    """Local HTTP server that stands in for a job board API.
+
+    respond(path, params) returns the JSON body for a request, or a FixtureReply for another
+    status; `delay` seconds are added to every response to imitate a slow API. Every request
+    is logged as (time, path, params). Use as a context manager and point a source at
+    `url`, e.g. AdzunaSource(base_url=server.url, app_id="test", app_key="test").
+    """
+
+    def __init__(self, respond, delay=0.0):
+        self.respond = respond
+        self.delay = delay
+        self.requests = 0
+        self.log = []
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {name: values[0] for name, values in parse_qs(url.query).items()}
+                fixture.requests += 1
+                fixture.log.append((time.monotonic(), url.path, params))
+                time.sleep(fixture.delay)
+                reply = fixture.respond(url.path, params)
+                if not isinstance(reply, FixtureReply):
+                    reply = FixtureReply(200, reply)
+                body = json.dumps(reply.body).encode("utf-8")
+                self.send_response(reply.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in reply.headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/search"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
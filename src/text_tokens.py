@@ -0,0 +1,19 @@
+import re
+
+# Words of letters and digits, keeping the + and # of "c++" and "c#"
+RANK_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+# Words too common in postings and CVs to say anything about fit
+STOP_WORDS = frozenset('''
+a about above after all also am an and any are as at be been being both but by can could did do does
+doing down during each etc few for from further had has have having he her here hers him his how i if
+in into is it its just me more most my no nor not now of off on once only or other our ours out over
+own per same she should so some such than that the their theirs them then there these they this those
+through to too under until up very via was we were what when where which while who whom why will with
+would you your yours role job work working team within across including us new well
+'''.split())
+
+
+def tokenize(text):
+    """Lowercased words of text without stop words or one-letter tokens (except c and r)."""
+    return [token for token in RANK_TOKEN_PATTERN.findall((text or "").lower())
+            if token not in STOP_WORDS and (len(token) > 1 or token in "cr")]
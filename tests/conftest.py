@@ -0,0 +1,50 @@
+import pytest
+
+from src.job_scraper import JobScraper
+from src.job_sources import AdzunaSource, ReedSource
+from src.rate_limiter import RateLimiter
+from src.source_fixtures import FIXTURES, FixtureServer
+
+
+@pytest.fixture
+def make_source(tmp_path):
+    """Returns a function that points a source at a fixture server, with its own rate-limit state."""
+
+    def make(name, server, rate=1000, per=1.0, burst=1000, **options):
+        limiter = RateLimiter(name=name, rate=rate, per=per, burst=burst, path=str(tmp_path / "rate_limit.db"))
+        if name == "adzuna":
+            options = {"app_id": "test", "app_key": "test", **options}
+            return AdzunaSource(base_url=server.url, rate_limiter=limiter, **options)
+        options = {"api_key": "test", **options}
+        return ReedSource(base_url=server.url, rate_limiter=limiter, **options)
+
+    return make
+
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Returns a function that builds a JobScraper over sources, storing into tmp_path/jobs.db."""
+
+    def make(sources, job_titles=("Data Scientist",), **options):
+        options = {"cache_ttl": 0, "deduplicate": False, "embed": False, **options}
+        scraper = JobScraper(list(job_titles), db_name=str(tmp_path / "jobs.db"), sources=sources,
+                             cache_path=str(tmp_path / "http_cache.db"), **options)
+        scrapers.append(scraper)
+        return scraper
+
+    scrapers = []
+    yield make
+    for scraper in scrapers:
+        scraper.conn.close()
+
+
+@pytest.fixture
+def adzuna_server():
+    with FixtureServer(FIXTURES["adzuna"]) as server:
+        yield server
+
+
+@pytest.fixture
+def reed_server():
+    with FixtureServer(FIXTURES["reed"]) as server:
+        yield server
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from src.cv_parser import extract_name_and_contact_from_text
+from src.cv_sections import HEADING_PATTERN, heading_section, segment_cv
+
+SAMPLE_CV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "temp_cv.pdf")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Tel: +44 20 7946 0958", "+44 20 7946 0958"),
+    ("Phone (020) 7946 0958", "(020) 7946 0958"),
+    ("Mobile: 07700 900123", "07700 900123"),
+    ("Mobile: +251 938 98 70 40", "+251 938 98 70 40"),
+])
+def test_phone_numbers(text, expected):
+    assert segment_cv(text).found("phone") == [expected]
+
+
+@pytest.mark.parametrize("text", [
+    "Phone 2019 2020 2021",
+    "Awards 2018, 2019, 2020 and 2021",
+    "Employed 2015 - 2019 2020 - 2022",
+    "October 2015 - December 2020",
+    "Salary £45,000 - £60,000 per year",
+    "Order 12/03/2023",
+])
+def test_years_dates_and_amounts_are_not_phone_numbers(text):
+    assert segment_cv(text).found("phone") == []
+
+
+def test_emails_and_urls():
+    segments = segment_cv("jane.doe+cv@example.co.uk | https://github.com/jane | www.linkedin.com/in/jane.")
+    assert segments.found("email") == ["jane.doe+cv@example.co.uk"]
+    assert segments.found("url") == ["https://github.com/jane", "www.linkedin.com/in/jane"]
+
+
+def test_sections_in_order():
+    text = ("Jane Doe\njane@example.com\nPROFESSIONAL SUMMARY\nData scientist.\n"
+            "Work Experience:\nAcme, 2019 - 2023\nEducation\nBSc, 2015 - 2019\n")
+    segments = segment_cv(text)
+    assert [section.kind for section in segments.sections] == ["summary", "experience", "education"]
+    assert segments.section_text("experience") == "Acme, 2019 - 2023"
+    assert segments.section_text("contact") == "Jane Doe\njane@example.com"
+
+
+def test_heading_with_inline_content():
+    text = "Jane Doe\nEducation\nBSc Computer Science\nSkills: Python, SQL\nProjects:  Churn model\n"
+    segments = segment_cv(text)
+    assert [section.kind for section in segments.sections] == ["education", "skills", "projects"]
+    assert segments.section_text("education") == "BSc Computer Science"
+    assert segments.section_text("skills") == "Python, SQL"
+    assert segments.section_text("projects") == "Churn model"
+    assert [heading_section(match) for match in HEADING_PATTERN.finditer(text)] == ["education", "skills", "projects"]
+
+
+@pytest.mark.parametrize("line", ["Experience with Python and skills in SQL", "skills: communication and SQL"])
+def test_heading_words_inside_a_line_are_not_headings(line):
+    text = f"Jane Doe\n{line}\nEducation\nBSc\n"
+    assert [section.kind for section in segment_cv(text).sections] == ["education"]
+    assert [heading_section(match) for match in HEADING_PATTERN.finditer(text)] == ["education"]
+
+
+def test_glued_heading():
+    segments = segment_cv("Jane Doe\nAcme Ltd, March 2023PROFESSIONAL SUMMARY\nData scientist.\n")
+    assert [section.kind for section in segments.sections] == ["summary"]
+    assert segments.section_text("summary") == "Data scientist."
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Jane Doe\nMobile: 07700 900123\n", "Jane Doe"),
+    ("Mobile: 07700 900123\nJane Doe\n", "Jane Doe"),
+    ("Mobile: 07700 900123\nLocation: London, United KingdomJane Doe\nEducation\nBSc\n", "Jane Doe"),
+    ("jane@example.com\n+44 20 7946 0958\nEducation\nBSc\n", "Your Full Name"),
+    ("Mobile: 07700 900123\nLocation: London\nEducation\nBSc\n", "Your Full Name"),
+])
+def test_name_is_never_a_label_or_contact_line(text, expected):
+    assert extract_name_and_contact_from_text(text)[0] == expected
+
+
+def test_bundled_cv():
+    from src.document_text import extract_document_text
+
+    segments = segment_cv(extract_document_text(SAMPLE_CV))
+    assert segments.name == "Tihetna Mesfin"
+    assert segments.contact == ("tihetna1mm@gmail.com | +251 938 98 70 40 | "
+                                "www.linkedin.com/in/tihetna-mesfin-494b05183")
+    assert [section.kind for section in segments.sections][:2] == ["education", "training"]
@@ -0,0 +1,59 @@
+import pytest
+
+from src.http_cache import ResponseCache
+from src.source_fixtures import FIXTURES, FixtureServer
+
+# Pages each fixture takes to walk one search by default
+PAGES = {"adzuna": 3, "reed": 2}
+
+
+@pytest.fixture(params=["adzuna", "reed"])
+def source_name(request):
+    return request.param
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_repeated_crawl_is_served_from_the_cache(make_source, make_scraper, source_name, use_async):
+    with FixtureServer(FIXTURES[source_name]) as server:
+        scraper = make_scraper([make_source(source_name, server)], cache_ttl=3600)
+        first = scraper.scrape_jobs(use_async=use_async)
+        second = scraper.scrape_jobs(use_async=use_async)
+    assert server.requests == PAGES[source_name]
+    assert scraper.source_stats[source_name].cache_hits == PAGES[source_name]
+    assert scraper.cache.hits == PAGES[source_name]
+    assert first["inserted"] == second["skipped"] == 120
+
+
+def test_cache_is_shared_across_scrapers_and_credentials(make_source, make_scraper, adzuna_server):
+    make_scraper([make_source("adzuna", adzuna_server)], cache_ttl=3600).scrape_jobs()
+    other_key = make_source("adzuna", adzuna_server, app_id="other", app_key="other")
+    scraper = make_scraper([other_key], cache_ttl=3600)
+    scraper.scrape_jobs()
+    assert adzuna_server.requests == PAGES["adzuna"]
+    assert scraper.source_stats["adzuna"].cache_hits == PAGES["adzuna"]
+
+
+def test_other_searches_and_expired_entries_reach_the_server(make_source, make_scraper, adzuna_server):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)], cache_ttl=3600)
+    scraper.scrape_jobs()
+    scraper.job_titles = ["Data Engineer"]
+    scraper.scrape_jobs()
+    assert adzuna_server.requests == 2 * PAGES["adzuna"]
+
+    scraper.cache.ttl = 0  # Everything stored so far has expired
+    scraper.scrape_jobs()
+    assert adzuna_server.requests == 3 * PAGES["adzuna"]
+    assert scraper.source_stats["adzuna"].cache_hits == 0
+
+
+def test_writes_delete_expired_entries(tmp_path):
+    cache = ResponseCache(str(tmp_path / "http_cache.db"), ttl=3600)
+    cache.set("old", {"results": [1]})
+    cache.set("recent", {"results": [2]})
+    with cache.conn:
+        cache.conn.execute("UPDATE responses SET fetched_at = fetched_at - 7200 WHERE key = 'old'")
+    assert cache.stats()["entries"] == 2
+    cache.set("new", {"results": [3]})
+    assert cache.stats()["entries"] == 2
+    assert cache.get("old") is None
+    assert cache.get("recent") == {"results": [2]}
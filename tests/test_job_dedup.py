@@ -0,0 +1,94 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.job_dedup import NearDuplicateIndex, cluster_pending, list_clusters
+from src.job_schema import create_schema
+from src.job_writer import JobWriter
+
+DESCRIPTION = ("We are hiring a data scientist to build machine learning models in Python, "
+               "work with SQL and Spark, and present results to stakeholders across the business.")
+# The same posting reworded by another agency
+REPOST = ("Our client is hiring a data scientist to build machine learning models in Python, "
+          "work with SQL and Spark, and present findings to stakeholders across the company.")
+UNRELATED = "Accountant to prepare monthly management reports and reconcile ledgers in Excel."
+
+
+def job(link, title="Data Scientist", company="Acme", description=DESCRIPTION):
+    return {"title": title, "company": company, "description": description, "location": "London",
+            "apply_link": f"https://www.adzuna.co.uk/jobs/details/{link}"}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    create_schema(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def write(conn):
+    """Returns a function that upserts jobs, clustering them on insert with a given index."""
+
+    def write(jobs, index=None):
+        JobWriter(conn, dedup_index=index).write(jobs)
+        return dict(conn.execute("SELECT apply_link, cluster_id FROM jobs_view"))
+
+    return write
+
+
+def cluster_of(clusters, link):
+    return clusters[f"https://www.adzuna.co.uk/jobs/details/{link}"]
+
+
+def test_repost_joins_the_cluster_on_insert(write):
+    index = NearDuplicateIndex()
+    write([job(1), job(2, description=UNRELATED)], index)
+    clusters = write([job(3, description=REPOST), job(4, company="Recruiter Ltd", description=REPOST)], index)
+    assert cluster_of(clusters, 3) == cluster_of(clusters, 4) == cluster_of(clusters, 1)
+    assert cluster_of(clusters, 2) != cluster_of(clusters, 1)
+
+
+def test_titles_must_match_after_normalizing(write):
+    index = NearDuplicateIndex()
+    clusters = write([job(1), job(2, title="  data   SCIENTIST "), job(3, title="Data Engineer")], index)
+    assert cluster_of(clusters, 2) == cluster_of(clusters, 1)
+    assert cluster_of(clusters, 3) != cluster_of(clusters, 1)
+
+
+@pytest.mark.parametrize("margin, clustered", [(0, True), (0.01, False)])
+def test_threshold(write, margin, clustered):
+    index = NearDuplicateIndex()
+    similarity = float(np.mean(index.signature(f"Data Scientist Acme {DESCRIPTION}")
+                               == index.signature(f"Data Scientist Acme {REPOST}")))
+    assert index.threshold < similarity < 1
+    clusters = write([job(1), job(2, description=REPOST)], NearDuplicateIndex(threshold=similarity + margin))
+    assert (cluster_of(clusters, 2) == cluster_of(clusters, 1)) is clustered
+
+
+def test_cluster_pending(conn, write):
+    write([job(1), job(2, description=REPOST), job(3, description=UNRELATED), job(4, title="Data Engineer")])
+    assert cluster_pending(conn) == 4
+    assert list_clusters(conn) == [(1, 2, [1, 2])]
+    assert cluster_pending(conn) == 0
+
+    # A changed posting is clustered again, now with job 3, and its old buckets are pruned
+    write([job(2, description=UNRELATED)])
+    assert cluster_pending(conn) == 1
+    assert list_clusters(conn) == [(3, 2, [2, 3])]
+    stale = conn.execute(
+        "SELECT COUNT(*) FROM job_lsh WHERE job_id NOT IN (SELECT job_id FROM job_clusters)"
+    ).fetchone()[0]
+    assert stale == 0
+
+
+def test_deleting_the_first_posting_hands_the_cluster_on(conn, write):
+    index = NearDuplicateIndex()
+    write([job(1), job(2, description=REPOST), job(3, description=REPOST)], index)
+    with conn:
+        conn.execute("DELETE FROM jobs WHERE id = 1")
+    cluster_pending(conn)
+    assert list_clusters(conn) == [(2, 2, [2, 3])]
+    assert not conn.execute("SELECT 1 FROM job_lsh WHERE job_id = 1").fetchall()
@@ -0,0 +1,49 @@
+import pytest
+
+from src.job_export import day_filters, export_arrow, read_export
+
+
+@pytest.fixture
+def scraper(make_source, make_scraper, adzuna_server):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)])
+    scraper.scrape_jobs()
+    # Spread the 120 postings over three days, at every hour
+    scraper.conn.execute("UPDATE jobs SET scraped_at = printf('2025-03-%02dT%02d:00:00Z', 1 + id % 3, id % 24)")
+    scraper.conn.commit()
+    return scraper
+
+
+def scraped_days(scraper, after, before):
+    rows = scraper.conn.execute(
+        "SELECT substr(scraped_at, 1, 10), COUNT(*) FROM jobs WHERE scraped_at BETWEEN ? AND ? GROUP BY 1",
+        (after, before)
+    ).fetchall()
+    return dict(rows)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_partitions_by_scrape_date(scraper, tmp_path, format):
+    written = export_arrow(scraper.conn, str(tmp_path / "jobs"), format)
+    assert written == {"2025-03-01": 40, "2025-03-02": 40, "2025-03-03": 40}
+    assert read_export(str(tmp_path / "jobs"), ["id"], format).num_rows == 120
+
+
+@pytest.mark.parametrize("after, before", [
+    ("2025-03-01T12:00:00Z", "2025-03-02"),
+    ("2025-03-02", "2025-03-03T05:00:00Z"),
+    ("2025-03-01T06:00:00Z", "2025-03-01T18:00:00Z"),
+])
+def test_export_keeps_the_callers_scraped_at_bounds(scraper, tmp_path, after, before):
+    written = export_arrow(scraper.conn, str(tmp_path / "jobs"), scraped_after=after, scraped_before=before)
+    end = before if "T" in before else before + "T23:59:59Z"
+    assert written == scraped_days(scraper, after, end)
+    assert read_export(str(tmp_path / "jobs"), ["id"]).num_rows == sum(written.values())
+
+
+def test_day_filters_intersect_with_the_callers_bounds():
+    assert day_filters("2025-03-02", title="Data") == {
+        "title": "Data", "scraped_after": "2025-03-02", "scraped_before": "2025-03-02T23:59:59Z"}
+    assert day_filters("2025-03-02", scraped_after="2025-03-02T09:00:00Z", scraped_before="2025-03-02") == {
+        "scraped_after": "2025-03-02T09:00:00Z", "scraped_before": "2025-03-02T23:59:59Z"}
+    assert day_filters("2025-03-02", scraped_after="2025-03-01", scraped_before="2025-03-02T08:00:00Z") == {
+        "scraped_after": "2025-03-02", "scraped_before": "2025-03-02T08:00:00Z"}
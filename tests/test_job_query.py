@@ -0,0 +1,51 @@
+import sqlite3
+
+import pytest
+
+from src.job_query import build_where, prefix_upper_bound, query_jobs
+from src.job_schema import create_schema
+from src.job_writer import JobWriter
+
+TITLES = ["Data Scientist", "DATA ENGINEER", "Data🚀 Lead", "Data\uffff Architect", "Datum Analyst", "Dat",
+          "Dev@Ops", "Dev[Ops]", "Devops"]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    create_schema(conn)
+    JobWriter(conn).write({"title": title, "company": "Acme", "location": "London",
+                           "apply_link": f"https://www.adzuna.co.uk/jobs/details/{number}"}
+                          for number, title in enumerate(TITLES))
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("data", ["DATA ENGINEER", "Data Scientist", "Data\uffff Architect", "Data🚀 Lead"]),
+    ("Data🚀", ["Data🚀 Lead"]),
+    ("dat", ["DATA ENGINEER", "Dat", "Data Scientist", "Data\uffff Architect", "Data🚀 Lead", "Datum Analyst"]),
+    ("Dev@", ["Dev@Ops"]),
+    ("dev[", ["Dev[Ops]"]),
+    ("Data Scientists", []),
+])
+def test_title_prefix(conn, prefix, expected):
+    assert sorted(query_jobs(conn, ["title"], order_by="title", title=prefix)["title"]) == sorted(expected)
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ("Data", "Datb"),
+    ("Dev@", "Dev["),
+    ("Data🚀", "Data🚁"),
+    ("a\ud7ff", "a\ue000"),
+    ("a\U0010ffff", "b"),
+    ("\U0010ffff", None),
+])
+def test_prefix_upper_bound(prefix, expected):
+    assert prefix_upper_bound(prefix) == expected
+
+
+def test_title_prefix_uses_the_index(conn):
+    where, params = build_where(title="Data")
+    plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM jobs{where}", params))
+    assert "idx_jobs_title" in plan
@@ -0,0 +1,91 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.job_ranker import JobRanker, index_path, load_ranker
+
+CORPUS = {
+    1: "Data scientist: Python, pandas and machine learning models in production.",
+    2: "Frontend engineer building React and TypeScript interfaces.",
+    3: "Machine learning engineer. Machine learning pipelines, Python, Kubernetes.",
+    4: "Accountant preparing monthly reports in Excel.",
+    5: "Backend Python developer writing Django APIs.",
+}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, content_hash TEXT, description TEXT)")
+    conn.executemany("INSERT INTO jobs VALUES (?, ?, ?)",
+                     [(job_id, f"v1-{job_id}", description) for job_id, description in CORPUS.items()])
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def rebuilt(conn):
+    ranker = JobRanker()
+    ranker.update(conn)
+    return ranker
+
+
+def assert_same_ranking(ranker, expected, query):
+    assert [job_id for job_id, _ in ranker.top_k(query, k=10)] == [job_id for job_id, _ in expected.top_k(query, k=10)]
+    np.testing.assert_allclose([score for _, score in ranker.top_k(query, k=10)],
+                               [score for _, score in expected.top_k(query, k=10)], rtol=1e-5)
+
+
+def test_bm25_order(conn):
+    ranker = rebuilt(conn)
+    assert len(ranker) == 5
+    assert [job_id for job_id, _ in ranker.top_k("machine learning", k=10)] == [3, 1]
+    assert [job_id for job_id, _ in ranker.top_k("Python", k=10)] == [5, 1, 3]
+    assert [job_id for job_id, _ in ranker.top_k("Python machine learning", k=2)] == [3, 1]
+    assert ranker.top_k("Python", k=10, exclude={5, 1}) == ranker.top_k("Python", k=10)[2:]
+    assert ranker.top_k("plumber", k=10) == []
+
+
+def test_incremental_update_matches_full_rebuild(conn):
+    ranker = rebuilt(conn)
+    with conn:
+        conn.execute("UPDATE jobs SET description = 'Accountant automating reports with Python.', "
+                     "content_hash = 'v2-4' WHERE id = 4")
+        conn.execute("DELETE FROM jobs WHERE id = 2")
+        conn.execute("INSERT INTO jobs VALUES (6, 'v1-6', 'Python data engineer, Spark and machine learning.')")
+    assert ranker.update(conn) == {"added": 2, "removed": 1}
+    assert ranker.update(conn) == {"added": 0, "removed": 0}
+    expected = rebuilt(conn)
+    assert len(ranker) == len(expected) == 5
+    for query in ("Python", "machine learning", "reports", "React"):
+        assert_same_ranking(ranker, expected, query)
+
+
+def test_dead_rows_are_dropped(conn):
+    ranker = rebuilt(conn)
+    ranker.remove([1, 2])
+    assert len(ranker.job_ids) == len(ranker) == 3
+    assert ranker.alive.all()
+    assert sorted(ranker.rows) == [3, 4, 5]
+    assert [job_id for job_id, _ in ranker.top_k("Python", k=10)] == [5, 3]
+
+
+def test_save_load_round_trip(conn, tmp_path):
+    ranker = rebuilt(conn)
+    ranker.add([(4, "v2-4", "Accountant automating reports with Python.")])
+    path = str(tmp_path / "jobs.rank.npz")
+    ranker.save(path)
+    loaded = JobRanker.load(path)
+    assert loaded.rows == ranker.rows
+    assert loaded.hashes == ranker.hashes
+    assert [path.name for path in tmp_path.iterdir() if "partial" in path.name] == []
+    for query in ("Python", "machine learning", "reports"):
+        assert loaded.top_k(query) == ranker.top_k(query)
+
+
+def test_load_ranker_saves_next_to_the_database(conn, tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    ranker = load_ranker(db_path)
+    assert index_path(db_path) == str(tmp_path / "jobs.rank.npz")
+    assert JobRanker.load(index_path(db_path)).top_k("Python") == ranker.top_k("Python")
@@ -0,0 +1,28 @@
+import pytest
+
+from src.job_salaries import parse_salaries
+
+
+@pytest.mark.parametrize("description, expected", [
+    ("Circa £45,000 - £60,000 per annum", ("GBP", "annum", 45000, 60000)),
+    ("£45-60k", ("GBP", "annum", 45000, 60000)),
+    ("£10.50 per hour", ("GBP", "hour", 17325, 17325)),
+    ("€60.000 - €70.000", ("EUR", "annum", 60000, 70000)),
+    ("€1.250,50 per month", ("EUR", "month", 15006, 15006)),
+    ("We raised £20m. Salary £80,000", ("GBP", "annum", 80000, 80000)),
+    ("Funding of £2bn, paying £400 a day", ("GBP", "day", 88000, 88000)),
+])
+def test_parse_salaries(description, expected):
+    salary = parse_salaries([description]).iloc[0]
+    assert (salary["currency"], salary["period"], salary["annual_min"], salary["annual_max"]) == expected
+
+
+def test_up_to_only_sets_the_maximum():
+    salary = parse_salaries(["Up to £50,000"]).iloc[0]
+    assert salary["annual_max"] == 50000
+    assert salary["annual_min"] != salary["annual_min"]  # NaN
+
+
+@pytest.mark.parametrize("description", ["We raised £20m last year", "Founded in 2015, 300 staff", ""])
+def test_no_salary(description):
+    assert parse_salaries([description])["annual_max"].isna().all()
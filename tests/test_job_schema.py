@@ -0,0 +1,121 @@
+import sqlite3
+
+import pytest
+
+from src.job_schema import (
+    JOB_COLUMNS, create_schema, migrate_legacy_jobs, migrate_legacy_keys, migrate_scraped_at
+)
+
+# The single-table, free-text layout the scraper used to create
+LEGACY_JOBS = '''
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_title TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    created TEXT,
+    description TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    contract_type TEXT,
+    contract_time TEXT,
+    apply_link TEXT
+)
+'''
+LEGACY_ROWS = [
+    ("Data Scientist", "Data Scientist", "Acme", "London", "2025-03-01T09:00:00Z", "Python and SQL.",
+     50000, 60000, "permanent", "full_time", "https://www.adzuna.co.uk/jobs/land/ad/101"),
+    ("Data Scientist", "Senior Data Scientist", "Acme",
+     "{'area': ['UK', 'London', 'Central London'], 'display_name': 'Central London'}", "2025-03-02T09:00:00Z",
+     "Machine learning.", None, None, "contract", None, "https://www.adzuna.co.uk/jobs/land/ad/102"),
+    # A repost of job 101, stored again by a later run
+    ("Data Scientist", "Data Scientist", "Acme", "London", "2025-03-03T09:00:00Z", "Python, SQL and Spark.",
+     55000, 65000, "permanent", "full_time", "https://www.adzuna.co.uk/jobs/details/101"),
+    ("Data Analyst", "Data Analyst", None, None, "yesterday", "Excel.", None, None, None, "part_time",
+     "https://example.com/jobs/7"),
+]
+VIEW_COLUMNS = [
+    "id", "job_title", "title", "company", "location", "created", "description", "salary_min", "salary_max",
+    "contract_type", "contract_time", "apply_link", "country", "region", "district", "area", "job_key",
+    "content_hash", "scraped_at", "cluster_id",
+]
+
+
+@pytest.fixture
+def legacy_conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    conn.execute(LEGACY_JOBS)
+    conn.executemany(f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' * len(JOB_COLUMNS))})",
+                     LEGACY_ROWS)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def snapshot(conn):
+    """Every schema object and every row of every table, for checking that a rerun changes nothing."""
+    tables = [name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'jobs_fts%' AND name NOT LIKE 'sqlite_%'"
+    )]
+    return (conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall(),
+            {table: conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall() for table in tables})
+
+
+def test_migrate_legacy_keys_removes_duplicates(legacy_conn):
+    migrate_legacy_keys(legacy_conn)
+    rows = legacy_conn.execute("SELECT id, job_key, content_hash FROM jobs ORDER BY id").fetchall()
+    assert [(row_id, job_key) for row_id, job_key, _ in rows] == [
+        (2, "adzuna:102"), (3, "adzuna:101"), (4, rows[2][1])
+    ]
+    assert rows[2][1].startswith("sha1:")
+    assert all(content_hash for _, _, content_hash in rows)
+    before = snapshot(legacy_conn)
+    migrate_legacy_keys(legacy_conn)
+    assert snapshot(legacy_conn) == before
+
+
+def test_migrate_legacy_jobs(legacy_conn):
+    create_schema(legacy_conn)
+    assert [row[1] for row in legacy_conn.execute("PRAGMA table_info(jobs_view)")] == VIEW_COLUMNS
+    assert legacy_conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 3
+    assert legacy_conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0] == 2
+    rows = legacy_conn.execute('''
+    SELECT id, company, location, region, district, contract_type, contract_time, salary_max, scraped_at
+    FROM jobs_view ORDER BY id
+    ''').fetchall()
+    assert rows[:2] == [
+        (2, "Acme", "Central London", "London", "Central London", "contract", "Unknown", None,
+         "2025-03-02T09:00:00Z"),
+        (3, "Acme", "London", None, None, "permanent", "full_time", 65000, "2025-03-03T09:00:00Z"),
+    ]
+    assert rows[2][:7] == (4, "Unknown", "Unknown", None, None, "Unknown", "part_time")
+    assert rows[2][8] is not None  # "yesterday" isn't a timestamp, so the migration time stands in
+    assert legacy_conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH 'spark'").fetchall() == [(3,)]
+    leftovers = "SELECT 1 FROM sqlite_master WHERE name IN ('jobs_legacy', 'location_map')"
+    assert not legacy_conn.execute(leftovers).fetchall()
+
+
+def test_second_migration_changes_nothing(legacy_conn):
+    create_schema(legacy_conn)
+    before = snapshot(legacy_conn)
+    assert migrate_legacy_jobs(legacy_conn) is False
+    create_schema(legacy_conn)
+    assert snapshot(legacy_conn) == before
+
+
+def test_migrate_scraped_at(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, created TEXT)")
+    conn.execute("CREATE VIEW jobs_view AS SELECT id, created FROM jobs")
+    conn.executemany("INSERT INTO jobs (created) VALUES (?)", [("2025-03-01T09:00:00Z",), ("last week",), (None,)])
+    migrate_scraped_at(conn)
+    rows = conn.execute("SELECT created, scraped_at FROM jobs ORDER BY id").fetchall()
+    assert rows[0] == ("2025-03-01T09:00:00Z", "2025-03-01T09:00:00Z")
+    assert rows[1][1] == rows[2][1] and rows[1][1] > "2025-"
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'jobs_view'").fetchall()
+    before = snapshot(conn)
+    migrate_scraped_at(conn)
+    assert snapshot(conn) == before
+    conn.close()
@@ -0,0 +1,67 @@
+import pytest
+
+MARK = "2025-03-28T10:00:00Z"  # The newest `created` of the Adzuna fixture's 120 postings
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def use_async(request):
+    return request.param
+
+
+def test_complete_crawl_advances_high_water_mark(make_source, make_scraper, adzuna_server, use_async):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)])
+    stats = scraper.scrape_jobs(use_async=use_async)
+    assert stats["inserted"] == 120
+    assert scraper.get_high_water_mark("Data Scientist") == MARK
+
+
+def test_failed_page_keeps_high_water_mark(make_source, make_scraper, adzuna_server, use_async, monkeypatch):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)])
+    fetch_page, fetch_page_async = scraper.fetch_page, scraper.fetch_page_async
+
+    def failing_fetch_page(source, job_title, page=1, *args, **kwargs):
+        return None if page == 2 else fetch_page(source, job_title, page, *args, **kwargs)
+
+    async def failing_fetch_page_async(session, semaphore, source, job_title, page=1, *args, **kwargs):
+        if page == 2:
+            return None
+        return await fetch_page_async(session, semaphore, source, job_title, page, *args, **kwargs)
+
+    monkeypatch.setattr(scraper, "fetch_page", failing_fetch_page)
+    monkeypatch.setattr(scraper, "fetch_page_async", failing_fetch_page_async)
+    stats = scraper.scrape_jobs(use_async=use_async)
+    assert stats["inserted"] == 50
+    assert scraper.get_high_water_mark("Data Scientist") is None
+
+
+def test_crawl_cut_short_by_max_pages_keeps_high_water_mark(make_source, make_scraper, adzuna_server, use_async):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)], max_pages=2)
+    assert scraper.scrape_jobs(use_async=use_async)["inserted"] == 100
+    assert scraper.get_high_water_mark("Data Scientist") is None
+
+
+def test_failed_save_keeps_high_water_mark(make_source, make_scraper, adzuna_server, use_async, monkeypatch):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)])
+
+    def failing_write(jobs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(scraper.writer, "write", failing_write)
+    stats = scraper.scrape_jobs(use_async=use_async)
+    assert stats["failed"] == 120
+    assert scraper.get_high_water_mark("Data Scientist") is None
+
+
+def test_failed_save_holds_back_only_its_own_crawl_async(make_source, make_scraper, adzuna_server, monkeypatch):
+    scraper = make_scraper([make_source("adzuna", adzuna_server)], job_titles=["Data Scientist", "Data Engineer"])
+    write = scraper.writer.write
+
+    def failing_write(jobs):
+        if jobs[0]["title"].startswith("Data Engineer"):
+            raise RuntimeError("disk full")
+        return write(jobs)
+
+    monkeypatch.setattr(scraper.writer, "write", failing_write)
+    scraper.scrape_jobs(use_async=True)
+    assert scraper.get_high_water_mark("Data Scientist") == MARK
+    assert scraper.get_high_water_mark("Data Engineer") is None
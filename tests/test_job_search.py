@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+
+from src.job_schema import create_schema
+from src.job_search import build_match, search_jobs
+from src.job_writer import JobWriter
+
+
+def job(link, title, description, company="Acme"):
+    return {"title": title, "company": company, "description": description, "location": "London",
+            "apply_link": f"https://www.adzuna.co.uk/jobs/details/{link}"}
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    create_schema(conn)
+    JobWriter(conn).write([
+        job(1, "Data Scientist", "Python and machine learning."),
+        job(2, "C++ Developer", "Low-latency trading systems, full-time."),
+        job(3, "Nurse", "Ward nurse, part-time.", company="NHS Trust"),
+    ])
+    yield conn
+    conn.close()
+
+
+def matches(conn, query):
+    return sorted(row[0] for row in conn.execute("SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?", (query,)))
+
+
+def assert_in_sync(conn):
+    # Compares every indexed token against the jobs_view rows it was built from
+    conn.execute("INSERT INTO jobs_fts (jobs_fts, rank) VALUES ('integrity-check', 1)")
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("data scientist", '"data" "scientist"*'),
+    ("C++ developer", '"C" "developer"*'),
+    ('"quoted" AND NOT full-time', '"quoted" "AND" "NOT" "full" "time"*'),
+    ("title:nurse OR ward*", '"title" "nurse" "OR" "ward"*'),
+    ("Café", '"Café"*'),
+    ("++ -- \"", None),
+    ("", None),
+])
+def test_build_match(query, expected):
+    assert build_match(query) == expected
+
+
+def test_build_match_without_prefix():
+    assert build_match("machine learn", prefix=False) == '"machine" "learn"'
+
+
+@pytest.mark.parametrize("query", ['"quoted" AND NOT full-time', "title:nurse", "NEAR(", "C++", "*", "'"])
+def test_operators_in_queries_are_plain_words(conn, query):
+    search_jobs(conn, query)
+
+
+def test_search_jobs(conn):
+    assert search_jobs(conn, "C++ devel")["title"].tolist() == ["C++ Developer"]
+    assert search_jobs(conn, "full-time")["title"].tolist() == ["C++ Developer"]
+    assert search_jobs(conn, "NHS")["title"].tolist() == ["Nurse"]
+    assert search_jobs(conn, "learning", highlight=("[", "]"))["snippet"].tolist() == ["Python and machine [learning]."]
+
+
+def test_insert_trigger(conn):
+    assert matches(conn, "python") == [1]
+    JobWriter(conn).write([job(4, "ML Engineer", "Python pipelines.")])
+    assert matches(conn, "python") == [1, 4]
+    assert matches(conn, "engineer") == [4]
+    assert_in_sync(conn)
+
+
+def test_update_trigger(conn):
+    JobWriter(conn).write([job(1, "Data Scientist", "R and statistics.", company="Globex")])
+    assert matches(conn, "python") == []
+    assert matches(conn, "statistics") == [1]
+    assert matches(conn, "company:globex") == [1]
+    assert matches(conn, "company:acme") == [2]
+    assert_in_sync(conn)
+
+
+def test_delete_trigger(conn):
+    with conn:
+        conn.execute("DELETE FROM jobs WHERE id = 2")
+    assert matches(conn, "trading") == []
+    assert matches(conn, "acme") == [1]
+    assert_in_sync(conn)
+
+
+def test_index_is_built_for_existing_rows(conn):
+    with conn:
+        conn.execute("DROP TABLE jobs_fts")
+    create_schema(conn)
+    assert matches(conn, "nurse") == [3]
+    assert_in_sync(conn)
@@ -0,0 +1,84 @@
+import pytest
+
+from src.source_fixtures import FIXTURES, FixtureReply, FixtureServer
+
+# Results of each fixture per search, and the pages a source takes to walk them by default
+TOTAL = 120
+PAGES = {"adzuna": 3, "reed": 2}
+COLUMNS = ["title", "company", "location", "created", "description", "salary_min", "salary_max",
+           "apply_link"]
+
+
+@pytest.fixture(params=["adzuna", "reed"])
+def source_name(request):
+    return request.param
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def use_async(request):
+    return request.param
+
+
+def stored_jobs(scraper):
+    return scraper.get_saved_jobs(columns=COLUMNS, limit=None).sort_values("apply_link").reset_index(drop=True)
+
+
+def test_crawl_stores_every_posting(make_source, make_scraper, source_name, use_async):
+    with FixtureServer(FIXTURES[source_name]) as server:
+        scraper = make_scraper([make_source(source_name, server)])
+        stats = scraper.scrape_jobs(use_async=use_async)
+    assert stats == {"inserted": TOTAL, "updated": 0, "skipped": 0}
+    jobs = stored_jobs(scraper)
+    assert len(jobs) == TOTAL
+    assert jobs["title"].str.startswith("Data Scientist ").all()
+    assert jobs["location"].eq("London").all()
+    assert jobs["apply_link"].str.startswith("https://").all()
+    assert jobs["company"].nunique() == (7 if source_name == "adzuna" else 5)
+
+
+def test_sync_and_async_store_the_same_rows(make_source, make_scraper, source_name):
+    stored = []
+    for use_async in (False, True):
+        with FixtureServer(FIXTURES[source_name]) as server:
+            scraper = make_scraper([make_source(source_name, server)], job_titles=["Data Scientist", "Data Engineer"])
+            scraper.scrape_jobs(use_async=use_async)
+        stored.append(stored_jobs(scraper))
+        scraper.conn.execute("DELETE FROM jobs")
+        scraper.conn.commit()
+    assert len(stored[0]) == 2 * TOTAL
+    assert stored[0].equals(stored[1])
+
+
+def test_pagination_stops_at_the_last_page(make_source, make_scraper, source_name, use_async):
+    with FixtureServer(FIXTURES[source_name]) as server:
+        make_scraper([make_source(source_name, server)], max_pages=20).scrape_jobs(use_async=use_async)
+    assert server.requests == PAGES[source_name]
+
+
+def test_pagination_stops_at_an_empty_page(make_source, make_scraper, use_async):
+    # A result count that overstates the results must not send the crawl to max_pages
+    def overstated(path, params):
+        return {**FIXTURES["adzuna"](path, params), "count": 10 ** 6}
+
+    with FixtureServer(overstated) as server:
+        stats = make_scraper([make_source("adzuna", server)], max_pages=20).scrape_jobs(use_async=use_async)
+    assert stats["inserted"] == TOTAL
+    assert server.requests == PAGES["adzuna"] + 1
+
+
+def test_too_many_requests_backs_off_for_retry_after(make_source, make_scraper, source_name, use_async):
+    throttled = []
+
+    def respond(path, params):
+        if not throttled:
+            throttled.append(path)
+            return FixtureReply(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+        return FIXTURES[source_name](path, params)
+
+    with FixtureServer(respond) as server:
+        stats = make_scraper([make_source(source_name, server)]).scrape_jobs(use_async=use_async)
+    assert stats["inserted"] == TOTAL
+    assert server.requests == PAGES[source_name] + 1
+    (throttled_at, first_path, first_params), (retried_at, retry_path, retry_params) = server.log[:2]
+    assert (retry_path, retry_params) == (first_path, first_params)
+    assert retried_at - throttled_at >= 1.0
@@ -0,0 +1,152 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import src.job_vectors as job_vectors
+from src.job_vectors import ROW_DTYPE, VectorIndex, file_lock
+
+WORDS = ("python sql spark kubernetes react accounting nursing welding marketing sales finance docker "
+         "java excel teaching logistics warehouse forklift cooking design figma legal audit payroll").split()
+
+
+def posting(job_id):
+    """A synthetic description that shares few words with its neighbours."""
+    rng = np.random.default_rng(job_id)
+    return f"Posting {job_id}: " + " ".join(rng.choice(WORDS, 6, replace=False))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "jobs.vectors.f16")
+
+
+@pytest.fixture
+def small_ivf(monkeypatch):
+    """Trains the IVF clusters from 200 rows and re-sorts the lists every 100 appended ones."""
+    monkeypatch.setattr(job_vectors, "TRAIN_ROWS", 200)
+    monkeypatch.setattr(job_vectors, "INDEX_TAIL_ROWS", 100)
+
+
+def add_postings(index, job_ids):
+    return index.add((job_id, f"{job_id:016x}", posting(job_id)) for job_id in job_ids)
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "index.lock")
+    events = []
+    held = threading.Event()
+
+    def hold():
+        with file_lock(path):
+            held.set()
+            time.sleep(0.2)
+            events.append("first released")
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+    with file_lock(path):
+        events.append("second acquired")
+    thread.join()
+    assert events == ["first released", "second acquired"]
+
+
+def test_shared_locks_do_not_block_each_other(tmp_path):
+    path = str(tmp_path / "index.lock")
+    with file_lock(path, shared=True):
+        with file_lock(path, shared=True):
+            pass
+
+
+def test_round_trip(path):
+    index = VectorIndex.open(path, writable=True)
+    assert add_postings(index, range(1, 51)) == 50
+    add_postings(index, [7])  # A changed posting replaces its old row
+    assert len(index) == 50 and len(index.records) == 51
+    index.remove([8])
+
+    reader = VectorIndex.open(path)
+    assert len(reader) == 49
+    assert reader.rows == index.rows
+    assert reader.search(posting(7), k=3) == index.search(posting(7), k=3)
+    assert reader.search(posting(7), k=1)[0][0] == 7
+    assert 8 not in {job_id for job_id, _ in reader.search(posting(8), k=50)}
+
+    add_postings(index, [51])
+    assert reader.refresh()
+    assert reader.search(posting(51), k=1)[0][0] == 51
+    assert not reader.refresh()
+
+
+def test_ivf_training_and_search(path, small_ivf):
+    index = VectorIndex.open(path, writable=True)
+    add_postings(index, range(1, 151))
+    assert index.centroids is None
+    add_postings(index, range(151, 251))
+    assert index.centroids is not None and index.trained_rows == 250
+    assert index.indexed_rows == 250
+    clusters = len(index.centroids)
+    for job_id in (3, 120, 240):
+        assert index.search(posting(job_id), k=1)[0][0] == job_id
+        assert index.search(posting(job_id), k=5, nprobe=clusters) == index.search(posting(job_id), k=5, exact=True)
+
+
+def test_appends_extend_the_rows_without_rewriting_the_metadata(path, small_ivf):
+    index = VectorIndex.open(path, writable=True)
+    add_postings(index, range(1, 251))
+    saved_at = os.stat(index.meta_path).st_mtime_ns
+    add_postings(index, range(251, 301))
+    assert os.path.getsize(index.rows_path) == 300 * ROW_DTYPE.itemsize
+    assert os.path.getsize(path) == 300 * index.dim * 2
+    assert os.stat(index.meta_path).st_mtime_ns == saved_at
+    assert index.indexed_rows == 250
+    # Rows past the sorted lists are found by their cluster id
+    assert index.search(posting(275), k=1)[0][0] == 275
+
+    add_postings(index, range(301, 351))
+    assert index.indexed_rows == 350
+    assert VectorIndex.open(path).search(posting(275), k=1)[0][0] == 275
+
+
+def test_concurrent_writers_append_every_row(path):
+    # Separate instances share nothing but the files and the file lock, like separate processes
+    writers = [VectorIndex.open(path, writable=True) for _ in range(2)]
+    batches = [[range(start, start + 10) for start in range(first, 200, 20)] for first in (1, 11)]
+
+    def write(index, job_id_batches):
+        for job_ids in job_id_batches:
+            add_postings(index, job_ids)
+
+    threads = [threading.Thread(target=write, args=args) for args in zip(writers, batches)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    index = VectorIndex.open(path)
+    assert len(index) == len(index.records) == 200
+    assert sorted(index.rows) == list(range(1, 201))
+    # Every row's vector is the one embedded for its own job
+    for job_id in (1, 15, 100, 200):
+        row = index.rows[job_id]
+        expected = index.embedder.embed(posting(job_id)).astype(np.float16)
+        assert np.array_equal(index.vectors[row], expected)
+
+
+def test_update_follows_the_jobs_table(path, tmp_path):
+    conn = sqlite3.connect(tmp_path / "jobs.db")
+    conn.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY, content_hash TEXT, title TEXT, description TEXT)")
+    conn.executemany("INSERT INTO jobs VALUES (?, ?, ?, ?)",
+                     [(job_id, f"{job_id:016x}", "", posting(job_id)) for job_id in range(1, 21)])
+    index = VectorIndex.open(path, writable=True)
+    assert index.update(conn) == {"added": 20, "removed": 0}
+    conn.execute("DELETE FROM jobs WHERE id = 3")
+    conn.execute("UPDATE jobs SET content_hash = 'ff', description = ? WHERE id = 4", (posting(99),))
+    assert index.update(conn) == {"added": 1, "removed": 1}
+    assert index.update(conn) == {"added": 0, "removed": 0}
+    assert index.search(posting(99), k=1)[0][0] == 4
+    conn.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from src.rate_limiter import RateLimiter
+from src.source_fixtures import FIXTURES, FixtureServer
+
+# 5 requests a second with no burst: requests at least 0.2 s apart
+RATE = 5
+SPACING = 1 / RATE
+# Allowance for timer resolution between the bucket and the server's clock
+SLACK = 0.02
+
+
+def request_gaps(server):
+    times = sorted(logged[0] for logged in server.log)
+    return [later - earlier for earlier, later in zip(times, times[1:])]
+
+
+@pytest.mark.parametrize("use_async", [False, True], ids=["sync", "async"])
+def test_crawl_keeps_to_the_token_bucket(make_source, make_scraper, adzuna_server, use_async):
+    source = make_source("adzuna", adzuna_server, rate=RATE, per=1.0, burst=1)
+    scraper = make_scraper([source], job_titles=("Data Scientist", "Data Engineer"))
+    stats = scraper.scrape_jobs(use_async=use_async)
+    assert stats["inserted"] == 240
+    assert adzuna_server.requests == 6
+    assert min(request_gaps(adzuna_server)) >= SPACING - SLACK
+
+
+def test_scrapers_sharing_a_state_file_share_the_allowance(make_source, make_scraper):
+    with FixtureServer(FIXTURES["adzuna"]) as server:
+        first = make_scraper([make_source("adzuna", server, rate=RATE, per=1.0, burst=1)])
+        second = make_scraper([make_source("adzuna", server, rate=RATE, per=1.0, burst=1)],
+                              job_titles=("Data Engineer",))
+        first.scrape_jobs()
+        second.scrape_jobs()
+    assert server.requests == 6
+    assert min(request_gaps(server)) >= SPACING - SLACK
+
+
+def test_burst_is_spent_before_requests_are_spaced(tmp_path):
+    limiter = RateLimiter(name="test", rate=RATE, per=1.0, burst=3, path=str(tmp_path / "rate_limit.db"))
+    assert [limiter.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert limiter.try_acquire() == pytest.approx(SPACING, abs=SLACK)
+
+
+def test_block_for_pauses_every_user_of_the_bucket(tmp_path):
+    path = str(tmp_path / "rate_limit.db")
+    limiter = RateLimiter(name="test", rate=RATE, per=1.0, burst=3, path=path)
+    other = RateLimiter(name="test", rate=RATE, per=1.0, burst=3, path=path)
+    limiter.block_for(5)
+    assert other.try_acquire() == pytest.approx(5, abs=SLACK)
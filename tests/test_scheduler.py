@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.scheduler import Schedule, Scheduler, format_timestamp, parse_cron_field, save_search
+
+NOW = datetime(2025, 3, 5, 9, 30, tzinfo=timezone.utc)  # A Wednesday
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    scheduler = Scheduler(str(tmp_path / "jobs.db"), max_workers=1, stale_after=3600)
+    save_search(scheduler.conn, "ds", ["Data Scientist"], schedule="0 8 * * *")
+    yield scheduler
+    scheduler.executor.shutdown(wait=True)
+    scheduler.conn.close()
+
+
+@pytest.fixture
+def search(scheduler):
+    return scheduler.due_searches(datetime.now(timezone.utc))[0]
+
+
+def search_row(scheduler, name="ds"):
+    return scheduler.conn.execute(
+        "SELECT next_run_at, running_since FROM saved_searches WHERE name = ?", (name,)
+    ).fetchone()
+
+
+def run_statuses(scheduler):
+    return [row[0] for row in scheduler.conn.execute("SELECT status FROM scrape_runs ORDER BY id")]
+
+
+@pytest.mark.parametrize("field, expected", [
+    ("*", set(range(0, 7))),
+    ("1-3", {1, 2, 3}),
+    ("*/2", {0, 2, 4, 6}),
+    ("1,5", {1, 5}),
+    ("2-6/2", {2, 4, 6}),
+])
+def test_parse_cron_field(field, expected):
+    assert parse_cron_field(field, 0, 6) == expected
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * * 8",
+                                        "@every 5", "@every 0m", "@fortnightly"])
+def test_invalid_schedules_are_rejected(expression):
+    with pytest.raises(ValueError):
+        Schedule(expression)
+
+
+def test_sunday_is_both_zero_and_seven():
+    assert Schedule("0 0 * * 7").weekdays == {0}
+    assert Schedule("0 0 * * 5-7").weekdays == {0, 5, 6}
+    assert Schedule("0 0 * * 7").next_after(NOW) == datetime(2025, 3, 9, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("*/15 * * * *", datetime(2025, 3, 5, 9, 45)),
+    ("0 8 * * *", datetime(2025, 3, 6, 8, 0)),
+    ("0 8 * * 1-5", datetime(2025, 3, 6, 8, 0)),
+    ("0 8 * * 1", datetime(2025, 3, 10, 8, 0)),
+    ("0 0 1 * *", datetime(2025, 4, 1)),
+    ("0 0 29 2 *", datetime(2028, 2, 29)),
+    ("@hourly", datetime(2025, 3, 5, 10, 0)),
+    ("@every 45m", datetime(2025, 3, 5, 10, 15)),
+    ("@every 2d", datetime(2025, 3, 7, 9, 30)),
+])
+def test_next_after(expression, expected):
+    assert Schedule(expression).next_after(NOW) == expected.replace(tzinfo=timezone.utc)
+
+
+def test_restricted_day_and_weekday_match_either():
+    # As in cron: the 13th of the month or any Friday, not only Friday the 13th
+    schedule = Schedule("0 0 13 * 5")
+    assert schedule.next_after(NOW) == datetime(2025, 3, 7, tzinfo=timezone.utc)
+    assert schedule.next_after(datetime(2025, 3, 12, tzinfo=timezone.utc)) == datetime(2025, 3, 13, tzinfo=timezone.utc)
+
+
+def test_star_day_of_month_restricts_by_weekday_only():
+    assert Schedule("0 0 * 3 5").next_after(NOW) == datetime(2025, 3, 7, tzinfo=timezone.utc)
+    assert Schedule("0 0 13 3 *").next_after(NOW) == datetime(2025, 3, 13, tzinfo=timezone.utc)
+
+
+def test_impossible_date_never_runs():
+    with pytest.raises(ValueError, match="never runs"):
+        Schedule("0 0 30 2 *").next_after(NOW)
+
+
+def test_search_cannot_be_claimed_twice(scheduler, search):
+    now = datetime.now(timezone.utc)
+    assert scheduler.claim(search, now) is not None
+    assert scheduler.claim(search, now) is None
+    assert run_statuses(scheduler) == ["running"]
+
+
+def test_stale_claim_is_taken_over(scheduler, search):
+    now = datetime.now(timezone.utc)
+    assert scheduler.claim(search, now) is not None
+    # The worker died two hours ago without finishing
+    with scheduler.conn:
+        scheduler.conn.execute("UPDATE saved_searches SET running_since = ?",
+                               (format_timestamp(now - timedelta(hours=2)),))
+    assert scheduler.claim(search, now) is not None
+    assert run_statuses(scheduler) == ["abandoned", "running"]
+    assert search_row(scheduler)[1] == format_timestamp(now)
+
+
+def test_finish_releases_and_reschedules(scheduler, search):
+    started = datetime.now(timezone.utc)
+    run_id = scheduler.claim(search, started)
+    scheduler.finish(search, run_id, started, stats={"inserted": 3, "updated": 1, "skipped": 0})
+    next_run_at, running_since = search_row(scheduler)
+    assert running_since is None
+    assert next_run_at == format_timestamp(Schedule("0 8 * * *").next_after(started))
+    assert scheduler.conn.execute("SELECT status, inserted, updated FROM scrape_runs").fetchall() == [
+        ("succeeded", 3, 1)
+    ]
+    assert scheduler.due_searches(started) == []
+
+
+def test_rescheduled_search_is_not_claimed_from_an_old_due_list(scheduler, search):
+    # Another scheduler ran and rescheduled the search after this one listed it as due
+    started = datetime.now(timezone.utc)
+    scheduler.finish(search, scheduler.claim(search, started), started)
+    assert scheduler.claim(search, started) is None
+    assert run_statuses(scheduler) == ["succeeded"]
+
+
+def test_tick_runs_due_searches_and_records_failures(scheduler, monkeypatch):
+    save_search(scheduler.conn, "pm", ["Product Manager"], schedule="@every 1h")
+
+    def run_search(search):
+        if search["name"] == "pm":
+            raise RuntimeError("source down")
+        return {"inserted": 5, "updated": 0, "skipped": 0}
+
+    monkeypatch.setattr(scheduler, "run_search", run_search)
+    scheduler.run_once()
+    runs = scheduler.conn.execute('''
+    SELECT searches.name, runs.status, runs.inserted, runs.error
+    FROM scrape_runs runs JOIN saved_searches searches ON searches.id = runs.search_id
+    ORDER BY searches.name
+    ''').fetchall()
+    assert runs == [("ds", "succeeded", 5, None), ("pm", "failed", None, "RuntimeError: source down")]
+    assert scheduler.running == {}
+    assert scheduler.tick() == 0
@@ -0,0 +1,42 @@
+from src.skill_cache import SkillCache
+
+VERSION = "v1"
+
+
+def stored(cache):
+    return cache.conn.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+
+def test_replacing_an_entry_does_not_count_it_again(tmp_path):
+    cache = SkillCache(str(tmp_path / "skill_cache.db"), VERSION, max_entries=10)
+    for description in ["Python and SQL", "Java"]:
+        cache.set(description, VERSION, ["Python"])
+    for _ in range(20):
+        cache.set("Python and SQL", VERSION, ["Python", "SQL"])
+    assert cache.entries == stored(cache) == 2
+    assert cache.get("Python and SQL", VERSION) == ["Python", "SQL"]
+
+
+def test_eviction_keeps_the_most_recently_used(tmp_path):
+    cache = SkillCache(str(tmp_path / "skill_cache.db"), VERSION, max_entries=10, memory_entries=0)
+    for index in range(10):
+        cache.set(f"job {index}", VERSION, [])
+    assert cache.entries == stored(cache) == 10
+    cache.get("job 0", VERSION)
+    cache.set("job 10", VERSION, [])
+    assert cache.entries == stored(cache) == 9
+    assert cache.get("job 0", VERSION) == []
+    assert cache.get("job 1", VERSION) is None
+
+
+def test_entries_evicted_by_other_processes_are_counted_before_evicting(tmp_path):
+    path = str(tmp_path / "skill_cache.db")
+    cache = SkillCache(path, VERSION, max_entries=10)
+    for index in range(10):
+        cache.set(f"job {index}", VERSION, [])
+    other = SkillCache(path, VERSION, max_entries=10)
+    other.set("job 10", VERSION, [])
+    assert stored(cache) == 9
+    # This cache still counts 10; its next entry makes 10, which is no reason to evict
+    cache.set("job 11", VERSION, [])
+    assert cache.entries == stored(cache) == 10
@@ -0,0 +1,92 @@
+import pytest
+
+from src.skill_extractor import (
+    CompiledTaxonomy, SkillExtractor, SkillTaxonomy, compile_artifact, get_extractor, load_compiled
+)
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return get_extractor()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Python developer for Proactive Appointments, a recruiter.", ["Python"]),
+    ("Be proactive about code quality.", ["Initiative"]),
+    ("Spring 2025 intake for graduates who know Python.", ["Python"]),
+    ("Java developer with Spring and Kafka.", ["Java", "Spring", "Apache Kafka"]),
+    ("Swift Couriers is hiring a Python developer.", ["Python"]),
+    ("iOS engineer writing Swift.", ["iOS", "Swift"]),
+    ("Experience with swift ui programming.", ["SwiftUI", "Programming"]),
+    ("Spark your career with us.", []),
+    ("Batch jobs in PySpark.", ["Apache Spark"]),
+    ("Rinse the flask after use.", []),
+    ("Flask APIs in Python.", ["Flask", "Python"]),
+    ("Our R&D team writes Python.", ["Python"]),
+    ("Statistics in R and Python.", ["Statistics", "R", "Python"]),
+    ("Job Type: C…", []),
+    ("A C grade in maths is fine. Python role.", ["Python"]),
+    ("C: full time. Python role.", ["Python"]),
+    ("Firmware in C for microcontrollers.", ["Embedded Systems", "C", "Microcontrollers"]),
+    ("C and C++ developer.", ["C", "C++"]),
+    ("Go to the office twice a week. Python and Java.", ["Python", "Java"]),
+    ("Python, Java, Go and TypeScript.", ["Python", "Java", "TypeScript"]),
+    ("Services in Go on Kubernetes.", ["Go", "Kubernetes"]),
+    ("Go services on Kubernetes.", ["Kubernetes"]),
+    ("Golang services.", ["Go"]),
+    ("Experience with goroutines.", ["Go"]),
+])
+def test_ambiguous_words(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+
+@pytest.mark.parametrize("skill, category", [
+    ("Chromatography", "Science"), ("Animation", "Design"), ("Civil Engineering", "Engineering"),
+    ("Nursing", "Healthcare"), ("Public Speaking", "Soft Skill"),
+])
+def test_categories(extractor, skill, category):
+    assert [(match.skill, match.category) for match in extractor.find(skill)] == [(skill, category)]
+
+
+def test_ambiguous_words_never_vouch_for_each_other(extractor):
+    assert extractor.extract("Spring and Swift") == []
+    assert extractor.extract("Spring, Swift and Java") == ["Spring", "Java"]
+
+
+def write_taxonomy(tmp_path, rows):
+    path = tmp_path / "taxonomy.csv"
+    path.write_text("skill,category,synonyms,match,context\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    return path
+
+
+def test_context_names_skills_or_categories(tmp_path):
+    path = write_taxonomy(tmp_path, [
+        "Python,Language,,", "Rust,Language,rustlang,exact,Language", "Kubernetes,DevOps,k8s,",
+        "Helm,DevOps,,exact,DevOps;Python",
+    ])
+    extractor = SkillExtractor(compiled=CompiledTaxonomy(CompiledTaxonomy.compile(SkillTaxonomy.load(path))))
+    assert extractor.extract("Rust and Helm") == []
+    assert extractor.extract("rustlang") == ["Rust"]
+    assert extractor.extract("Rust, Helm and Python") == ["Rust", "Helm", "Python"]
+    assert extractor.extract("Helm charts on k8s") == ["Helm", "Kubernetes"]
+
+
+def test_unknown_match_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="Unknown match exactly for skill Go"):
+        SkillTaxonomy.load(write_taxonomy(tmp_path, ["Go,Language,,exactly"]))
+
+
+def test_unknown_context_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="Unknown context Pyhton for skill Flask"):
+        SkillTaxonomy.load(write_taxonomy(tmp_path, ["Flask,Web Framework,,exact,Pyhton"]))
+
+
+@pytest.mark.parametrize("damage", [lambda data: b"", lambda data: data[:20], lambda data: data[:len(data) // 2],
+                                    lambda data: b"\0" * len(data)], ids=["empty", "header", "half", "zeroed"])
+def test_corrupt_artifact_is_recompiled(tmp_path, damage):
+    path = write_taxonomy(tmp_path, ["Python,Language,,", "Kubernetes,DevOps,k8s,"])
+    target = compile_artifact(path)
+    target.write_bytes(damage(target.read_bytes()))
+    assert SkillExtractor(compiled=load_compiled(path)).extract("Python on k8s") == ["Python", "Kubernetes"]
+    assert CompiledTaxonomy.open(target).version == load_compiled(path).version
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".partial"] == []